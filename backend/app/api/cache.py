@@ -0,0 +1,123 @@
+"""
+API Response Cache
+Short-lived Redis caching for public, read-mostly endpoints
+"""
+import asyncio
+import functools
+import hashlib
+import inspect
+from typing import Any, Callable, Optional
+
+from fastapi import Request, Response
+from redis.exceptions import RedisError
+
+from app.api.responses import dumps, fast_json
+from app.database import get_redis
+
+
+# How long a miss holds the single-flight lock, and how long others wait on it
+LOCK_TTL_MS = 500
+LOCK_WAIT_STEP = 0.02
+LOCK_WAIT_STEPS = 10
+
+# Default edge/browser caching for fast-moving public market data
+MARKET_CACHE_CONTROL = "public, max-age=1, stale-while-revalidate=5"
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag for a response body"""
+    return f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def conditional_response(
+    request: Request,
+    body: bytes,
+    etag: Optional[str] = None,
+    cache_control: Optional[str] = None
+) -> Response:
+    """
+    JSON response with validators - 304 without a body if the client's copy matches
+    """
+    if etag is None:
+        etag = make_etag(body)
+    
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    
+    return fast_json(body, headers=headers)
+
+
+def cached_response(
+    ttl: float,
+    key_fn: Callable[..., str],
+    cache_control: Optional[str] = None
+):
+    """
+    Cache a handler's JSON body in Redis for `ttl` seconds
+    
+    `key_fn` receives the handler's keyword arguments and returns the cache key.
+    Concurrent misses are coalesced: one caller computes the value while the
+    others briefly wait for it. Redis errors fall through to the handler.
+    Responses carry an ETag (and `cache_control` if given) and honour If-None-Match.
+    """
+    ttl_ms = int(ttl * 1000)
+    
+    def decorator(handler: Callable[..., Any]):
+        @functools.wraps(handler)
+        async def wrapper(request: Request, **kwargs):
+            key = key_fn(**kwargs)
+            lock_key = f"{key}:lock"
+            owns_lock = False
+            
+            try:
+                redis_client = await get_redis()
+                cached = await redis_client.get(key)
+                if cached is None:
+                    owns_lock = bool(await redis_client.set(
+                        lock_key, 1, nx=True, px=LOCK_TTL_MS
+                    ))
+                if cached is None and not owns_lock:
+                    # Another request is computing it - wait for its result
+                    for _ in range(LOCK_WAIT_STEPS):
+                        await asyncio.sleep(LOCK_WAIT_STEP)
+                        cached = await redis_client.get(key)
+                        if cached is not None:
+                            break
+            except RedisError:
+                body = dumps(await handler(**kwargs))
+                return conditional_response(request, body, cache_control=cache_control)
+            
+            if cached is not None:
+                return conditional_response(request, cached, cache_control=cache_control)
+            
+            try:
+                body = dumps(await handler(**kwargs))
+                
+                try:
+                    await redis_client.set(key, body, px=ttl_ms)
+                except RedisError:
+                    pass
+            finally:
+                # Release on errors too, so waiters don't sit out the lock TTL
+                if owns_lock:
+                    try:
+                        await redis_client.delete(lock_key)
+                    except RedisError:
+                        pass
+            
+            return conditional_response(request, body, cache_control=cache_control)
+        
+        # Expose the handler's parameters plus the request to FastAPI
+        signature = inspect.signature(handler)
+        wrapper.__signature__ = signature.replace(parameters=[
+            *signature.parameters.values(),
+            inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+        ])
+        
+        return wrapper
+    
+    return decorator
@@ -2,32 +2,164 @@
 API Dependencies
 Reusable dependencies for route handlers
 """
-from typing import Optional
-from uuid import UUID
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from uuid import UUID, uuid4
 
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.security import HTTPBearer
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 import redis.asyncio as redis
+from redis.exceptions import NoScriptError
 
-from app.database import get_db, get_redis
-from app.services.auth import AuthService
+from app.database import get_db
+from app.services.auth import auth_service
 from app.models.user import User
+from app.schemas.order import OrderCreate, validate_order_create_json
 
 
-security = HTTPBearer()
-auth_service = AuthService()
+class BearerToken(HTTPBearer):
+    """
+    Bearer auth scheme that slices the token straight from the header
+    Keeps the OpenAPI security scheme while skipping credential object parsing
+    """
+    
+    async def __call__(self, request: Request) -> Optional[str]:
+        header = request.headers.get("authorization")
+        if header and header.startswith("Bearer "):
+            return header[7:]
+        if self.auto_error:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authenticated"
+            )
+        return None
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db)
-) -> User:
+security = BearerToken()
+
+
+# Sliding-window rate limit executed atomically on the Redis server.
+# KEYS[1] = sorted set of request timestamps
+# ARGV = now_ms, window_ms, limit, member
+# Returns remaining requests in the window, or -1 if the limit is hit.
+RATE_LIMIT_LUA = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+local count = redis.call('ZCARD', key)
+if count >= limit then
+    return -1
+end
+redis.call('ZADD', key, now, ARGV[4])
+redis.call('PEXPIRE', key, window)
+return limit - count - 1
+"""
+_RATE_LIMIT_SHA = hashlib.sha1(RATE_LIMIT_LUA.encode()).hexdigest()
+
+# Verified token payloads and their parsed subject, keyed by token digest,
+# valid until the token's exp
+TOKEN_CACHE_MAX_SIZE = 10_000
+_token_cache: Dict[bytes, Tuple[dict, Optional[UUID], float]] = {}
+
+# Tokens that failed to decode, so repeats are rejected without re-verifying.
+# Kept apart from valid tokens so a flood of bad ones can't evict them.
+INVALID_TOKEN_CACHE_TTL = 60.0
+INVALID_TOKEN_CACHE_MAX_SIZE = 10_000
+_invalid_token_cache: Dict[bytes, float] = {}
+
+# Validated order requests keyed by body digest, least recently used evicted first.
+# OrderCreate is frozen, so retried/replayed submissions can share one instance.
+ORDER_CACHE_MAX_SIZE = 4096
+_order_cache: Dict[bytes, OrderCreate] = {}
+
+# Recently loaded users, short TTL to collapse lookups on busy sessions
+USER_CACHE_TTL = 5.0
+USER_CACHE_MAX_SIZE = 10_000
+_user_cache: Dict[UUID, Tuple[User, float]] = {}
+
+
+def _parse_subject(payload: dict) -> Optional[UUID]:
+    """Parse the user ID from a token's `sub` claim"""
+    try:
+        return UUID(payload["sub"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def decode_token_cached(token: str) -> Tuple[Optional[dict], Optional[UUID]]:
     """
-    Validate JWT token and return current user
+    Decode a JWT and parse its subject, skipping signature verification
+    and UUID parsing for tokens seen before - valid or not
     """
-    token = credentials.credentials
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    now = time.time()
+    
+    cached = _token_cache.get(key)
+    if cached:
+        if cached[2] > now:
+            return cached[0], cached[1]
+        del _token_cache[key]
+    
+    rejected_until = _invalid_token_cache.get(key)
+    if rejected_until is not None:
+        if rejected_until > now:
+            return None, None
+        del _invalid_token_cache[key]
+    
     payload = auth_service.decode_token(token)
+    if not payload:
+        if len(_invalid_token_cache) >= INVALID_TOKEN_CACHE_MAX_SIZE:
+            _invalid_token_cache.pop(next(iter(_invalid_token_cache)))
+        _invalid_token_cache[key] = now + INVALID_TOKEN_CACHE_TTL
+        return None, None
+    
+    user_id = _parse_subject(payload)
+    if "exp" in payload:
+        if len(_token_cache) >= TOKEN_CACHE_MAX_SIZE:
+            _token_cache.pop(next(iter(_token_cache)))
+        _token_cache[key] = (payload, user_id, float(payload["exp"]))
+    
+    return payload, user_id
+
+
+def invalidate_user_cache(user_id: UUID) -> None:
+    """Drop a cached user after its profile changes"""
+    _user_cache.pop(user_id, None)
+
+
+async def _get_user_cached(db: AsyncSession, user_id: UUID) -> Optional[User]:
+    """Load user by ID, reusing a recent load attached to this session"""
+    now = time.time()
+    
+    cached = _user_cache.get(user_id)
+    if cached and cached[1] > now:
+        return await db.merge(cached[0], load=False)
+    
+    user = await auth_service.get_user_by_id(db, user_id)
+    if user:
+        if len(_user_cache) >= USER_CACHE_MAX_SIZE:
+            _user_cache.pop(next(iter(_user_cache)))
+        _user_cache[user_id] = (user, now + USER_CACHE_TTL)
+    
+    return user
+
+
+@dataclass(frozen=True, slots=True)
+class AuthContext:
+    """Identity taken from a verified token, without loading the user row"""
+    user_id: UUID
+
+
+def _verified_user_id(token: str) -> UUID:
+    """Validate the bearer token and return its user ID"""
+    payload, user_id = decode_token_cached(token)
     
     if not payload:
         raise HTTPException(
@@ -36,14 +168,50 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"}
         )
     
-    user_id = payload.get("sub")
-    if not user_id:
+    if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload"
         )
     
-    user = await auth_service.get_user_by_id(db, UUID(user_id))
+    return user_id
+
+
+async def get_auth_context(
+    token: str = Depends(security)
+) -> AuthContext:
+    """
+    Validate JWT token and return the caller's identity
+    For read endpoints that only need the user ID - skips the user lookup,
+    so account status is enforced at token issue/refresh rather than per call
+    """
+    user_id = _verified_user_id(token)
+    return AuthContext(user_id=user_id)
+
+
+async def _resolve_user(token: str, db: AsyncSession) -> Optional[User]:
+    """Return the active user for a token, or None if it doesn't resolve to one"""
+    _, user_id = decode_token_cached(token)
+    if user_id is None:
+        return None
+    
+    user = await _get_user_cached(db, user_id)
+    if user is None or not user.is_active:
+        return None
+    
+    return user
+
+
+async def get_current_user(
+    token: str = Depends(security),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """
+    Validate JWT token and return current user
+    """
+    user_id = _verified_user_id(token)
+    
+    user = await _get_user_cached(db, user_id)
     
     if not user:
         raise HTTPException(
@@ -60,35 +228,79 @@ async def get_current_user(
     return user
 
 
+async def get_current_admin(
+    current_user: User = Depends(get_current_user)
+) -> User:
+    """
+    Current user, who must be an admin
+    For operator endpoints that act on other users' data
+    """
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    
+    return current_user
+
+
 async def get_current_user_optional(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(
-        HTTPBearer(auto_error=False)
-    ),
+    token: Optional[str] = Depends(BearerToken(auto_error=False)),
     db: AsyncSession = Depends(get_db)
 ) -> Optional[User]:
     """
     Optional authentication - returns None if no token
     """
-    if not credentials:
-        return None
+    return await _resolve_user(token, db) if token else None
+
+
+async def get_order_create(request: Request) -> OrderCreate:
+    """
+    Parse the order request body, reusing the validated model for
+    byte-identical bodies (client retries, replays)
+    Well-formed bodies take the generated validator; anything it declines
+    goes through pydantic for the full result and error details
+    """
+    body = await request.body()
+    key = hashlib.blake2b(body, digest_size=16).digest()
     
-    try:
-        return await get_current_user(credentials, db)
-    except HTTPException:
-        return None
+    order = _order_cache.pop(key, None)
+    if order is None:
+        order = validate_order_create_json(body)
+        if order is None:
+            try:
+                order = OrderCreate.model_validate_json(body)
+            except ValidationError as e:
+                raise RequestValidationError(
+                    [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)],
+                    body=body
+                )
+        if len(_order_cache) >= ORDER_CACHE_MAX_SIZE:
+            _order_cache.pop(next(iter(_order_cache)))
+    
+    # Reinsert to mark as most recently used
+    _order_cache[key] = order
+    return order
 
 
-async def get_redis_client() -> redis.Redis:
+def get_redis_client(request: Request) -> redis.Redis:
     """
-    Get Redis client for caching and pub/sub
+    Get the app-lifetime Redis client for caching and pub/sub
     """
-    return await get_redis()
+    return request.app.state.redis
+
+
+async def load_rate_limit_script(redis_client: redis.Redis) -> None:
+    """
+    Preload the rate limit script so requests only need EVALSHA
+    """
+    await redis_client.script_load(RATE_LIMIT_LUA)
 
 
 class RateLimiter:
     """
     Rate limiting dependency
-    Uses Redis for distributed rate limiting
+    Sliding window over a Redis sorted set, one atomic script call per request
     """
     
     def __init__(self, requests: int = 100, window: int = 60):
@@ -100,14 +312,16 @@ class RateLimiter:
         user: User = Depends(get_current_user),
         redis_client: redis.Redis = Depends(get_redis_client)
     ) -> None:
-        key = f"ratelimit:{user.id}"
-        
-        count = await redis_client.incr(key)
+        # Hash tag keeps the key on a single slot under Redis Cluster
+        key = f"ratelimit:{{{user.id}}}"
+        args = (int(time.time() * 1000), self.window * 1000, self.requests, uuid4().hex)
         
-        if count == 1:
-            await redis_client.expire(key, self.window)
+        try:
+            remaining = await redis_client.evalsha(_RATE_LIMIT_SHA, 1, key, *args)
+        except NoScriptError:
+            remaining = await redis_client.eval(RATE_LIMIT_LUA, 1, key, *args)
         
-        if count > self.requests:
+        if int(remaining) < 0:
             raise HTTPException(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 detail=f"Rate limit exceeded. Try again in {self.window} seconds."
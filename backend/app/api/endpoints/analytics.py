@@ -2,6 +2,7 @@
 AI Analytics API Endpoints
 AI-driven financial analysis, risk scoring, anomaly detection, and predictions
 """
+import asyncio
 from datetime import datetime
 from typing import Optional, List
 from uuid import UUID
@@ -10,8 +11,8 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 import redis.asyncio as redis
 
-from app.database import get_db, get_redis
-from app.api.deps import get_current_user
+from app.database import get_db_readonly, readonly_session_factory
+from app.api.deps import AuthContext, get_auth_context, get_current_admin, get_redis_client
 from app.models.user import User
 from app.services.ai_analytics import ai_analytics_service
 from app.schemas.analytics import (
@@ -37,8 +38,9 @@ async def detect_anomalies(
     symbol: Optional[str] = Query(None, description="Filter by trading pair"),
     lookback_hours: int = Query(24, ge=1, le=168, description="Hours to look back"),
     user_only: bool = Query(False, description="Only show anomalies for current user"),
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_readonly),
+    redis_client: redis.Redis = Depends(get_redis_client),
+    auth: AuthContext = Depends(get_auth_context),
 ):
     """
     Detect trading anomalies using AI analysis
@@ -50,13 +52,14 @@ async def detect_anomalies(
     - Wash trading patterns
     - Price manipulation indicators
     """
-    user_id = current_user.id if user_only else None
+    user_id = auth.user_id if user_only else None
     
     anomalies = await ai_analytics_service.detect_anomalies(
         db=db,
         user_id=user_id,
         symbol=symbol,
         lookback_hours=lookback_hours,
+        redis_client=redis_client,
     )
     
     return anomalies
@@ -64,8 +67,8 @@ async def detect_anomalies(
 
 @router.get("/risk/user", response_model=RiskScore)
 async def get_user_risk_score(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_readonly),
+    auth: AuthContext = Depends(get_auth_context),
 ):
     """
     Calculate comprehensive risk score for current user
@@ -78,7 +81,7 @@ async def get_user_risk_score(
     """
     risk_score = await ai_analytics_service.calculate_user_risk_score(
         db=db,
-        user_id=current_user.id,
+        user_id=auth.user_id,
     )
     
     return risk_score
@@ -87,13 +90,12 @@ async def get_user_risk_score(
 @router.get("/risk/user/{user_id}", response_model=RiskScore)
 async def get_specific_user_risk_score(
     user_id: UUID,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_readonly),
+    admin: User = Depends(get_current_admin),
 ):
     """
     Calculate risk score for a specific user (admin only)
     """
-    # In production, add admin check here
     risk_score = await ai_analytics_service.calculate_user_risk_score(
         db=db,
         user_id=user_id,
@@ -102,13 +104,32 @@ async def get_specific_user_risk_score(
     return risk_score
 
 
+@router.get("/risk/users", response_model=List[RiskScore])
+async def get_users_risk_scores(
+    user_ids: List[UUID] = Query(..., description="Users to score"),
+    db: AsyncSession = Depends(get_db_readonly),
+    admin: User = Depends(get_current_admin),
+):
+    """
+    Calculate risk scores for several users in one pass (admin only)
+    """
+    user_ids = user_ids[:100]  # Limit to 100 users
+    
+    risk_scores = await ai_analytics_service.calculate_user_risk_scores(
+        db=db,
+        user_ids=user_ids,
+    )
+    
+    return list(risk_scores.values())
+
+
 @router.get("/predictions/{symbol}", response_model=PricePrediction)
 async def get_price_prediction(
     symbol: str,
     horizon_minutes: int = Query(60, ge=5, le=1440, description="Prediction horizon in minutes"),
-    db: AsyncSession = Depends(get_db),
-    redis_client: redis.Redis = Depends(get_redis),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_readonly),
+    redis_client: redis.Redis = Depends(get_redis_client),
+    auth: AuthContext = Depends(get_auth_context),
 ):
     """
     Get AI-powered price prediction for a symbol
@@ -132,8 +153,8 @@ async def get_price_prediction(
 
 @router.get("/portfolio", response_model=PortfolioAnalysis)
 async def analyze_portfolio(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_readonly),
+    auth: AuthContext = Depends(get_auth_context),
 ):
     """
     Get comprehensive AI portfolio analysis
@@ -146,7 +167,7 @@ async def analyze_portfolio(
     """
     analysis = await ai_analytics_service.analyze_portfolio(
         db=db,
-        user_id=current_user.id,
+        user_id=auth.user_id,
     )
     
     return analysis
@@ -155,8 +176,8 @@ async def analyze_portfolio(
 @router.get("/sentiment/{symbol}", response_model=MarketSentiment)
 async def get_market_sentiment(
     symbol: str,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_readonly),
+    auth: AuthContext = Depends(get_auth_context),
 ):
     """
     Get AI-analyzed market sentiment for a symbol
@@ -178,9 +199,8 @@ async def get_market_sentiment(
 @router.get("/summary", response_model=AIAnalyticsSummary)
 async def get_analytics_summary(
     symbols: List[str] = Query(default=["ETH-USDT", "BTC-USDT"]),
-    db: AsyncSession = Depends(get_db),
-    redis_client: redis.Redis = Depends(get_redis),
-    current_user: User = Depends(get_current_user),
+    redis_client: redis.Redis = Depends(get_redis_client),
+    auth: AuthContext = Depends(get_auth_context),
 ):
     """
     Get comprehensive AI analytics summary for dashboard
@@ -192,44 +212,53 @@ async def get_analytics_summary(
     - Market sentiment
     - AI insights
     """
-    # Get risk score
-    risk_score = await ai_analytics_service.calculate_user_risk_score(
-        db=db,
-        user_id=current_user.id,
-    )
+    symbols = symbols[:5]  # Limit to 5 symbols
     
-    # Get recent anomalies
-    anomalies = await ai_analytics_service.detect_anomalies(
-        db=db,
-        user_id=current_user.id,
-        lookback_hours=24,
-    )
+    # A connection runs one query at a time, so each call gets its own
+    # read-only session and the queries really run concurrently;
+    # gather keeps per-symbol failures isolated
+    async def on_own_session(method, **kwargs):
+        async with readonly_session_factory() as session:
+            return await method(db=session, **kwargs)
     
-    # Get predictions and sentiment for each symbol
-    predictions = {}
-    sentiment = {}
-    
-    for symbol in symbols[:5]:  # Limit to 5 symbols
-        try:
-            predictions[symbol] = await ai_analytics_service.predict_price(
-                db=db,
+    (
+        (risk_score, anomalies, portfolio),
+        prediction_results,
+        sentiment_results,
+    ) = await asyncio.gather(
+        # Risk, anomalies and portfolio share one fetch of the user's trades
+        on_own_session(
+            ai_analytics_service.analyze_user_bundle,
+            user_id=auth.user_id,
+        ),
+        asyncio.gather(*[
+            on_own_session(
+                ai_analytics_service.predict_price,
                 redis_client=redis_client,
                 symbol=symbol,
                 horizon_minutes=60,
             )
-            sentiment[symbol] = await ai_analytics_service.analyze_market_sentiment(
-                db=db,
+            for symbol in symbols
+        ], return_exceptions=True),
+        asyncio.gather(*[
+            on_own_session(
+                ai_analytics_service.analyze_market_sentiment,
                 symbol=symbol,
             )
-        except Exception:
-            continue  # Skip symbols with errors
-    
-    # Get portfolio insights
-    portfolio = await ai_analytics_service.analyze_portfolio(
-        db=db,
-        user_id=current_user.id,
+            for symbol in symbols
+        ], return_exceptions=True),
     )
     
+    # Skip symbols with errors
+    predictions = {}
+    sentiment = {}
+    
+    for symbol, prediction, symbol_sentiment in zip(symbols, prediction_results, sentiment_results):
+        if isinstance(prediction, Exception) or isinstance(symbol_sentiment, Exception):
+            continue
+        predictions[symbol] = prediction
+        sentiment[symbol] = symbol_sentiment
+    
     return AIAnalyticsSummary(
         risk_score=risk_score,
         recent_anomalies=anomalies[:10],  # Top 10 anomalies
@@ -242,8 +271,8 @@ async def get_analytics_summary(
 
 @router.get("/insights", response_model=List[AIInsight])
 async def get_ai_insights(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_readonly),
+    auth: AuthContext = Depends(get_auth_context),
 ):
     """
     Get AI-generated insights and recommendations
@@ -256,7 +285,7 @@ async def get_ai_insights(
     """
     portfolio = await ai_analytics_service.analyze_portfolio(
         db=db,
-        user_id=current_user.id,
+        user_id=auth.user_id,
     )
     
     return portfolio.insights
@@ -264,8 +293,8 @@ async def get_ai_insights(
 
 @router.get("/metrics", response_model=dict)
 async def get_trading_metrics(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_readonly),
+    auth: AuthContext = Depends(get_auth_context),
 ):
     """
     Get detailed trading performance metrics
@@ -279,7 +308,7 @@ async def get_trading_metrics(
     """
     portfolio = await ai_analytics_service.analyze_portfolio(
         db=db,
-        user_id=current_user.id,
+        user_id=auth.user_id,
     )
     
     return {
@@ -4,16 +4,14 @@ User registration, login, and wallet binding
 """
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
 from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, UserLogin, Token, WalletBindRequest
-from app.services.auth import AuthService
-from app.api.deps import get_current_user
+from app.services.auth import auth_service
+from app.api.deps import get_current_user, invalidate_user_cache
 
 router = APIRouter()
-auth_service = AuthService()
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -24,17 +22,13 @@ async def register(
     """
     Register a new user account
     """
-    # Check if email exists
-    result = await db.execute(
-        select(User).where(User.email == user_create.email)
-    )
-    if result.scalar_one_or_none():
+    user = await auth_service.create_user(db, user_create)
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    user = await auth_service.create_user(db, user_create)
     await db.commit()
     
     return user
@@ -105,6 +99,7 @@ async def bind_wallet(
     
     await db.commit()
     await db.refresh(current_user)
+    invalidate_user_cache(current_user.id)
     
     return current_user
 
@@ -116,5 +111,6 @@ async def refresh_token(
     """
     Refresh access token
     """
+    invalidate_user_cache(current_user.id)
     return auth_service.create_access_token(current_user.id)
 
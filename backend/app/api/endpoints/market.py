@@ -2,17 +2,29 @@
 Market Data Endpoints
 Real-time market information
 """
+import time
 from typing import List, Optional
 
-from fastapi import APIRouter, Query, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 
-from app.schemas.market import MarketData, Ticker, Candle
+from app.api.cache import MARKET_CACHE_CONTROL, cached_response, conditional_response
+from app.schemas.market import MarketData, Ticker, Candle, CandleRequest
 from app.services.market import market_service
 
 router = APIRouter()
 
+# Candle cache keys are aligned to interval boundaries so clients share entries
+INTERVAL_SECONDS = {
+    interval: minutes * 60 for interval, minutes in market_service.CANDLE_INTERVALS.items()
+}
+
 
 @router.get("/price/{symbol}", response_model=MarketData)
+@cached_response(
+    ttl=0.5,
+    key_fn=lambda symbol: f"mkt:price:{symbol.upper()}",
+    cache_control=MARKET_CACHE_CONTROL,
+)
 async def get_price(symbol: str):
     """
     Get current market data for a symbol
@@ -34,14 +46,22 @@ async def get_price(symbol: str):
 
 
 @router.get("/prices", response_model=List[MarketData])
-async def get_all_prices():
+async def get_all_prices(request: Request):
     """
     Get market data for all trading pairs
+    
+    Served from a snapshot serialized once per refresh tick
     """
-    return await market_service.get_all_market_data()
+    body, etag = market_service.get_prices_snapshot()
+    return conditional_response(request, body, etag, MARKET_CACHE_CONTROL)
 
 
 @router.get("/ticker/{symbol}", response_model=Ticker)
+@cached_response(
+    ttl=1,
+    key_fn=lambda symbol: f"mkt:ticker:{symbol.upper()}",
+    cache_control=MARKET_CACHE_CONTROL,
+)
 async def get_ticker(symbol: str):
     """
     Get 24hr ticker statistics for a symbol
@@ -58,19 +78,26 @@ async def get_ticker(symbol: str):
 
 
 @router.get("/tickers", response_model=List[Ticker])
-async def get_all_tickers():
+async def get_all_tickers(request: Request):
     """
     Get 24hr ticker statistics for all symbols
+    
+    Served from a snapshot serialized once per refresh tick
     """
-    return await market_service.get_all_tickers()
+    body, etag = market_service.get_tickers_snapshot()
+    return conditional_response(request, body, etag, MARKET_CACHE_CONTROL)
 
 
 @router.get("/candles/{symbol}", response_model=List[Candle])
-async def get_candles(
-    symbol: str,
-    interval: str = Query("1m", regex="^(1m|5m|15m|1h|4h|1d)$"),
-    limit: int = Query(100, ge=1, le=1000)
-):
+@cached_response(
+    ttl=5,
+    key_fn=lambda q: (
+        f"mkt:candles:{q.symbol.upper()}:{q.interval}:{q.limit}:"
+        f"{int(time.time()) // INTERVAL_SECONDS[q.interval]}"
+    ),
+    cache_control="public, max-age=5, stale-while-revalidate=30",
+)
+async def get_candles(q: CandleRequest = Depends()):
     """
     Get OHLCV candlestick data
     
@@ -79,18 +106,19 @@ async def get_candles(
     - 1h, 4h: Hour candles
     - 1d: Daily candles
     """
-    candles = await market_service.get_candles(symbol, interval, limit)
+    candles = await market_service.get_candles(q.symbol, q.interval, q.limit)
     
     if not candles:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Symbol {symbol.upper()} not found"
+            detail=f"Symbol {q.symbol.upper()} not found"
         )
     
     return candles
 
 
 @router.get("/symbols")
+@cached_response(ttl=60, key_fn=lambda: "mkt:symbols", cache_control="public, max-age=60")
 async def get_symbols():
     """
     Get list of all supported trading pairs
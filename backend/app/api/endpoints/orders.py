@@ -2,6 +2,7 @@
 Order Management Endpoints
 High-performance order placement and management
 """
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 
@@ -9,23 +10,36 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 import redis.asyncio as redis
 
-from app.database import get_db
+from app.database import get_db, get_db_readonly
 from app.models.user import User
-from app.models.order import OrderStatus
+from app.models.order import Order, OrderStatus
 from app.schemas.order import (
-    OrderCreate, OrderResponse, OrderBookResponse,
+    OrderCreate, OrderResponse, OrderBookResponse, OrderBookResponseFast,
     CancelOrderRequest
 )
+from app.schemas.market import PRICE_SCALE
 from app.services.trading import TradingEngine
-from app.api.deps import get_current_user, get_redis_client, trading_rate_limit
+from app.api.responses import dumps, fast_json, stream_query
+from app.api.deps import (
+    AuthContext, get_auth_context, get_current_user, get_order_create,
+    get_redis_client, trading_rate_limit
+)
 
 router = APIRouter()
 trading_engine = TradingEngine()
 
 
-@router.post("", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "",
+    response_model=OrderResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra={"requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": OrderCreate.model_json_schema()}},
+    }},
+)
 async def place_order(
-    order_create: OrderCreate,
+    order_create: OrderCreate = Depends(get_order_create),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
     redis_client: redis.Redis = Depends(get_redis_client),
@@ -46,6 +60,7 @@ async def place_order(
             db, redis_client, current_user.id, order_create
         )
         await db.commit()
+        await trading_engine.record_trades(redis_client, trades)
         
         return order
     except ValueError as e:
@@ -60,39 +75,32 @@ async def get_orders(
     symbol: Optional[str] = Query(None, description="Filter by trading pair"),
     status: Optional[OrderStatus] = Query(None, description="Filter by order status"),
     limit: int = Query(100, ge=1, le=1000),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    auth: AuthContext = Depends(get_auth_context)
 ):
     """
     Get user's orders with optional filters
+    
+    Streamed row by row to keep memory flat for large limits
     """
-    orders = await trading_engine.get_user_orders(
-        db, current_user.id, symbol, status, limit
+    query = trading_engine.user_orders_query(
+        auth.user_id, symbol, status, limit
     )
-    return orders
+    return stream_query(query, OrderResponse)
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
 async def get_order(
     order_id: UUID,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    auth: AuthContext = Depends(get_auth_context),
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """
     Get specific order by ID
     """
-    from sqlalchemy import select
-    from app.models.order import Order
-    
-    result = await db.execute(
-        select(Order).where(
-            Order.id == order_id,
-            Order.user_id == current_user.id
-        )
-    )
-    order = result.scalar_one_or_none()
+    order = await db.get(Order, order_id)
     
-    if not order:
+    # 404 for other users' orders too, so existence is not leaked
+    if not order or order.user_id != auth.user_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Order not found"
@@ -130,28 +138,13 @@ async def cancel_all_orders(
     """
     Cancel all open orders
     """
-    from sqlalchemy import select
-    from app.models.order import Order
-    
-    query = select(Order).where(
-        Order.user_id == current_user.id,
-        Order.status.in_([OrderStatus.OPEN, OrderStatus.PARTIAL])
+    cancelled_ids = await trading_engine.cancel_orders_bulk(
+        db, current_user.id, symbol
     )
     
-    if symbol:
-        query = query.where(Order.symbol == symbol.upper())
-    
-    result = await db.execute(query)
-    orders = result.scalars().all()
-    
-    cancelled_count = 0
-    for order in orders:
-        if await trading_engine.cancel_order(db, order.id, current_user.id):
-            cancelled_count += 1
-    
     await db.commit()
     
-    return {"cancelled_count": cancelled_count}
+    return {"cancelled_count": len(cancelled_ids)}
 
 
 @router.get("/book/{symbol}", response_model=OrderBookResponse)
@@ -166,16 +159,37 @@ async def get_order_book(
     - Bids: descending (best bid first)
     - Asks: ascending (best ask first)
     """
-    from datetime import datetime
-    
     symbol = symbol.upper()
     bids, asks, sequence = await trading_engine.get_order_book(symbol, levels)
     
-    return OrderBookResponse(
-        symbol=symbol,
-        bids=bids,
-        asks=asks,
-        timestamp=datetime.utcnow(),
-        sequence=sequence
-    )
+    return fast_json(dumps({
+        "symbol": symbol,
+        "bids": [level._asdict() for level in bids],
+        "asks": [level._asdict() for level in asks],
+        "timestamp": datetime.utcnow(),
+        "sequence": sequence
+    }))
+
 
+@router.get("/book/{symbol}/columns", response_model=OrderBookResponseFast)
+async def get_order_book_columns(
+    symbol: str,
+    levels: int = Query(20, ge=1, le=100, description="Number of price levels")
+):
+    """
+    Get order book depth as parallel arrays per side
+    
+    Prices and quantities are integers scaled by 10^scale, in the same
+    order as /book/{symbol}. Cheaper to build and parse for deep books.
+    """
+    symbol = symbol.upper()
+    bids, asks, sequence = await trading_engine.get_order_book_columns(symbol, levels)
+    
+    return fast_json(dumps({
+        "symbol": symbol,
+        "scale": PRICE_SCALE,
+        "bids": bids,
+        "asks": asks,
+        "timestamp": datetime.utcnow(),
+        "sequence": sequence
+    }))
@@ -2,67 +2,63 @@
 Trade History Endpoints
 Trade execution records and history
 """
-from typing import List, Optional
-from datetime import datetime
+from typing import List, Literal, Optional
+from datetime import timedelta
 
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 
-from app.database import get_db
-from app.models.user import User
+from app.database import get_db_readonly
 from app.models.trade import Trade
-from app.schemas.trade import TradeResponse, TradeAggregation
-from app.api.deps import get_current_user
+from app.services.market import market_service
+from app.schemas.trade import TradeResponse, TradeAggregation, TradeHistoryRequest
+from app.api.deps import AuthContext, get_auth_context
+from app.api.cache import cached_response
+from app.api.responses import stream_query
 
 router = APIRouter()
 
+StatsPeriod = Literal["1h", "24h", "7d", "30d"]
+
 
 @router.get("", response_model=List[TradeResponse])
 async def get_trades(
-    symbol: Optional[str] = Query(None, description="Filter by trading pair"),
-    start_time: Optional[datetime] = Query(None, description="Start time filter"),
-    end_time: Optional[datetime] = Query(None, description="End time filter"),
-    limit: int = Query(100, ge=1, le=1000),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    q: TradeHistoryRequest = Depends(),
+    auth: AuthContext = Depends(get_auth_context)
 ):
     """
     Get user's trade history
     
-    Trades are immutable execution records for audit and compliance
+    Trades are immutable execution records for audit and compliance.
+    Streamed row by row to keep memory flat for large limits.
     """
-    query = select(Trade).where(Trade.user_id == current_user.id)
+    query = select(Trade).where(Trade.user_id == auth.user_id)
     
-    if symbol:
-        query = query.where(Trade.symbol == symbol.upper())
+    if q.symbol:
+        query = query.where(Trade.symbol == q.symbol.upper())
     
-    if start_time:
-        query = query.where(Trade.executed_at >= start_time)
+    if q.start_time:
+        query = query.where(Trade.executed_at >= q.start_time)
     
-    if end_time:
-        query = query.where(Trade.executed_at <= end_time)
+    if q.end_time:
+        query = query.where(Trade.executed_at <= q.end_time)
     
-    query = query.order_by(Trade.executed_at.desc()).limit(limit)
+    query = query.order_by(Trade.executed_at.desc()).limit(q.limit)
     
-    result = await db.execute(query)
-    return result.scalars().all()
+    return stream_query(query, TradeResponse)
 
 
 @router.get("/stats")
 async def get_trade_stats(
     symbol: Optional[str] = Query(None),
-    period: str = Query("24h", regex="^(1h|24h|7d|30d)$"),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    period: StatsPeriod = "24h",
+    auth: AuthContext = Depends(get_auth_context),
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """
     Get trading statistics for user
     """
-    from datetime import timedelta
-    from sqlalchemy import func
-    from decimal import Decimal
-    
     period_map = {
         "1h": timedelta(hours=1),
         "24h": timedelta(hours=24),
@@ -70,16 +66,16 @@ async def get_trade_stats(
         "30d": timedelta(days=30)
     }
     
-    start_time = datetime.utcnow() - period_map[period]
-    
+    # Window is evaluated by the database so the predicate stays index-friendly;
+    # coalesce keeps empty windows from returning NULL sums
     query = select(
         func.count(Trade.id).label("trade_count"),
-        func.sum(Trade.quantity).label("total_quantity"),
-        func.sum(Trade.quote_quantity).label("total_volume"),
-        func.sum(Trade.commission).label("total_fees")
+        func.coalesce(func.sum(Trade.quantity), 0).label("total_quantity"),
+        func.coalesce(func.sum(Trade.quote_quantity), 0).label("total_volume"),
+        func.coalesce(func.sum(Trade.commission), 0).label("total_fees")
     ).where(
-        Trade.user_id == current_user.id,
-        Trade.executed_at >= start_time
+        Trade.user_id == auth.user_id,
+        Trade.executed_at >= func.now() - period_map[period]
     )
     
     if symbol:
@@ -91,14 +87,15 @@ async def get_trade_stats(
     return {
         "period": period,
         "symbol": symbol,
-        "trade_count": row.trade_count or 0,
-        "total_quantity": str(row.total_quantity or Decimal(0)),
-        "total_volume": str(row.total_volume or Decimal(0)),
-        "total_fees": str(row.total_fees or Decimal(0))
+        "trade_count": row.trade_count,
+        "total_quantity": str(row.total_quantity),
+        "total_volume": str(row.total_volume),
+        "total_fees": str(row.total_fees)
     }
 
 
 @router.get("/recent/{symbol}")
+@cached_response(ttl=1, key_fn=lambda symbol, limit: f"mkt:trades:{symbol.upper()}:{limit}")
 async def get_recent_trades(
     symbol: str,
     limit: int = Query(50, ge=1, le=500)
@@ -106,8 +103,6 @@ async def get_recent_trades(
     """
     Get recent public trades for a symbol (no auth required)
     """
-    from app.services.market import market_service
-    
     trades = await market_service.get_recent_trades(symbol, limit)
     return trades
 
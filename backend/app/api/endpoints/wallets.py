@@ -8,14 +8,14 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_db_readonly
 from app.models.user import User
 from app.schemas.wallet import (
     WalletCreate, WalletResponse, TransactionCreate, TransactionResponse,
     SignMessageRequest, SignMessageResponse, GasEstimate, WalletBalance
 )
 from app.services.wallet import wallet_service
-from app.api.deps import get_current_user
+from app.api.deps import AuthContext, get_auth_context, get_current_user
 
 router = APIRouter()
 
@@ -67,24 +67,24 @@ async def bind_wallet(
 
 @router.get("", response_model=List[WalletResponse])
 async def get_wallets(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    auth: AuthContext = Depends(get_auth_context),
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """
     Get all bound wallets
     """
-    return await wallet_service.get_user_wallets(db, current_user.id)
+    return await wallet_service.get_user_wallets(db, auth.user_id)
 
 
 @router.get("/balances", response_model=List[WalletBalance])
 async def get_balances(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    auth: AuthContext = Depends(get_auth_context),
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """
     Get aggregated balances across all wallets
     """
-    return await wallet_service.get_wallet_balances(db, current_user.id)
+    return await wallet_service.get_wallet_balances(db, auth.user_id)
 
 
 @router.get("/estimate-gas", response_model=GasEstimate)
@@ -141,11 +141,11 @@ async def create_withdrawal(
 @router.get("/transactions", response_model=List[TransactionResponse])
 async def get_transactions(
     limit: int = Query(50, ge=1, le=500),
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    auth: AuthContext = Depends(get_auth_context),
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """
     Get transaction history
     """
-    return await wallet_service.get_transactions(db, current_user.id, limit)
+    return await wallet_service.get_transactions(db, auth.user_id, limit)
 
@@ -0,0 +1,87 @@
+"""
+API Response Classes
+orjson-backed responses for trading payloads
+"""
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, AsyncIterator, List, Type
+
+import orjson
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.sql import Select
+
+from app.database import readonly_session_factory
+
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+# Rows validated and serialized per batch when streaming query results
+STREAM_BATCH_SIZE = 100
+
+
+def orjson_default(obj: Any) -> Any:
+    """Fallback for types orjson does not encode natively"""
+    if isinstance(obj, Decimal):
+        return str(obj)  # Keep full precision for prices and quantities
+    if isinstance(obj, BaseModel):
+        # pydantic-core writes the JSON itself; embedded as-is, no intermediate dict
+        return orjson.Fragment(obj.__pydantic_serializer__.to_json(obj))
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize with the shared orjson options"""
+    return orjson.dumps(content, default=orjson_default, option=ORJSON_OPTIONS)
+
+
+def fast_json(body: bytes, **kwargs: Any) -> Response:
+    """
+    Response for an already serialized JSON body
+    Skips response_model validation and jsonable_encoder's per-field walk
+    """
+    return Response(content=body, media_type="application/json", **kwargs)
+
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    ORJSONResponse that also accepts Decimal values and pydantic models
+    Used as the application's default response class
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@lru_cache(maxsize=None)
+def list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    """Shared List[schema] adapter - one core schema validates a whole batch"""
+    return TypeAdapter(List[schema])
+
+
+async def _iter_json_array(query: Select, schema: Type[BaseModel]) -> AsyncIterator[bytes]:
+    """
+    Yield a JSON array batch by batch from a server-side cursor
+    Owns its session since request dependencies close before the body is sent
+    """
+    adapter = list_adapter(schema)
+    
+    async with readonly_session_factory() as session:
+        result = await session.stream_scalars(query)
+        
+        yield b"["
+        first = True
+        async for rows in result.partitions(STREAM_BATCH_SIZE):
+            # One validate + dump per batch; strip the batch's own brackets
+            body = adapter.dump_json(adapter.validate_python(rows, from_attributes=True))[1:-1]
+            yield body if first else b"," + body
+            first = False
+        yield b"]"
+
+
+def stream_query(query: Select, schema: Type[BaseModel]) -> StreamingResponse:
+    """Stream ORM query results as a JSON array without materializing the list"""
+    return StreamingResponse(
+        _iter_json_array(query, schema),
+        media_type="application/json",
+    )
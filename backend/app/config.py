@@ -2,6 +2,7 @@
 Application Configuration
 High-performance settings optimized for trading infrastructure
 """
+from dataclasses import make_dataclass
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 from typing import Optional
@@ -19,11 +20,24 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "postgresql+asyncpg://trading:trading@db:5432/fasttrading"
     DATABASE_POOL_SIZE: int = 20
-    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_MAX_OVERFLOW: int = 40
+    DATABASE_POOL_TIMEOUT: int = 5  # seconds to wait for a free connection
+    DATABASE_POOL_RECYCLE: int = 1800  # seconds
+    DATABASE_POOL_PRE_PING: bool = False  # TCP keepalive detects dead connections
+    DATABASE_CONNECT_TIMEOUT: int = 10  # seconds
+    DATABASE_COMMAND_TIMEOUT: int = 10  # seconds
+    DATABASE_TCP_KEEPIDLE: int = 30  # seconds idle before the first probe
+    DATABASE_TCP_KEEPINTVL: int = 10  # seconds between probes
+    DATABASE_TCP_KEEPCNT: int = 3  # failed probes before the socket is dropped
+    DATABASE_STATEMENT_CACHE_SIZE: int = 1024  # asyncpg statements per connection
+    DATABASE_PREPARED_STATEMENT_CACHE_SIZE: int = 256  # SQLAlchemy-side per connection
+    PGBOUNCER_MODE: bool = False  # Disable statement reuse behind transaction pooling
     
     # Redis
     REDIS_URL: str = "redis://redis:6379/0"
     REDIS_CACHE_TTL: int = 60  # seconds
+    REDIS_POOL_SIZE: int = 50  # Shared pool cap, protects Redis from connection storms
+    REDIS_POOL_TIMEOUT: int = 2  # seconds to wait for a free connection
     
     # Security
     SECRET_KEY: str = "your-super-secret-key-change-in-production"
@@ -48,17 +62,28 @@ class Settings(BaseSettings):
     RATE_LIMIT_WINDOW: int = 60  # seconds
     
     # CORS
-    CORS_ORIGINS: list = ["http://localhost:3000", "http://frontend:3000"]
+    CORS_ORIGINS: frozenset[str] = frozenset(["http://localhost:3000", "http://frontend:3000"])
     
     class Config:
         env_file = ".env"
         case_sensitive = True
 
 
+# Immutable mirror of Settings - attribute reads are plain slot lookups
+# instead of going through the pydantic model on hot paths
+FrozenSettings = make_dataclass(
+    "FrozenSettings",
+    [(name, field.annotation) for name, field in Settings.model_fields.items()],
+    frozen=True,
+    slots=True,
+)
+FrozenSettings.__module__ = __name__
+
+
 @lru_cache()
-def get_settings() -> Settings:
-    """Cached settings instance for performance"""
-    return Settings()
+def get_settings() -> FrozenSettings:
+    """Cached settings instance - validated once from the environment, then frozen"""
+    return FrozenSettings(**Settings().model_dump())
 
 
 settings = get_settings()
@@ -2,24 +2,86 @@
 Database Configuration
 High-performance async PostgreSQL connection pooling
 """
+import asyncio
+import socket
+from uuid import uuid4
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from contextlib import asynccontextmanager
 import redis.asyncio as redis
 
 from app.config import settings
 
 
+connect_args = {
+    "timeout": settings.DATABASE_CONNECT_TIMEOUT,
+    "command_timeout": settings.DATABASE_COMMAND_TIMEOUT,
+    "server_settings": {
+        # Short OLTP queries never benefit from JIT, but pay its planning cost
+        "jit": "off",
+        "application_name": settings.APP_NAME.lower(),
+    },
+}
+
+if settings.PGBOUNCER_MODE:
+    # Transaction pooling may hand each statement a different server
+    # connection, so named statements must be unique and never reused
+    connect_args.update(
+        statement_cache_size=0,
+        prepared_statement_cache_size=0,
+        prepared_statement_name_func=lambda: f"__asyncpg_{uuid4()}__",
+    )
+else:
+    # Server-side prepared statements: repeat queries skip parse and plan
+    connect_args.update(
+        statement_cache_size=settings.DATABASE_STATEMENT_CACHE_SIZE,
+        prepared_statement_cache_size=settings.DATABASE_PREPARED_STATEMENT_CACHE_SIZE,
+    )
+
 # Create async engine with optimized settings
 engine = create_async_engine(
     settings.DATABASE_URL,
+    # Explicit so a copy-pasted sync QueuePool can never block the event loop
+    poolclass=AsyncAdaptedQueuePool,
     pool_size=settings.DATABASE_POOL_SIZE,
     max_overflow=settings.DATABASE_MAX_OVERFLOW,
-    pool_pre_ping=True,  # Verify connections before use
-    pool_recycle=3600,  # Recycle connections after 1 hour
+    pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+    # Reuse the most recently returned connection: a small hot set serves most
+    # traffic (warm statement caches), the rest idle out via pool_recycle
+    pool_use_lifo=True,
+    # Dead sockets are reaped by TCP keepalive, so no SELECT 1 per checkout
+    pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,
     echo=settings.DEBUG,
+    echo_pool=settings.DEBUG,
+    # Batched flushes (e.g. a match's trades) go out as multi-row INSERTs
+    use_insertmanyvalues=True,
+    insertmanyvalues_page_size=1000,
+    connect_args=connect_args,
 )
 
+
+@event.listens_for(engine.sync_engine, "connect")
+def _enable_tcp_keepalive(dbapi_connection, connection_record):
+    """
+    Turn on kernel TCP keepalive for each new asyncpg connection
+    Connections dropped by load balancers are detected before checkout
+    """
+    # _transport is private asyncpg API - if it goes away, skip keepalive
+    # rather than failing every pool connect
+    transport = getattr(dbapi_connection.driver_connection, "_transport", None)
+    sock = transport.get_extra_info("socket") if transport else None
+    if sock is None or sock.family not in (socket.AF_INET, socket.AF_INET6):
+        return
+    
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    if hasattr(socket, "TCP_KEEPIDLE"):  # Linux only
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, settings.DATABASE_TCP_KEEPIDLE)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, settings.DATABASE_TCP_KEEPINTVL)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, settings.DATABASE_TCP_KEEPCNT)
+
 # Session factory
 async_session_factory = async_sessionmaker(
     engine,
@@ -30,6 +92,41 @@ async_session_factory = async_sessionmaker(
 )
 
 
+# Read-only sessions share the pool; transactions open as BEGIN READ ONLY
+# in the same round trip and never issue a COMMIT
+readonly_session_factory = async_sessionmaker(
+    engine.execution_options(postgresql_readonly=True),
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
+
+def get_pool_stats() -> dict:
+    """
+    Connection pool usage for monitoring
+    """
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "checked_in": pool.checkedin(),
+    }
+
+
+async def warm_db_pool() -> None:
+    """
+    Open `pool_size` connections up front so first requests skip the handshake
+    """
+    connections = await asyncio.gather(
+        *[engine.connect() for _ in range(settings.DATABASE_POOL_SIZE)]
+    )
+    for connection in connections:
+        await connection.close()
+
+
 @asynccontextmanager
 async def get_db_session():
     """
@@ -50,32 +147,51 @@ async def get_db_session():
 async def get_db() -> AsyncSession:
     """
     Dependency for FastAPI endpoints
+    Writes commit explicitly; anything left open is rolled back on close,
+    so read-only requests never pay for a COMMIT
     """
     async with async_session_factory() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
+        yield session
 
 
-# Redis connection pool
+async def get_db_readonly() -> AsyncSession:
+    """
+    Dependency for read-only endpoints
+    """
+    async with readonly_session_factory() as session:
+        yield session
+
+
+# Redis connection pool and the client shared across the app
 redis_pool = None
+redis_client = None
 
 
-async def get_redis() -> redis.Redis:
+def init_redis() -> redis.Redis:
     """
-    Get Redis connection from pool
+    Build the shared Redis pool and client - called once at startup
+    Responses stay as bytes so cached payloads pass through without decoding
     """
-    global redis_pool
-    if redis_pool is None:
-        redis_pool = redis.ConnectionPool.from_url(
+    global redis_pool, redis_client
+    if redis_client is None:
+        # Blocking pool: bursts wait for a free connection instead of opening more
+        redis_pool = redis.BlockingConnectionPool.from_url(
             settings.REDIS_URL,
-            max_connections=100,
-            decode_responses=True,
+            max_connections=settings.REDIS_POOL_SIZE,
+            timeout=settings.REDIS_POOL_TIMEOUT,
+            decode_responses=False,
+            socket_keepalive=True,
+            health_check_interval=30,
         )
-    return redis.Redis(connection_pool=redis_pool)
+        redis_client = redis.Redis(connection_pool=redis_pool)
+    return redis_client
+
+
+async def get_redis() -> redis.Redis:
+    """
+    Get the shared Redis client built at startup
+    """
+    return redis_client or init_redis()
 
 
 async def init_db():
@@ -0,0 +1,109 @@
+"""
+ASGI Middleware
+Lightweight request/response hooks operating directly on scope and messages
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+ALLOWED_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+PREFLIGHT_MAX_AGE = b"600"
+
+Header = Tuple[bytes, bytes]
+
+PREFLIGHT_HEADERS: List[Header] = [
+    (b"vary", b"Origin"),
+    (b"access-control-allow-methods", ALLOWED_METHODS),
+    (b"access-control-max-age", PREFLIGHT_MAX_AGE),
+    (b"access-control-allow-credentials", b"true"),
+    (b"content-type", b"text/plain; charset=utf-8"),
+]
+
+
+class PureASGICors:
+    """
+    CORS for a fixed set of origins, credentials allowed
+    Preflights are answered here without reaching the app; other requests
+    only get their allow headers appended on response start
+    """
+    
+    def __init__(self, app: ASGIApp, origins: Iterable[str]):
+        self.app = app
+        # Response headers prebuilt per allowed origin, keyed by raw header bytes
+        self.simple_headers: Dict[bytes, Tuple[Header, ...]] = {}
+        self.preflight_headers: Dict[bytes, Tuple[Header, ...]] = {}
+        for origin in frozenset(origins):
+            raw = origin.encode("latin-1")
+            self.simple_headers[raw] = (
+                (b"access-control-allow-origin", raw),
+                (b"access-control-allow-credentials", b"true"),
+                (b"vary", b"Origin"),
+            )
+            self.preflight_headers[raw] = (
+                *PREFLIGHT_HEADERS,
+                (b"access-control-allow-origin", raw),
+            )
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        origin = None
+        request_method = None
+        request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+        
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+        
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            await self._preflight(send, self.preflight_headers.get(origin), request_headers)
+            return
+        
+        cors_headers = self.simple_headers.get(origin)
+        if cors_headers is None:
+            await self.app(scope, receive, send)
+            return
+        
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *cors_headers]
+            await send(message)
+        
+        await self.app(scope, receive, send_with_cors)
+    
+    @staticmethod
+    async def _preflight(
+        send: Send,
+        origin_headers: Optional[Tuple[Header, ...]],
+        request_headers: Optional[bytes]
+    ) -> None:
+        """Answer a CORS preflight request directly"""
+        allowed = origin_headers is not None
+        if allowed:
+            headers = list(origin_headers)
+            body = b"OK"
+        else:
+            headers = list(PREFLIGHT_HEADERS)
+            body = b"Disallowed CORS origin"
+        
+        # All headers are allowed, so mirror back whatever was requested
+        if request_headers is not None:
+            headers.append((b"access-control-allow-headers", request_headers))
+        headers.append((b"content-length", str(len(body)).encode()))
+        
+        await send({
+            "type": "http.response.start",
+            "status": 200 if allowed else 400,
+            "headers": headers,
+        })
+        await send({"type": "http.response.body", "body": body})
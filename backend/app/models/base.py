@@ -2,10 +2,14 @@
 Base SQLAlchemy Model
 Optimized for high-frequency trading operations
 """
-from datetime import datetime
-from sqlalchemy import Column, DateTime, BigInteger
-from sqlalchemy.orm import DeclarativeBase
+from datetime import datetime, timezone
+from decimal import Decimal, ROUND_HALF_UP
+from enum import Enum
+from typing import Dict, Type
+from sqlalchemy import Column, DateTime, BigInteger, SmallInteger, event
+from sqlalchemy.orm import DeclarativeBase, Session
 from sqlalchemy.sql import func
+from sqlalchemy.types import TypeDecorator
 
 
 class Base(DeclarativeBase):
@@ -13,8 +17,63 @@ class Base(DeclarativeBase):
     pass
 
 
+class ScaledDecimal(TypeDecorator):
+    """
+    Fixed-point amount stored as BIGINT scaled by 10^8 (satoshi-style)
+    Fixed-width integer columns and index keys instead of variable-length
+    NUMERIC; Python code and the API still see Decimal
+    """
+    impl = BigInteger
+    cache_ok = True
+    
+    SCALE = 8
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return int(
+            Decimal(value).scaleb(self.SCALE).to_integral_value(rounding=ROUND_HALF_UP)
+        )
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return Decimal(value).scaleb(-self.SCALE)
+
+
+class EnumCode(TypeDecorator):
+    """
+    Python Enum stored as a SMALLINT code
+    Narrower rows and index keys than ENUM/VARCHAR columns; codes are
+    persisted, so existing members must never be renumbered
+    """
+    impl = SmallInteger
+    cache_ok = True
+    
+    def __init__(self, enum_class: Type[Enum], codes: Dict[Enum, int]):
+        super().__init__()
+        self.enum_class = enum_class
+        self._to_code = {member: codes[member] for member in enum_class}
+        self._to_member = {code: member for member, code in self._to_code.items()}
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return self._to_code[self.enum_class(value)]
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self._to_member[value]
+
+
 class TimestampMixin:
-    """Mixin for timestamp fields with nanosecond precision awareness"""
+    """
+    Mixin for timestamp fields with nanosecond precision awareness
+    Stamped client-side once per flush (see _stamp_timestamps), so rows
+    written together share one clock read; the server defaults cover Core
+    inserts and tables built with create_all
+    """
     created_at = Column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -24,11 +83,24 @@ class TimestampMixin:
     updated_at = Column(
         DateTime(timezone=True),
         server_default=func.now(),
-        onupdate=func.now(),
         nullable=False
     )
 
 
+@event.listens_for(Session, "before_flush")
+def _stamp_timestamps(session: Session, flush_context, instances) -> None:
+    """Set created_at/updated_at on new rows and updated_at on modified rows"""
+    now = datetime.now(timezone.utc)
+    
+    for obj in session.new:
+        if isinstance(obj, TimestampMixin):
+            obj.created_at = obj.updated_at = now
+    
+    for obj in session.dirty:
+        if isinstance(obj, TimestampMixin) and session.is_modified(obj, include_collections=False):
+            obj.updated_at = now
+
+
 class SequenceMixin:
     """Mixin for sequence tracking - essential for order matching"""
     sequence_id = Column(
@@ -3,12 +3,14 @@ Order Models
 High-performance order management for trading engine
 """
 from enum import Enum
-from sqlalchemy import Column, String, Numeric, DateTime, ForeignKey, Index, Enum as SQLEnum, BigInteger
+from sqlalchemy import (
+    Column, String, Numeric, DateTime, ForeignKey, Index, BigInteger, CheckConstraint, text
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
 
-from .base import Base, TimestampMixin
+from .base import Base, TimestampMixin, ScaledDecimal, EnumCode
 
 
 class OrderSide(str, Enum):
@@ -40,6 +42,31 @@ class TimeInForce(str, Enum):
     GTD = "gtd"  # Good Till Date
 
 
+# Stored SMALLINT codes - persisted in the database, never renumber
+OrderSideType = EnumCode(OrderSide, {OrderSide.BUY: 1, OrderSide.SELL: 2})
+OrderTypeType = EnumCode(OrderType, {
+    OrderType.MARKET: 1,
+    OrderType.LIMIT: 2,
+    OrderType.STOP_LIMIT: 3,
+    OrderType.STOP_MARKET: 4,
+})
+OrderStatusType = EnumCode(OrderStatus, {
+    OrderStatus.PENDING: 1,
+    OrderStatus.OPEN: 2,
+    OrderStatus.PARTIAL: 3,
+    OrderStatus.FILLED: 4,
+    OrderStatus.CANCELLED: 5,
+    OrderStatus.REJECTED: 6,
+    OrderStatus.EXPIRED: 7,
+})
+TimeInForceType = EnumCode(TimeInForce, {
+    TimeInForce.GTC: 1,
+    TimeInForce.IOC: 2,
+    TimeInForce.FOK: 3,
+    TimeInForce.GTD: 4,
+})
+
+
 class Order(Base, TimestampMixin):
     __tablename__ = "orders"
     
@@ -50,44 +77,57 @@ class Order(Base, TimestampMixin):
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     
     # Trading pair
-    symbol = Column(String(20), nullable=False, index=True)  # e.g., "ETH-USDT"
+    symbol = Column(String(20), nullable=False)  # e.g., "ETH-USDT"
     
     # Order details
-    side = Column(SQLEnum(OrderSide), nullable=False)
-    order_type = Column(SQLEnum(OrderType), nullable=False)
-    status = Column(SQLEnum(OrderStatus), default=OrderStatus.PENDING, nullable=False, index=True)
-    time_in_force = Column(SQLEnum(TimeInForce), default=TimeInForce.GTC, nullable=False)
+    side = Column(OrderSideType, nullable=False)
+    order_type = Column(OrderTypeType, nullable=False)
+    status = Column(OrderStatusType, default=OrderStatus.PENDING, nullable=False)
+    time_in_force = Column(TimeInForceType, default=TimeInForce.GTC, nullable=False)
     
-    # Pricing (using Numeric for precision - critical for financial data)
-    price = Column(Numeric(20, 8), nullable=True)  # Null for market orders
-    stop_price = Column(Numeric(20, 8), nullable=True)
+    # Pricing - exact fixed-point, stored as BIGINT scaled by 10^8 for the matching indexes
+    price = Column(ScaledDecimal, nullable=True)  # Null for market orders
+    stop_price = Column(ScaledDecimal, nullable=True)
     
     # Quantities
-    quantity = Column(Numeric(20, 8), nullable=False)
-    filled_quantity = Column(Numeric(20, 8), default=0, nullable=False)
-    remaining_quantity = Column(Numeric(20, 8), nullable=False)
+    quantity = Column(ScaledDecimal, nullable=False)
+    filled_quantity = Column(ScaledDecimal, default=0, nullable=False)
+    remaining_quantity = Column(ScaledDecimal, nullable=False)
     
     # Execution details
-    average_fill_price = Column(Numeric(20, 8), nullable=True)
+    average_fill_price = Column(ScaledDecimal, nullable=True)
     commission = Column(Numeric(20, 8), default=0, nullable=False)
     commission_asset = Column(String(10), nullable=True)
     
     # Sequence for order matching (nanosecond precision)
-    sequence_number = Column(BigInteger, autoincrement=True, nullable=False, index=True)
+    sequence_number = Column(BigInteger, autoincrement=True, nullable=False)
     
     # Expiration
     expires_at = Column(DateTime(timezone=True), nullable=True)
     
     # Relationships
-    user = relationship("User", back_populates="orders")
-    trades = relationship("Trade", back_populates="order", lazy="dynamic")
+    user = relationship("User", back_populates="orders", lazy="raise_on_sql")
+    trades = relationship("Trade", back_populates="order", lazy="raise_on_sql")
     
     # Critical indexes for trading engine performance
+    # (symbol) and (symbol, status) lookups are served by ix_orders_matching
     __table_args__ = (
-        Index('ix_orders_symbol_status', 'symbol', 'status'),
         Index('ix_orders_symbol_side_price', 'symbol', 'side', 'price'),
         Index('ix_orders_user_status', 'user_id', 'status'),
         Index('ix_orders_matching', 'symbol', 'status', 'side', 'price', 'sequence_number'),
+        # Live book only (OPEN=2, PARTIAL=3) - stays small and cache-resident
+        # while filled/cancelled history keeps growing
+        Index(
+            'ix_orders_active_book', 'symbol', 'side', 'price', 'sequence_number',
+            postgresql_where=text('status IN (2, 3)'),
+        ),
+        CheckConstraint('price IS NULL OR price > 0', name='ck_orders_price_positive'),
+        CheckConstraint('stop_price IS NULL OR stop_price > 0', name='ck_orders_stop_price_positive'),
+        CheckConstraint('quantity > 0', name='ck_orders_quantity_positive'),
+        CheckConstraint(
+            'filled_quantity >= 0 AND remaining_quantity >= 0',
+            name='ck_orders_fill_non_negative'
+        ),
     )
     
     def __repr__(self):
@@ -103,9 +143,9 @@ class OrderBook(Base):
     
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     symbol = Column(String(20), nullable=False, index=True)
-    side = Column(SQLEnum(OrderSide), nullable=False)
-    price = Column(Numeric(20, 8), nullable=False)
-    quantity = Column(Numeric(20, 8), nullable=False)
+    side = Column(OrderSideType, nullable=False)
+    price = Column(ScaledDecimal, nullable=False)
+    quantity = Column(ScaledDecimal, nullable=False)
     order_count = Column(BigInteger, default=1, nullable=False)
     
     __table_args__ = (
@@ -28,7 +28,7 @@ class Trade(Base):
     counterparty_order_id = Column(UUID(as_uuid=True), nullable=False)
     
     # Trading pair
-    symbol = Column(String(20), nullable=False, index=True)
+    symbol = Column(String(20), nullable=False)  # Indexed via ix_trades_symbol_time
     
     # Execution details
     side = Column(String(4), nullable=False)  # buy/sell
@@ -51,13 +51,20 @@ class Trade(Base):
     block_number = Column(BigInteger, nullable=True)
     
     # Relationships
-    user = relationship("User", back_populates="trades")
-    order = relationship("Order", back_populates="trades")
+    user = relationship("User", back_populates="trades", lazy="raise_on_sql")
+    order = relationship("Order", back_populates="trades", lazy="raise_on_sql")
     
     # Indexes for common queries
+    # The table is a TimescaleDB hypertable range-partitioned into daily chunks
+    # on executed_at (migrations/001), so these are per-chunk indexes
     __table_args__ = (
         Index('ix_trades_symbol_time', 'symbol', 'executed_at'),
         Index('ix_trades_user_time', 'user_id', 'executed_at'),
+        # Covering index for per-user trade stats (index-only aggregation)
+        Index(
+            'ix_trades_user_symbol_time', 'user_id', 'symbol', 'executed_at',
+            postgresql_include=['quantity', 'quote_quantity', 'commission'],
+        ),
         Index('ix_trades_order', 'order_id'),
     )
     
@@ -24,6 +24,7 @@ class User(Base, TimestampMixin):
     is_active = Column(Boolean, default=True, nullable=False)
     is_verified = Column(Boolean, default=False, nullable=False)
     is_2fa_enabled = Column(Boolean, default=False, nullable=False)
+    is_admin = Column(Boolean, default=False, nullable=False)
     
     # Trading limits
     daily_trade_limit = Column(Numeric(20, 8), default=100000.0)
@@ -37,9 +38,9 @@ class User(Base, TimestampMixin):
     api_secret = Column(String(128), nullable=True)
     
     # Relationships
-    orders = relationship("Order", back_populates="user", lazy="dynamic")
-    trades = relationship("Trade", back_populates="user", lazy="dynamic")
-    wallets = relationship("Wallet", back_populates="user", lazy="dynamic")
+    orders = relationship("Order", back_populates="user", lazy="raise_on_sql")
+    trades = relationship("Trade", back_populates="user", lazy="raise_on_sql")
+    wallets = relationship("Wallet", back_populates="user", lazy="raise_on_sql")
     
     # Composite indexes for common queries
     __table_args__ = (
@@ -62,8 +62,8 @@ class Wallet(Base, TimestampMixin):
     signature_message = Column(Text, nullable=True)
     
     # Relationships
-    user = relationship("User", back_populates="wallets")
-    transactions = relationship("Transaction", back_populates="wallet", lazy="dynamic")
+    user = relationship("User", back_populates="wallets", lazy="raise_on_sql")
+    transactions = relationship("Transaction", back_populates="wallet", lazy="raise_on_sql")
     
     __table_args__ = (
         Index('ix_wallets_user_currency', 'user_id', 'currency'),
@@ -119,7 +119,7 @@ class Transaction(Base, TimestampMixin):
     retry_count = Column(BigInteger, default=0, nullable=False)
     
     # Relationships
-    wallet = relationship("Wallet", back_populates="transactions")
+    wallet = relationship("Wallet", back_populates="transactions", lazy="raise_on_sql")
     
     __table_args__ = (
         Index('ix_transactions_status_type', 'status', 'tx_type'),
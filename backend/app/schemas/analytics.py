@@ -2,13 +2,15 @@
 AI Analytics Schemas
 Data structures for AI-driven analytics, risk scoring, and predictions
 """
-from pydantic import BaseModel, Field
+from pydantic import Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from uuid import UUID
 from decimal import Decimal
 from enum import Enum
 
+from app.schemas.base import Schema
+
 
 class RiskLevel(str, Enum):
     """Risk level classification"""
@@ -29,7 +31,7 @@ class AnomalyType(str, Enum):
     UNUSUAL_PATTERN = "unusual_pattern"
 
 
-class AnomalyAlert(BaseModel):
+class AnomalyAlert(Schema):
     """Alert for detected anomaly"""
     id: str
     type: AnomalyType
@@ -45,7 +47,7 @@ class AnomalyAlert(BaseModel):
         from_attributes = True
 
 
-class RiskScore(BaseModel):
+class RiskScore(Schema):
     """Comprehensive risk assessment"""
     user_id: Optional[UUID] = None
     overall_score: float = Field(ge=0, le=10, description="Overall risk score 0-10")
@@ -59,7 +61,7 @@ class RiskScore(BaseModel):
         from_attributes = True
 
 
-class PricePrediction(BaseModel):
+class PricePrediction(Schema):
     """AI-generated price prediction"""
     symbol: str
     current_price: Decimal
@@ -74,7 +76,7 @@ class PricePrediction(BaseModel):
         from_attributes = True
 
 
-class PortfolioPosition(BaseModel):
+class PortfolioPosition(Schema):
     """Individual portfolio position"""
     symbol: str
     quantity: Decimal
@@ -89,7 +91,7 @@ class PortfolioPosition(BaseModel):
         from_attributes = True
 
 
-class TradingMetrics(BaseModel):
+class TradingMetrics(Schema):
     """Comprehensive trading performance metrics"""
     total_trades: int
     winning_trades: int
@@ -106,7 +108,7 @@ class TradingMetrics(BaseModel):
         from_attributes = True
 
 
-class AIInsight(BaseModel):
+class AIInsight(Schema):
     """AI-generated insight or recommendation"""
     type: str = Field(description="performance, risk, opportunity, or warning")
     title: str
@@ -118,7 +120,7 @@ class AIInsight(BaseModel):
         from_attributes = True
 
 
-class PortfolioAnalysis(BaseModel):
+class PortfolioAnalysis(Schema):
     """Complete portfolio analysis"""
     user_id: UUID
     total_value: Decimal
@@ -133,7 +135,7 @@ class PortfolioAnalysis(BaseModel):
         from_attributes = True
 
 
-class MarketSentiment(BaseModel):
+class MarketSentiment(Schema):
     """Market sentiment analysis"""
     symbol: str
     sentiment: str = Field(description="bullish, bearish, neutral, etc.")
@@ -149,35 +151,35 @@ class MarketSentiment(BaseModel):
 
 
 # Request/Response models
-class AnomalyDetectionRequest(BaseModel):
+class AnomalyDetectionRequest(Schema):
     """Request for anomaly detection"""
     user_id: Optional[UUID] = None
     symbol: Optional[str] = None
     lookback_hours: int = Field(default=24, ge=1, le=168)
 
 
-class RiskScoreRequest(BaseModel):
+class RiskScoreRequest(Schema):
     """Request for risk score calculation"""
     user_id: UUID
 
 
-class PricePredictionRequest(BaseModel):
+class PricePredictionRequest(Schema):
     """Request for price prediction"""
     symbol: str
     horizon_minutes: int = Field(default=60, ge=5, le=1440)
 
 
-class PortfolioAnalysisRequest(BaseModel):
+class PortfolioAnalysisRequest(Schema):
     """Request for portfolio analysis"""
     user_id: UUID
 
 
-class MarketSentimentRequest(BaseModel):
+class MarketSentimentRequest(Schema):
     """Request for market sentiment analysis"""
     symbol: str
 
 
-class AIAnalyticsSummary(BaseModel):
+class AIAnalyticsSummary(Schema):
     """Summary of AI analytics for dashboard"""
     risk_score: Optional[RiskScore] = None
     recent_anomalies: List[AnomalyAlert] = []
@@ -190,7 +192,7 @@ class AIAnalyticsSummary(BaseModel):
         from_attributes = True
 
 
-class ComplianceAlert(BaseModel):
+class ComplianceAlert(Schema):
     """Compliance-related alert"""
     id: str
     type: str
@@ -205,7 +207,7 @@ class ComplianceAlert(BaseModel):
         from_attributes = True
 
 
-class AMLScreeningResult(BaseModel):
+class AMLScreeningResult(Schema):
     """Anti-Money Laundering screening result"""
     user_id: UUID
     status: str = Field(description="clear, flagged, or blocked")
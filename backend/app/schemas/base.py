@@ -0,0 +1,94 @@
+"""
+Base Schema
+Shared configuration for API data structures
+"""
+from enum import Enum
+from typing import Annotated, Any, Iterable, Set, Type, get_args
+from uuid import UUID
+
+from pydantic import (
+    BaseModel, BeforeValidator, ConfigDict, PlainValidator, StringConstraints, WithJsonSchema
+)
+
+
+class Schema(BaseModel):
+    """
+    Base for all schemas
+    Core schema is built on first use rather than at import, so rarely used
+    models cost nothing until a request needs them
+    """
+    model_config = ConfigDict(defer_build=True)
+
+
+class FrozenSchema(Schema):
+    """
+    Immutable, closed schema for hot request/response models and DTOs
+    Unknown fields are rejected; trusted producers may build instances with
+    model_construct, skipping validation
+    """
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+
+# Hex Ethereum address, one shared compiled validator for every address field.
+# The exact length check rejects most bad input before the regex runs.
+EthAddress = Annotated[
+    str,
+    StringConstraints(min_length=42, max_length=42, pattern="^0x[a-fA-F0-9]{40}$"),
+]
+
+
+def _uuid_str(value: Any) -> str:
+    """Render a UUID to its canonical string once, at validation"""
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, str) and len(value) == 36:
+        return value
+    raise ValueError("Invalid UUID")
+
+
+# UUID kept as its string form - responses never need the UUID object, and
+# serializing a str is a plain copy
+UUIDStr = Annotated[
+    str,
+    PlainValidator(_uuid_str),
+    WithJsonSchema({"type": "string", "format": "uuid"}),
+]
+
+
+def _member_value(value: Any) -> Any:
+    """Unwrap an Enum member to its raw value"""
+    return value.value if isinstance(value, Enum) else value
+
+
+# For Literal fields read from ORM attributes, which hold Enum members
+EnumValue = BeforeValidator(_member_value)
+
+
+def _collect_models(annotation: Any, found: Set[Type[BaseModel]]) -> None:
+    """Gather the models referenced by a type annotation"""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        if annotation not in found:
+            found.add(annotation)
+            for field in annotation.model_fields.values():
+                _collect_models(field.annotation, found)
+        return
+    for arg in get_args(annotation):
+        _collect_models(arg, found)
+
+
+def build_route_schemas(routes: Iterable[Any]) -> int:
+    """
+    Build the deferred schemas bound to mounted routes as request bodies or
+    response models, so their first request doesn't pay for it
+    """
+    models: Set[Type[BaseModel]] = set()
+    for route in routes:
+        _collect_models(getattr(route, "response_model", None), models)
+        dependant = getattr(route, "dependant", None)
+        if dependant is not None:
+            for param in dependant.body_params:
+                _collect_models(param.field_info.annotation, models)
+    
+    for model in models:
+        model.model_rebuild()
+    return len(models)
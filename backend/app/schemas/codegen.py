@@ -0,0 +1,171 @@
+"""
+Schema Code Generation
+Specialized JSON validators generated from a model's field layout
+"""
+import inspect
+import re
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Dict, List, Literal, Optional, Type, TypeVar, Union, get_args, get_origin
+
+import annotated_types
+import orjson
+from pydantic import AfterValidator, BaseModel, StringConstraints
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+_BOUNDS = {
+    annotated_types.Gt: ("gt", ">"),
+    annotated_types.Ge: ("ge", ">="),
+    annotated_types.Lt: ("lt", "<"),
+    annotated_types.Le: ("le", "<="),
+}
+
+
+class _Info:
+    """Minimal ValidationInfo for field validators that read earlier fields"""
+    __slots__ = ("data",)
+    
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+
+
+def _decimal(value: Any) -> Optional[Decimal]:
+    """Decimal from a JSON int or plain numeric string, None for anything else"""
+    if type(value) is int:
+        return Decimal(value)
+    if type(value) is not str or "_" in value or value != value.strip():
+        return None
+    try:
+        result = Decimal(value)
+    except InvalidOperation:
+        return None
+    return result if result.is_finite() else None
+
+
+def _field_lines(name: str, annotation: Any, metadata: List[Any], env: Dict[str, Any]) -> List[str]:
+    """Source lines that check `v` for one field and leave the validated value in `v`"""
+    lines: List[str] = []
+    
+    if get_origin(annotation) is Literal:
+        env[f"choices_{name}"] = frozenset(get_args(annotation))
+        lines.append(f"if type(v) is not str or v not in choices_{name}: return None")
+    elif annotation is str:
+        lines.append("if type(v) is not str: return None")
+    elif annotation is Decimal:
+        lines += ["v = _decimal(v)", "if v is None: return None"]
+    else:
+        raise TypeError(f"Unsupported field type for {name}: {annotation!r}")
+    
+    for item in metadata:
+        if isinstance(item, StringConstraints):
+            if item.to_upper:
+                # Non-ASCII case mapping can change the length - leave it to pydantic
+                lines += ["if not v.isascii(): return None", "v = v.upper()"]
+            if item.min_length is not None:
+                lines.append(f"if len(v) < {item.min_length}: return None")
+            if item.max_length is not None:
+                lines.append(f"if len(v) > {item.max_length}: return None")
+            if item.pattern is not None:
+                env[f"pattern_{name}"] = re.compile(item.pattern).search
+                lines.append(f"if pattern_{name}(v) is None: return None")
+        elif isinstance(item, annotated_types.MaxLen):
+            lines.append(f"if len(v) > {item.max_length}: return None")
+        elif isinstance(item, annotated_types.MinLen):
+            lines.append(f"if len(v) < {item.min_length}: return None")
+        elif type(item) in _BOUNDS:
+            attr, op = _BOUNDS[type(item)]
+            env[f"{attr}_{name}"] = getattr(item, attr)
+            lines.append(f"if not v {op} {attr}_{name}: return None")
+        elif isinstance(item, AfterValidator):
+            env[f"after_{name}"] = item.func
+            lines.append(f"v = after_{name}(v)")
+        else:
+            raise TypeError(f"Unsupported constraint for {name}: {item!r}")
+    
+    return lines
+
+
+def compile_json_validator(model: Type[ModelT]) -> Callable[[bytes], Optional[ModelT]]:
+    """
+    Generate a JSON validator specialized to a flat model's exact fields
+    
+    Handles str, Literal and Decimal fields (optionally Optional) with their
+    length, pattern, bound and after-validator constraints, plus after-mode
+    field validators. The generated function returns None for any input it
+    doesn't accept outright, so callers fall back to `model_validate_json`
+    for the authoritative result and error messages.
+    """
+    env: Dict[str, Any] = {
+        "loads": orjson.loads,
+        "JSONDecodeError": orjson.JSONDecodeError,
+        "_decimal": _decimal,
+        "_Info": _Info,
+        "model": model,
+        "new": object.__new__,
+        "setattr": object.__setattr__,
+        "FIELDS": frozenset(model.model_fields),
+    }
+    
+    validators: Dict[str, List[Callable[..., Any]]] = {}
+    for decorator in model.__pydantic_decorators__.field_validators.values():
+        if decorator.info.mode != "after":
+            raise TypeError(f"Unsupported validator mode: {decorator.info.mode}")
+        for name in decorator.info.fields:
+            validators.setdefault(name, []).append(decorator.func)
+    
+    body = [
+        "try:",
+        "    data = loads(raw)",
+        "except JSONDecodeError:",
+        "    return None",
+        "if type(data) is not dict or not data.keys() <= FIELDS: return None",
+        "values = {}",
+    ]
+    
+    for name, field in model.model_fields.items():
+        annotation = field.annotation
+        optional = get_origin(annotation) is Union and type(None) in get_args(annotation)
+        if optional:
+            (annotation,) = [arg for arg in get_args(annotation) if arg is not type(None)]
+        
+        checks = _field_lines(name, annotation, field.metadata, env)
+        hooks: List[str] = []
+        for i, func in enumerate(validators.get(name, ())):
+            hook = f"validator_{name}_{i}"
+            env[hook] = func
+            args = "v, _Info(values)" if len(inspect.signature(func).parameters) > 1 else "v"
+            hooks += ["try:", f"    v = {hook}({args})", "except (ValueError, AssertionError):", "    return None"]
+        
+        if field.is_required():
+            body.append(f"if {name!r} not in data: return None")
+            body.append(f"v = data[{name!r}]")
+            body += checks + hooks
+        else:
+            if field.default_factory is not None:
+                raise TypeError(f"Unsupported default factory for {name}")
+            env[f"default_{name}"] = field.default
+            body.append(f"if {name!r} in data:")
+            body.append(f"    v = data[{name!r}]")
+            if optional:
+                body.append("    if v is not None:")
+                body += [f"        {line}" for line in checks]
+            else:
+                body += [f"    {line}" for line in checks]
+            body += [f"    {line}" for line in hooks]
+            body.append("else:")
+            body.append(f"    v = default_{name}")
+        body.append(f"values[{name!r}] = v")
+    
+    body += [
+        "instance = new(model)",
+        "setattr(instance, '__dict__', values)",
+        "setattr(instance, '__pydantic_fields_set__', set(data))",
+        "setattr(instance, '__pydantic_extra__', None)",
+        "setattr(instance, '__pydantic_private__', None)",
+        "return instance",
+    ]
+    
+    func_name = f"validate_{model.__name__}_json"
+    source = f"def {func_name}(raw):\n" + "".join(f"    {line}\n" for line in body)
+    exec(compile(source, f"<{func_name}>", "exec"), env)
+    return env[func_name]
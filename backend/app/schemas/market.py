@@ -2,90 +2,234 @@
 Market Data Schemas
 Real-time market information structures
 """
-from pydantic import BaseModel
-from typing import List, Optional
-from datetime import datetime
-from decimal import Decimal
+import base64
+from dataclasses import dataclass
 
+import numpy as np
+from fastapi import Query
+from pydantic import AfterValidator, BeforeValidator, ConfigDict, Field, PlainSerializer
+from typing import Annotated, Any, Literal, TypedDict
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal, ROUND_HALF_UP
 
-class Ticker(BaseModel):
+from app.schemas.base import FrozenSchema
+
+
+# Fixed-point scale for streamed prices and quantities, same as ScaledDecimal columns
+PRICE_SCALE = 8
+_SCALE_FACTOR = 10 ** PRICE_SCALE
+
+
+def to_scaled(value: Any) -> int:
+    """Scale a price/quantity to an int; ints are taken as already scaled"""
+    if type(value) is int:
+        return value
+    if isinstance(value, float):
+        value = repr(value)
+    return int(Decimal(value).scaleb(PRICE_SCALE).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def from_scaled(value: int) -> Decimal:
+    """Decimal value of a scaled int"""
+    return Decimal(value).scaleb(-PRICE_SCALE)
+
+
+def _format_scaled(value: int) -> str:
+    """Fixed-point string for the wire, as Decimal fields were serialized"""
+    whole, frac = divmod(abs(value), _SCALE_FACTOR)
+    return f"{'-' if value < 0 else ''}{whole}.{frac:0{PRICE_SCALE}d}"
+
+
+# int scaled by 10^PRICE_SCALE in memory, decimal string in JSON
+Scaled = Annotated[
+    int,
+    BeforeValidator(to_scaled),
+    PlainSerializer(_format_scaled, return_type=str, when_used="json"),
+]
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def to_ns(value: Any) -> int:
+    """Unix nanoseconds from an int, datetime (naive taken as UTC) or ISO string"""
+    if type(value) is int:
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        delta = value - _EPOCH
+        return (delta.days * 86_400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1_000
+    raise ValueError("Invalid timestamp")
+
+
+def from_ns(value: int) -> datetime:
+    """Naive UTC datetime of a unix-nanosecond timestamp"""
+    return _EPOCH + timedelta(microseconds=value // 1_000)
+
+
+def _format_ns(value: int) -> str:
+    """ISO string for the wire, as datetime fields were serialized"""
+    return from_ns(value).isoformat()
+
+
+# Unix nanoseconds in memory, naive UTC ISO string in JSON
+TimestampNs = Annotated[
+    int,
+    BeforeValidator(to_ns),
+    PlainSerializer(_format_ns, return_type=str, when_used="json"),
+]
+
+
+class Ticker(FrozenSchema):
     """24hr ticker statistics"""
     symbol: str
-    price_change: Decimal
-    price_change_percent: Decimal
-    weighted_avg_price: Decimal
-    last_price: Decimal
-    last_quantity: Decimal
-    bid_price: Decimal
-    bid_quantity: Decimal
-    ask_price: Decimal
-    ask_quantity: Decimal
-    open_price: Decimal
-    high_price: Decimal
-    low_price: Decimal
-    volume: Decimal
-    quote_volume: Decimal
-    open_time: datetime
-    close_time: datetime
+    price_change: Scaled
+    price_change_percent: Scaled
+    weighted_avg_price: Scaled
+    last_price: Scaled
+    last_quantity: Scaled
+    bid_price: Scaled
+    bid_quantity: Scaled
+    ask_price: Scaled
+    ask_quantity: Scaled
+    open_price: Scaled
+    high_price: Scaled
+    low_price: Scaled
+    volume: Scaled
+    quote_volume: Scaled
+    open_time: TimestampNs
+    close_time: TimestampNs
     trade_count: int
 
 
-class MarketData(BaseModel):
+class MarketData(FrozenSchema):
     """Real-time market data snapshot"""
     symbol: str
-    bid: Decimal
-    ask: Decimal
-    last: Decimal
-    volume_24h: Decimal
-    high_24h: Decimal
-    low_24h: Decimal
-    change_24h: Decimal
-    change_percent_24h: Decimal
-    timestamp: datetime
-
-
-class Candle(BaseModel):
+    bid: Scaled
+    ask: Scaled
+    last: Scaled
+    volume_24h: Scaled
+    high_24h: Scaled
+    low_24h: Scaled
+    change_24h: Scaled
+    change_percent_24h: Scaled
+    timestamp: TimestampNs
+
+
+class Candle(FrozenSchema):
     """OHLCV candlestick data"""
     symbol: str
     interval: str  # 1m, 5m, 15m, 1h, 4h, 1d
-    open_time: datetime
+    open_time: TimestampNs
     open: Decimal
     high: Decimal
     low: Decimal
     close: Decimal
     volume: Decimal
-    close_time: datetime
+    close_time: TimestampNs
     quote_volume: Decimal
     trade_count: int
 
 
-class CandleRequest(BaseModel):
-    """Candlestick data request"""
+CandleInterval = Literal["1m", "5m", "15m", "1h", "4h", "1d"]
+
+
+@dataclass(slots=True)
+class CandleRequest:
+    """Candlestick data query - bound by FastAPI as a dependency, no model instance"""
     symbol: str
-    interval: str = "1m"
-    start_time: Optional[datetime] = None
-    end_time: Optional[datetime] = None
-    limit: int = 500
+    interval: CandleInterval = "1m"
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100
+
+
+_LEVEL_DTYPE = np.dtype("<i8")
+_LEVEL_SIZE = 2 * _LEVEL_DTYPE.itemsize
+
+
+def pack_levels(prices: np.ndarray, quantities: np.ndarray) -> bytes:
+    """Interleave scaled price/quantity columns into a packed int64 payload"""
+    return np.column_stack((prices, quantities)).astype(_LEVEL_DTYPE).tobytes()
+
+
+def unpack_levels(payload: bytes) -> np.ndarray:
+    """View a packed payload as an (N, 2) int64 array of scaled price, quantity"""
+    return np.frombuffer(payload, dtype=_LEVEL_DTYPE).reshape(-1, 2)
+
+
+def _decode_levels(value: Any) -> Any:
+    """Accept the base64 text form the payload is serialized to"""
+    return base64.b64decode(value, validate=True) if isinstance(value, str) else value
+
+
+def _check_levels(value: bytes) -> bytes:
+    """Reject payloads that aren't whole level pairs"""
+    if len(value) % _LEVEL_SIZE:
+        raise ValueError("Packed levels must be whole int64 (price, quantity) pairs")
+    return value
+
+
+# Depth side as interleaved little-endian int64 (price, quantity) pairs, scaled
+# by 10^PRICE_SCALE - one length check instead of a validator per level
+PackedLevels = Annotated[
+    bytes,
+    BeforeValidator(_decode_levels),
+    AfterValidator(_check_levels),
+    Field(description="base64 of interleaved int64 (price, quantity) pairs, scaled"),
+]
 
 
-class DepthUpdate(BaseModel):
+class DepthUpdate(FrozenSchema):
     """Order book depth update"""
+    model_config = ConfigDict(ser_json_bytes="base64")
+    
     symbol: str
-    bids: List[List[Decimal]]  # [[price, quantity], ...]
-    asks: List[List[Decimal]]
+    bids: PackedLevels
+    asks: PackedLevels
     first_update_id: int
     last_update_id: int
-    timestamp: datetime
+    timestamp: TimestampNs
 
 
-class TradeUpdate(BaseModel):
+class DepthUpdateDict(TypedDict):
+    """DepthUpdate as broadcast - base64 packed levels, ISO timestamp"""
+    symbol: str
+    bids: str
+    asks: str
+    first_update_id: int
+    last_update_id: int
+    timestamp: str
+
+
+class TradeUpdate(FrozenSchema):
     """Real-time trade update"""
     symbol: str
     trade_id: int
-    price: Decimal
-    quantity: Decimal
+    price: Scaled
+    quantity: Scaled
     buyer_order_id: str
     seller_order_id: str
-    timestamp: datetime
+    timestamp: TimestampNs
     is_buyer_maker: bool
 
+
+class TradeUpdateDict(TypedDict):
+    """TradeUpdate as broadcast - decimal strings, ISO timestamp"""
+    symbol: str
+    trade_id: int
+    price: str
+    quantity: str
+    buyer_order_id: str
+    seller_order_id: str
+    timestamp: str
+    is_buyer_maker: bool
+
+
+class ChannelMessage(TypedDict):
+    """WebSocket envelope for a message fanned out from a pub/sub channel"""
+    type: str
+    channel: str
+    data: str
+    timestamp: str
@@ -2,65 +2,62 @@
 Order Schemas
 Validated order data structures for trading engine
 """
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional, List
+import sys
+from pydantic import AfterValidator, ConfigDict, Discriminator, Field, StringConstraints, Tag, field_validator
+from typing import Annotated, Dict, Iterable, Literal, NamedTuple, Optional, List, Union
 from datetime import datetime
-from uuid import UUID
 from decimal import Decimal
-from enum import Enum
 
+from app.schemas.base import EnumValue, FrozenSchema, Schema, UUIDStr
+from app.schemas.codegen import compile_json_validator
 
-class OrderSide(str, Enum):
-    BUY = "buy"
-    SELL = "sell"
 
+OrderSide = Literal["buy", "sell"]
+OrderType = Literal["market", "limit", "stop_limit", "stop_market"]
+OrderStatus = Literal["pending", "open", "partial", "filled", "cancelled", "rejected", "expired"]
+TimeInForce = Literal["gtc", "ioc", "fok"]
 
-class OrderType(str, Enum):
-    MARKET = "market"
-    LIMIT = "limit"
-    STOP_LIMIT = "stop_limit"
-    STOP_MARKET = "stop_market"
+# Interned active symbols - validated symbols resolve to the same str object the
+# engine and market data key on, so dict lookups and compares hit the identity path
+_SYMBOLS: Dict[str, str] = {}
 
 
-class OrderStatus(str, Enum):
-    PENDING = "pending"
-    OPEN = "open"
-    PARTIAL = "partial"
-    FILLED = "filled"
-    CANCELLED = "cancelled"
-    REJECTED = "rejected"
+def register_symbols(symbols: Iterable[str]) -> None:
+    """Register the exchange's active trading pairs"""
+    for symbol in symbols:
+        symbol = sys.intern(symbol)
+        _SYMBOLS[symbol] = symbol
 
 
-class TimeInForce(str, Enum):
-    GTC = "gtc"
-    IOC = "ioc"
-    FOK = "fok"
+def _canonical_symbol(v: str) -> str:
+    """Swap a parsed symbol for its interned instance, if it is a known pair"""
+    return _SYMBOLS.get(v, v)
 
 
-class OrderCreate(BaseModel):
+# Trading pair in BASE-QUOTE form, uppercased and checked inside pydantic-core
+Symbol = Annotated[
+    str,
+    StringConstraints(min_length=3, max_length=20, to_upper=True, pattern="-"),
+    AfterValidator(_canonical_symbol),
+]
+
+
+class OrderCreate(FrozenSchema):
     """Order creation request"""
-    symbol: str = Field(..., min_length=3, max_length=20, description="Trading pair e.g. ETH-USDT")
+    symbol: Symbol = Field(..., description="Trading pair e.g. ETH-USDT")
     side: OrderSide
     order_type: OrderType
     quantity: Decimal = Field(..., gt=0, description="Order quantity")
     price: Optional[Decimal] = Field(None, gt=0, description="Limit price (required for limit orders)")
     stop_price: Optional[Decimal] = Field(None, gt=0, description="Stop trigger price")
-    time_in_force: TimeInForce = TimeInForce.GTC
+    time_in_force: TimeInForce = "gtc"
     client_order_id: Optional[str] = Field(None, max_length=64)
     
-    @field_validator('symbol')
-    @classmethod
-    def validate_symbol(cls, v: str) -> str:
-        v = v.upper()
-        if '-' not in v:
-            raise ValueError('Symbol must be in format BASE-QUOTE (e.g., ETH-USDT)')
-        return v
-    
     @field_validator('price')
     @classmethod
     def validate_price_for_limit(cls, v, info):
         values = info.data
-        if values.get('order_type') == OrderType.LIMIT and v is None:
+        if values.get('order_type') == "limit" and v is None:
             raise ValueError('Price is required for limit orders')
         return v
     
@@ -77,15 +74,20 @@ class OrderCreate(BaseModel):
         }
 
 
-class OrderResponse(BaseModel):
+# Generated at import from OrderCreate's fields; returns None when the body
+# needs pydantic's full validation (errors, coercions, non-ASCII symbols)
+validate_order_create_json = compile_json_validator(OrderCreate)
+
+
+class OrderResponse(FrozenSchema):
     """Order response"""
-    id: UUID
+    id: UUIDStr
     client_order_id: str
     symbol: str
-    side: OrderSide
-    order_type: OrderType
-    status: OrderStatus
-    time_in_force: TimeInForce
+    side: Annotated[OrderSide, EnumValue]
+    order_type: Annotated[OrderType, EnumValue]
+    status: Annotated[OrderStatus, EnumValue]
+    time_in_force: Annotated[TimeInForce, EnumValue]
     price: Optional[Decimal]
     stop_price: Optional[Decimal]
     quantity: Decimal
@@ -100,14 +102,21 @@ class OrderResponse(BaseModel):
         from_attributes = True
 
 
-class OrderBookEntry(BaseModel):
+class OrderBookEntry(Schema):
     """Single price level in order book"""
     price: Decimal
     quantity: Decimal
     order_count: int
 
 
-class OrderBookResponse(BaseModel):
+class OrderBookLevel(NamedTuple):
+    """Price level as produced by the matching engine - a plain tuple, no validation"""
+    price: Decimal
+    quantity: Decimal
+    order_count: int
+
+
+class OrderBookResponse(Schema):
     """Full order book response"""
     symbol: str
     bids: List[OrderBookEntry]  # Buy orders (descending price)
@@ -116,16 +125,57 @@ class OrderBookResponse(BaseModel):
     sequence: int
 
 
-class CancelOrderRequest(BaseModel):
-    """Cancel order request"""
-    order_id: Optional[UUID] = None
-    client_order_id: Optional[str] = None
+class OrderBookColumns(Schema):
+    """One side of the book as parallel columns, prices/quantities scaled by 10^scale"""
+    prices: List[int] = Field(..., max_length=100)
+    quantities: List[int] = Field(..., max_length=100)
+    order_counts: List[int] = Field(..., max_length=100)
+
+
+class OrderBookResponseFast(Schema):
+    """Columnar order book response - no per-level objects"""
+    symbol: str
+    scale: int
+    bids: OrderBookColumns  # Descending price
+    asks: OrderBookColumns  # Ascending price
+    timestamp: datetime
+    sequence: int
+
+
+class CancelByOrderId(FrozenSchema):
+    """Cancel an order by its exchange ID"""
+    # Legacy bodies could send both IDs; order_id wins and the other is ignored
+    model_config = ConfigDict(extra="ignore")
     
-    @field_validator('client_order_id')
-    @classmethod
-    def validate_one_id_provided(cls, v, info):
-        values = info.data
-        if not v and not values.get('order_id'):
-            raise ValueError('Either order_id or client_order_id must be provided')
-        return v
+    kind: Literal["order_id"] = "order_id"
+    order_id: UUIDStr
+
+
+class CancelByClientOrderId(FrozenSchema):
+    """Cancel an order by the client-assigned ID"""
+    kind: Literal["client_order_id"] = "client_order_id"
+    client_order_id: str = Field(..., min_length=1)
+
+
+def _cancel_kind(value) -> str:
+    """
+    Variant for a cancel request - `kind` if given, otherwise inferred from
+    the ID field so bodies written before `kind` existed still validate
+    """
+    if isinstance(value, dict):
+        kind = value.get("kind")
+        if kind is None and value.get("order_id") is None and value.get("client_order_id"):
+            return "client_order_id"
+        return kind or "order_id"
+    return getattr(value, "kind", None)
+
+
+# Tagged on `kind`, so validation dispatches straight to the matching model
+CancelOrderRequest = Annotated[
+    Union[
+        Annotated[CancelByOrderId, Tag("order_id")],
+        Annotated[CancelByClientOrderId, Tag("client_order_id")],
+    ],
+    Discriminator(_cancel_kind)
+]
 
@@ -2,16 +2,19 @@
 Trade Schemas
 Trade execution data structures
 """
-from pydantic import BaseModel
-from typing import Optional, List
+from dataclasses import dataclass
+from typing import Annotated, Optional, List
 from datetime import datetime
-from uuid import UUID
 from decimal import Decimal
 
+from fastapi import Query
 
-class TradeResponse(BaseModel):
+from app.schemas.base import FrozenSchema, Schema, UUIDStr
+
+
+class TradeResponse(FrozenSchema):
     """Trade execution record"""
-    id: UUID
+    id: UUIDStr
     trade_id: int
     symbol: str
     side: str
@@ -28,15 +31,16 @@ class TradeResponse(BaseModel):
         from_attributes = True
 
 
-class TradeHistoryRequest(BaseModel):
+@dataclass(slots=True)
+class TradeHistoryRequest:
     """Trade history query parameters"""
-    symbol: Optional[str] = None
-    start_time: Optional[datetime] = None
-    end_time: Optional[datetime] = None
-    limit: int = 100
+    symbol: Annotated[Optional[str], Query(description="Filter by trading pair")] = None
+    start_time: Annotated[Optional[datetime], Query(description="Start time filter")] = None
+    end_time: Annotated[Optional[datetime], Query(description="End time filter")] = None
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100
 
 
-class TradeAggregation(BaseModel):
+class TradeAggregation(Schema):
     """Aggregated trade statistics"""
     symbol: str
     period: str  # 1m, 5m, 1h, 1d
@@ -50,7 +54,7 @@ class TradeAggregation(BaseModel):
     timestamp: datetime
 
 
-class RecentTradesResponse(BaseModel):
+class RecentTradesResponse(Schema):
     """Recent trades for a symbol"""
     symbol: str
     trades: List[TradeResponse]
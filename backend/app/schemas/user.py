@@ -2,13 +2,28 @@
 User Schemas
 Pydantic models for request/response validation
 """
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from pydantic import AfterValidator, EmailStr, Field, StringConstraints
+from typing import Annotated, Optional
 from datetime import datetime
-from uuid import UUID
 
+from app.schemas.base import EthAddress, FrozenSchema, Schema, UUIDStr
 
-class UserCreate(BaseModel):
+
+def _normalize_domain(v: str) -> str:
+    """Lowercase the domain, matching how EmailStr stored it at signup"""
+    local, _, domain = v.rpartition("@")
+    return f"{local}@{domain.lower()}"
+
+
+# Cheap shape check for emails that were fully validated at signup
+LoginEmail = Annotated[
+    str,
+    StringConstraints(strip_whitespace=True, max_length=254, pattern=r"^[^@\s]+@[^@\s]+\.[^@\s]+$"),
+    AfterValidator(_normalize_domain),
+]
+
+
+class UserCreate(Schema):
     email: EmailStr
     password: str = Field(..., min_length=8, max_length=100)
     
@@ -21,14 +36,14 @@ class UserCreate(BaseModel):
         }
 
 
-class UserLogin(BaseModel):
-    email: EmailStr
+class UserLogin(Schema):
+    email: LoginEmail
     password: str
 
 
-class UserResponse(BaseModel):
-    id: UUID
-    email: EmailStr
+class UserResponse(FrozenSchema):
+    id: UUIDStr
+    email: str  # Validated on signup, not on every read
     eth_address: Optional[str] = None
     is_active: bool
     is_verified: bool
@@ -41,21 +56,21 @@ class UserResponse(BaseModel):
         from_attributes = True
 
 
-class Token(BaseModel):
+class Token(Schema):
     access_token: str
     token_type: str = "bearer"
     expires_in: int
 
 
-class TokenPayload(BaseModel):
+class TokenPayload(Schema):
     sub: str
     exp: int
     type: str = "access"
 
 
-class WalletBindRequest(BaseModel):
+class WalletBindRequest(Schema):
     """Request to bind an Ethereum wallet"""
-    address: str = Field(..., pattern="^0x[a-fA-F0-9]{40}$")
+    address: EthAddress
     signature: str
     message: str
 
@@ -2,59 +2,45 @@
 Wallet Schemas
 Web3 wallet and transaction structures
 """
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from pydantic import Field
+from typing import Annotated, Literal, Optional, List
 from datetime import datetime
-from uuid import UUID
 from decimal import Decimal
-from enum import Enum
 
+from app.schemas.base import EnumValue, EthAddress, FrozenSchema, Schema, UUIDStr
 
-class WalletType(str, Enum):
-    HOT = "hot"
-    COLD = "cold"
-    USER = "user"
 
+WalletType = Literal["hot", "cold", "user"]
+TransactionType = Literal["deposit", "withdrawal", "internal", "fee"]
+TransactionStatus = Literal["pending", "confirming", "confirmed", "failed", "cancelled"]
 
-class TransactionType(str, Enum):
-    DEPOSIT = "deposit"
-    WITHDRAWAL = "withdrawal"
-    INTERNAL = "internal"
 
-
-class TransactionStatus(str, Enum):
-    PENDING = "pending"
-    CONFIRMING = "confirming"
-    CONFIRMED = "confirmed"
-    FAILED = "failed"
-
-
-class WalletCreate(BaseModel):
+class WalletCreate(FrozenSchema):
     """Bind external wallet request"""
-    address: str = Field(..., pattern="^0x[a-fA-F0-9]{40}$")
+    address: EthAddress
     chain: str = "ethereum"
     currency: str = "ETH"
     signature: str  # Signed message proving ownership
     message: str  # Original message that was signed
 
 
-class WalletResponse(BaseModel):
+class WalletResponse(FrozenSchema):
     """Wallet information"""
-    id: UUID
+    id: UUIDStr
     address: str
     chain: str
     currency: str
     balance: Decimal
     locked_balance: Decimal
     is_verified: str
-    wallet_type: WalletType
+    wallet_type: Annotated[WalletType, EnumValue]
     created_at: datetime
     
     class Config:
         from_attributes = True
 
 
-class WalletBalance(BaseModel):
+class WalletBalance(Schema):
     """Balance for a specific currency"""
     currency: str
     available: Decimal
@@ -62,19 +48,19 @@ class WalletBalance(BaseModel):
     total: Decimal
 
 
-class TransactionCreate(BaseModel):
+class TransactionCreate(FrozenSchema):
     """Withdrawal request"""
-    to_address: str = Field(..., pattern="^0x[a-fA-F0-9]{40}$")
+    to_address: EthAddress
     currency: str
     amount: Decimal = Field(..., gt=0)
     chain: str = "ethereum"
 
 
-class TransactionResponse(BaseModel):
+class TransactionResponse(FrozenSchema):
     """Transaction status"""
-    id: UUID
-    tx_type: TransactionType
-    status: TransactionStatus
+    id: UUIDStr
+    tx_type: Annotated[TransactionType, EnumValue]
+    status: Annotated[TransactionStatus, EnumValue]
     tx_hash: Optional[str]
     from_address: str
     to_address: str
@@ -89,19 +75,19 @@ class TransactionResponse(BaseModel):
         from_attributes = True
 
 
-class SignMessageRequest(BaseModel):
+class SignMessageRequest(Schema):
     """Request message to sign for wallet verification"""
-    address: str = Field(..., pattern="^0x[a-fA-F0-9]{40}$")
+    address: EthAddress
 
 
-class SignMessageResponse(BaseModel):
+class SignMessageResponse(Schema):
     """Message to be signed by wallet"""
     message: str
     nonce: str
     expires_at: datetime
 
 
-class GasEstimate(BaseModel):
+class GasEstimate(Schema):
     """Gas estimation for transaction"""
     gas_limit: int
     gas_price_gwei: Decimal
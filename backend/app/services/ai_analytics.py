@@ -4,22 +4,32 @@ AI-driven financial analysis, anomaly detection, risk scoring, and predictions
 Based on FDD (Financial Due Diligence) best practices
 """
 import asyncio
-from datetime import datetime, timedelta
+import functools
+import inspect
+import time
+from bisect import bisect_left
+from types import MappingProxyType
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Callable, Hashable, NamedTuple, Sequence, Tuple
 from uuid import UUID
 from collections import defaultdict
 import statistics
 import math
 import random
 
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import BigInteger, Float, Row, bindparam, select, func, and_, case, cast
 import redis.asyncio as redis
+from redis.exceptions import RedisError
 
+from app.database import readonly_session_factory
 from app.models.trade import Trade
+from app.services import ai_analytics_kernels as kernels
 from app.models.order import Order, OrderStatus, OrderSide
 from app.models.user import User
+from app.schemas.market import to_ns
 from app.schemas.analytics import (
     RiskScore,
     AnomalyAlert,
@@ -34,6 +44,252 @@ from app.schemas.analytics import (
 )
 
 
+# Hourly volume rollups in Redis: a hash {qty, count} per symbol and hour,
+# plus the set of symbols seen. Kept for the longest anomaly lookback (7d).
+# The since-key holds when recording began (epoch ns) - windows starting
+# earlier, or with the key gone after a flush, fall back to SQL.
+ROLLUP_KEY_PREFIX = "vol"
+ROLLUP_SYMBOLS_KEY = "vol:symbols"
+ROLLUP_SINCE_KEY = "vol:since"
+ROLLUP_TTL = int(timedelta(days=7, hours=1).total_seconds())
+HOUR_NS = 3600 * 1_000_000_000
+MINUTE_NS = 60 * 1_000_000_000
+
+# Cached price predictions, and the single-flight lock a miss holds while computing
+PREDICTION_KEY_PREFIX = "pp"
+PREDICTION_CACHE_TTL = 30
+PREDICTION_LOCK_TTL_MS = 500
+PREDICTION_LOCK_WAIT_STEP = 0.02
+PREDICTION_LOCK_WAIT_STEPS = 10
+
+# Detection thresholds, read directly by the detectors
+VOLUME_SPIKE_MULTIPLIER = 3.0    # Flag if volume > 3x average
+PRICE_DEVIATION_PERCENT = 5.0    # Flag if price deviates > 5%
+LARGE_TRADE_PERCENTILE = 95      # Flag trades in top 5% by size
+RAPID_TRADE_THRESHOLD = 10       # Flag if > 10 trades per minute
+CONCENTRATION_THRESHOLD = 0.7    # Flag if > 70% in single asset
+
+# User risk factors and their weights in the overall score
+RISK_FACTORS = ("trading_volume", "trading_frequency", "concentration", "volatility")
+RISK_WEIGHTS = (0.25, 0.20, 0.30, 0.25)
+
+# Rows per server-side cursor fetch when streaming a user's trade history
+TRADE_STREAM_BATCH_SIZE = 5000
+
+# In-process results cache shared by all callers of the service
+ANALYTICS_CACHE_TTL = 60.0
+ANALYTICS_CACHE_MAX_SIZE = 4096
+
+
+class TradeColumns(NamedTuple):
+    """Trades as parallel columns in execution order, symbols as dense codes"""
+    symbols: np.ndarray  # symbol name per code
+    symbol_ids: np.ndarray
+    trade_ids: Sequence[int]
+    user_ids: Sequence[UUID]
+    executed_at: Sequence[datetime]
+    quantities: np.ndarray
+    quote_quantities: np.ndarray
+
+
+class TradeSequence(NamedTuple):
+    """A user's trades as parallel columns, in execution order"""
+    symbols: np.ndarray
+    is_buy: np.ndarray
+    prices: np.ndarray
+    quantities: np.ndarray
+
+
+def _trade_sequence(rows: Sequence[Row]) -> TradeSequence:
+    """Columns from (symbol, side, price, quantity, ...) rows"""
+    count = len(rows)
+    return TradeSequence(
+        np.array([r.symbol for r in rows], dtype=str),
+        np.fromiter((r.side == "buy" for r in rows), dtype=bool, count=count),
+        np.fromiter((float(r.price) for r in rows), dtype=np.float64, count=count),
+        np.fromiter((float(r.quantity) for r in rows), dtype=np.float64, count=count),
+    )
+
+
+def cached_async(key_fn: Callable[..., Hashable]):
+    """
+    Cache an analytics method's result on the service for ANALYTICS_CACHE_TTL seconds
+    
+    `key_fn` receives the method's arguments (by name, defaults applied) and
+    returns the cache key. Concurrent misses for one key share a single
+    computation; failures are not cached. That computation can outlive the
+    request that started it, so it runs on its own read-only session instead
+    of the caller's `db`.
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+        
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            del arguments["self"]
+            key = (method.__name__, key_fn(**arguments))
+            
+            now = time.monotonic()
+            cached = self._cache.get(key)
+            if cached:
+                if cached[1] > now:
+                    return cached[0]
+                del self._cache[key]
+            
+            task = self._inflight.get(key)
+            if task is None:
+                del arguments["db"]
+                task = asyncio.ensure_future(_on_own_session(method, self, arguments))
+                self._inflight[key] = task
+                
+                def on_done(done: asyncio.Future) -> None:
+                    del self._inflight[key]
+                    if not done.cancelled() and done.exception() is None:
+                        if len(self._cache) >= ANALYTICS_CACHE_MAX_SIZE:
+                            self._cache.pop(next(iter(self._cache)))
+                        self._cache[key] = (done.result(), time.monotonic() + ANALYTICS_CACHE_TTL)
+                
+                task.add_done_callback(on_done)
+            
+            return await asyncio.shield(task)
+        
+        return wrapper
+    
+    return decorator
+
+
+async def _on_own_session(method, service, arguments: Dict[str, Any]):
+    """Run an analytics method on a fresh read-only session"""
+    async with readonly_session_factory() as db:
+        return await method(service, db=db, **arguments)
+
+
+def _as_float(column):
+    """Numeric column read as double precision, so rows arrive as floats, not Decimals"""
+    return cast(column, Float).label(column.key)
+
+
+def _trade_columns(rows: Sequence[Row]) -> Optional[TradeColumns]:
+    """
+    Columns from (symbol, trade_id, user_id, executed_at, quantity, quote_quantity, ...)
+    rows, or None if there are none
+    """
+    if not rows:
+        return None
+    
+    names, trade_ids, user_ids, executed_at, quantities, quote_quantities = list(zip(*rows))[:6]
+    symbols, symbol_ids = np.unique(np.array(names), return_inverse=True)
+    return TradeColumns(
+        symbols,
+        symbol_ids,
+        trade_ids,
+        user_ids,
+        executed_at,
+        np.array(quantities, dtype=np.float64),
+        np.array(quote_quantities, dtype=np.float64),
+    )
+
+
+def _epoch_bucket(seconds: int):
+    """Trade execution time as an integer epoch bucket, e.g. hour or minute number"""
+    return cast(func.floor(func.extract("epoch", Trade.executed_at) / seconds), BigInteger)
+
+
+# Fixed-shape queries built once at import - calls only bind parameters, so
+# statement construction and cache-key generation are skipped per request.
+# :user_id, :symbol and :since are bound at execution.
+_RISK_TRADES = (
+    select(Trade.symbol, _as_float(Trade.quote_quantity))
+    .where(Trade.user_id == bindparam("user_id"))
+    .where(Trade.executed_at >= bindparam("since"))
+    .order_by(Trade.executed_at)
+)
+
+_PREDICTION_TRADES = (
+    select(_as_float(Trade.price), _as_float(Trade.quantity))
+    .where(Trade.symbol == bindparam("symbol"))
+    .where(Trade.executed_at >= bindparam("since"))
+    .order_by(Trade.executed_at)
+)
+
+# Buy/sell volume, and the average price of the earlier and later half of
+# the trades (by execution order), aggregated in the database
+_sentiment_ranked = (
+    select(
+        Trade.side,
+        Trade.price,
+        Trade.quantity,
+        func.row_number().over(order_by=Trade.executed_at).label("position"),
+        func.count().over().label("total"),
+    )
+    .where(Trade.symbol == bindparam("symbol"))
+    .where(Trade.executed_at >= bindparam("since"))
+    .subquery()
+)
+_early_half = _sentiment_ranked.c.position * 2 <= _sentiment_ranked.c.total
+
+_SENTIMENT_TOTALS = select(
+    func.count().label("trade_count"),
+    cast(func.coalesce(func.sum(_sentiment_ranked.c.quantity).filter(_sentiment_ranked.c.side == "buy"), 0), Float).label("buy_volume"),
+    cast(func.coalesce(func.sum(_sentiment_ranked.c.quantity).filter(_sentiment_ranked.c.side == "sell"), 0), Float).label("sell_volume"),
+    cast(func.avg(_sentiment_ranked.c.price).filter(_early_half), Float).label("early_avg"),
+    cast(func.avg(_sentiment_ranked.c.price).filter(~_early_half), Float).label("late_avg"),
+)
+
+# Net position and cost basis per symbol, with the latest traded price
+_positions_subquery = (
+    select(
+        Trade.symbol,
+        func.sum(case((Trade.side == "buy", Trade.quantity), else_=-Trade.quantity)).label("quantity"),
+        func.sum(case((Trade.side == "buy", Trade.quote_quantity), else_=-Trade.quote_quantity)).label("cost_basis"),
+    )
+    .where(Trade.user_id == bindparam("user_id"))
+    .group_by(Trade.symbol)
+    .subquery()
+)
+_latest_price_subquery = (
+    select(Trade.symbol, Trade.price)
+    .where(Trade.user_id == bindparam("user_id"))
+    .distinct(Trade.symbol)
+    .order_by(Trade.symbol, Trade.executed_at.desc())
+    .subquery()
+)
+_PORTFOLIO_POSITIONS = (
+    select(
+        _positions_subquery.c.symbol,
+        _positions_subquery.c.quantity,
+        _positions_subquery.c.cost_basis,
+        _latest_price_subquery.c.price,
+    )
+    .join(_latest_price_subquery, _latest_price_subquery.c.symbol == _positions_subquery.c.symbol)
+    .order_by(_positions_subquery.c.symbol)
+)
+
+_PORTFOLIO_TRADES = (
+    select(Trade.symbol, Trade.side, _as_float(Trade.price), _as_float(Trade.quantity))
+    .where(Trade.user_id == bindparam("user_id"))
+    .order_by(Trade.executed_at)
+)
+
+_USER_TRADES = (
+    select(
+        Trade.symbol,
+        Trade.trade_id,
+        Trade.user_id,
+        Trade.executed_at,
+        Trade.quantity,
+        Trade.quote_quantity,
+        Trade.side,
+        Trade.price,
+    )
+    .where(Trade.user_id == bindparam("user_id"))
+    .order_by(Trade.executed_at)
+)
+
+
 class AIAnalyticsService:
     """
     AI-powered analytics service for trading platform
@@ -48,13 +304,13 @@ class AIAnalyticsService:
     """
     
     # Risk thresholds
-    RISK_THRESHOLDS = {
-        "volume_spike_multiplier": 3.0,  # Flag if volume > 3x average
-        "price_deviation_percent": 5.0,   # Flag if price deviates > 5%
-        "large_trade_percentile": 95,     # Flag trades in top 5% by size
-        "rapid_trade_threshold": 10,      # Flag if > 10 trades per minute
-        "concentration_threshold": 0.7,   # Flag if > 70% in single asset
-    }
+    RISK_THRESHOLDS = MappingProxyType({
+        "volume_spike_multiplier": VOLUME_SPIKE_MULTIPLIER,
+        "price_deviation_percent": PRICE_DEVIATION_PERCENT,
+        "large_trade_percentile": LARGE_TRADE_PERCENTILE,
+        "rapid_trade_threshold": RAPID_TRADE_THRESHOLD,
+        "concentration_threshold": CONCENTRATION_THRESHOLD,
+    })
     
     # Anomaly detection windows
     ANALYSIS_WINDOWS = {
@@ -64,18 +320,20 @@ class AIAnalyticsService:
     }
     
     def __init__(self):
-        self._cache: Dict[str, Any] = {}
-        self._cache_ttl = 60  # seconds
+        self._cache: Dict[Tuple[str, Hashable], Tuple[Any, float]] = {}
+        self._inflight: Dict[Tuple[str, Hashable], asyncio.Future] = {}
         self._lock = asyncio.Lock()
     
     # ==================== ANOMALY DETECTION ====================
     
+    @cached_async(key_fn=lambda user_id, symbol, lookback_hours, **_: (user_id, symbol, lookback_hours))
     async def detect_anomalies(
         self,
         db: AsyncSession,
         user_id: Optional[UUID] = None,
         symbol: Optional[str] = None,
         lookback_hours: int = 24,
+        redis_client: Optional[redis.Redis] = None,
     ) -> List[AnomalyAlert]:
         """
         Detect trading anomalies using statistical analysis
@@ -86,188 +344,362 @@ class AIAnalyticsService:
         - Large trades (whale movements)
         - Rapid trading (potential bot activity)
         - Unusual patterns (statistical outliers)
+        
+        Bucket sums and counts are aggregated by the database, so only
+        per-hour, per-minute and per-user rows come back instead of every trade.
         """
         anomalies: List[AnomalyAlert] = []
-        start_time = datetime.utcnow() - timedelta(hours=lookback_hours)
+        now = datetime.utcnow()
+        start_time = now - timedelta(hours=lookback_hours)
         
-        # Build query for recent trades
-        query = select(Trade).where(Trade.executed_at >= start_time)
+        filters = [Trade.executed_at >= start_time]
         if user_id:
-            query = query.where(Trade.user_id == user_id)
+            filters.append(Trade.user_id == user_id)
         if symbol:
-            query = query.where(Trade.symbol == symbol)
+            filters.append(Trade.symbol == symbol)
+        
+        # Hourly volume and trade count per symbol - market-wide scans read the
+        # rollups kept by record_trades when they cover the window, anything
+        # else aggregates the trade table
+        rollups = None
+        if redis_client is not None and user_id is None:
+            rollups = await self._read_volume_rollups(redis_client, symbol, start_time)
         
-        result = await db.execute(query.order_by(Trade.executed_at))
-        trades = result.scalars().all()
+        if rollups is not None:
+            hourly_volumes, trade_counts = rollups
+        else:
+            hour = _epoch_bucket(3600)
+            result = await db.execute(
+                select(Trade.symbol, hour, cast(func.sum(Trade.quantity), Float), func.count())
+                .where(*filters)
+                .group_by(Trade.symbol, hour)
+            )
+            hourly_volumes: Dict[str, Dict[int, float]] = defaultdict(dict)
+            trade_counts = defaultdict(int)
+            for sym, hour_key, volume, count in result:
+                hourly_volumes[sym][hour_key] = volume
+                trade_counts[sym] += count
         
-        if not trades:
+        if not trade_counts:
             return anomalies
         
-        # Group trades by symbol for analysis
-        trades_by_symbol: Dict[str, List[Trade]] = defaultdict(list)
-        for trade in trades:
-            trades_by_symbol[trade.symbol].append(trade)
+        # Users over the per-minute trade threshold
+        minute = _epoch_bucket(60)
+        trade_count = func.count()
+        result = await db.execute(
+            select(Trade.symbol, Trade.user_id, minute, trade_count)
+            .where(*filters)
+            .group_by(Trade.symbol, Trade.user_id, minute)
+            .having(trade_count > RAPID_TRADE_THRESHOLD)
+        )
+        minute_counts: Dict[str, List[Tuple[UUID, int, int]]] = defaultdict(list)
+        for sym, trade_user_id, minute_key, count in result:
+            minute_counts[sym].append((trade_user_id, minute_key, count))
         
-        for sym, sym_trades in trades_by_symbol.items():
+        # Buy and sell volume per user
+        result = await db.execute(
+            select(
+                Trade.symbol,
+                Trade.user_id,
+                cast(func.coalesce(func.sum(Trade.quantity).filter(Trade.side == "buy"), 0), Float),
+                cast(func.coalesce(func.sum(Trade.quantity).filter(Trade.side == "sell"), 0), Float),
+            )
+            .where(*filters)
+            .group_by(Trade.symbol, Trade.user_id)
+        )
+        user_volumes: Dict[str, List[Tuple[UUID, float, float]]] = defaultdict(list)
+        for sym, trade_user_id, buy_volume, sell_volume in result:
+            user_volumes[sym].append((trade_user_id, buy_volume, sell_volume))
+        
+        # Large trades are flagged per trade, so those symbols still need the rows,
+        # fetched as plain columns
+        active_symbols = [sym for sym, count in trade_counts.items() if count >= 10]
+        large_trade_columns = None
+        if active_symbols:
+            result = await db.execute(
+                select(
+                    Trade.symbol,
+                    Trade.trade_id,
+                    Trade.user_id,
+                    Trade.executed_at,
+                    _as_float(Trade.quantity),
+                    _as_float(Trade.quote_quantity),
+                )
+                .where(*filters, Trade.symbol.in_(active_symbols))
+                .order_by(Trade.executed_at)
+            )
+            large_trade_columns = _trade_columns(result.all())
+        
+        # The detectors are pure computation on the fetched rows, so each
+        # detector call runs in a worker thread off the event loop
+        jobs = self._detector_jobs(
+            trade_counts, hourly_volumes, large_trade_columns, minute_counts, user_volumes, now
+        )
+        results = await asyncio.gather(*[
+            asyncio.to_thread(detector, *args) for detector, args in jobs
+        ])
+        for detected in results:
+            anomalies.extend(detected)
+        
+        # Sort by severity and timestamp
+        anomalies.sort(key=lambda x: (x.severity, to_ns(x.detected_at)), reverse=True)
+        
+        return anomalies
+    
+    def _detector_jobs(
+        self,
+        trade_counts: Dict[str, int],
+        hourly_volumes: Dict[str, Dict[int, float]],
+        large_trade_columns: Optional[TradeColumns],
+        minute_counts: Dict[str, List[Tuple[UUID, int, int]]],
+        user_volumes: Dict[str, List[Tuple[UUID, float, float]]],
+        now: datetime,
+    ) -> List[Tuple[Callable[..., List[AnomalyAlert]], tuple]]:
+        """(detector, arguments) for every detector that has data to scan"""
+        jobs = []
+        
+        # Large trades are flagged for all symbols in one vectorized pass
+        if large_trade_columns is not None:
+            jobs.append((self._detect_large_trades, (large_trade_columns,)))
+        
+        for sym in trade_counts:
             # 1. Detect volume spikes
-            volume_anomalies = await self._detect_volume_spikes(sym, sym_trades)
-            anomalies.extend(volume_anomalies)
-            
-            # 2. Detect large trades
-            large_trade_anomalies = await self._detect_large_trades(sym, sym_trades)
-            anomalies.extend(large_trade_anomalies)
+            if trade_counts[sym] >= 10:
+                jobs.append((self._detect_volume_spikes, (sym, hourly_volumes[sym])))
             
-            # 3. Detect rapid trading
-            rapid_trade_anomalies = await self._detect_rapid_trading(sym, sym_trades)
-            anomalies.extend(rapid_trade_anomalies)
+            # 2. Detect rapid trading
+            if sym in minute_counts:
+                jobs.append((self._detect_rapid_trading, (sym, minute_counts[sym])))
             
-            # 4. Detect price manipulation patterns
-            manipulation_anomalies = await self._detect_manipulation_patterns(sym, sym_trades)
-            anomalies.extend(manipulation_anomalies)
+            # 3. Detect price manipulation patterns
+            if sym in user_volumes:
+                jobs.append((self._detect_manipulation_patterns, (sym, user_volumes[sym], now)))
         
-        # Sort by severity and timestamp
-        anomalies.sort(key=lambda x: (x.severity, x.detected_at), reverse=True)
+        return jobs
+    
+    def _scan_user_trades(
+        self,
+        user_id: UUID,
+        trades: Sequence[Row],
+        now: datetime,
+    ) -> List[AnomalyAlert]:
+        """
+        Detect anomalies in one user's trades, in execution order
+        In-memory counterpart of the per-user detect_anomalies aggregates
+        """
+        hourly_volumes: Dict[str, Dict[int, float]] = defaultdict(lambda: defaultdict(float))
+        trade_counts: Dict[str, int] = defaultdict(int)
+        minute_totals: Dict[Tuple[str, int], int] = defaultdict(int)
+        side_volumes: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0.0])
         
+        for trade in trades:
+            executed_ns = to_ns(trade.executed_at)
+            quantity = float(trade.quantity)
+            hourly_volumes[trade.symbol][executed_ns // HOUR_NS] += quantity
+            trade_counts[trade.symbol] += 1
+            minute_totals[trade.symbol, executed_ns // MINUTE_NS] += 1
+            side_volumes[trade.symbol][trade.side != "buy"] += quantity
+        
+        minute_counts: Dict[str, List[Tuple[UUID, int, int]]] = defaultdict(list)
+        for (sym, minute_key), count in minute_totals.items():
+            if count > RAPID_TRADE_THRESHOLD:
+                minute_counts[sym].append((user_id, minute_key, count))
+        
+        user_volumes = {
+            sym: [(user_id, buy_volume, sell_volume)]
+            for sym, (buy_volume, sell_volume) in side_volumes.items()
+        }
+        
+        large_trade_columns = _trade_columns([t for t in trades if trade_counts[t.symbol] >= 10])
+        
+        anomalies: List[AnomalyAlert] = []
+        jobs = self._detector_jobs(
+            trade_counts, hourly_volumes, large_trade_columns, minute_counts, user_volumes, now
+        )
+        for detector, args in jobs:
+            anomalies.extend(detector(*args))
+        
+        anomalies.sort(key=lambda x: (x.severity, to_ns(x.detected_at)), reverse=True)
         return anomalies
     
-    async def _detect_volume_spikes(
+    async def record_trades(self, redis_client: redis.Redis, trades: List[Trade]) -> None:
+        """
+        Fold committed trades into the hourly volume rollups, one pipeline per batch
+        Buckets expire after the longest anomaly lookback
+        """
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.set(ROLLUP_SINCE_KEY, time.time_ns(), nx=True)
+        for trade in trades:
+            hour_key = to_ns(trade.executed_at) // HOUR_NS
+            key = f"{ROLLUP_KEY_PREFIX}:{trade.symbol}:{hour_key}"
+            pipe.sadd(ROLLUP_SYMBOLS_KEY, trade.symbol)
+            pipe.hincrbyfloat(key, "qty", float(trade.quantity))
+            pipe.hincrby(key, "count", 1)
+            pipe.expire(key, ROLLUP_TTL)
+        await pipe.execute()
+    
+    async def _read_volume_rollups(
+        self,
+        redis_client: redis.Redis,
+        symbol: Optional[str],
+        start_time: datetime,
+    ) -> Optional[Tuple[Dict[str, Dict[int, float]], Dict[str, int]]]:
+        """
+        Hourly volumes and per-symbol trade counts since start_time, from the rollups
+        None if the rollups don't cover the window or Redis is unavailable
+        """
+        start_ns = to_ns(start_time)
+        try:
+            since, members = await (
+                redis_client.pipeline(transaction=False)
+                .get(ROLLUP_SINCE_KEY)
+                .smembers(ROLLUP_SYMBOLS_KEY)
+                .execute()
+            )
+            if since is None or int(since) > start_ns:
+                return None
+            
+            symbols = [symbol] if symbol else sorted(s.decode() for s in members)
+            
+            # Whole hours only - the bucket holding start_time also counts
+            # trades from before the window, so it is left out
+            hour_keys = range(-(-start_ns // HOUR_NS), time.time_ns() // HOUR_NS + 1)
+            
+            pipe = redis_client.pipeline(transaction=False)
+            for sym in symbols:
+                for hour_key in hour_keys:
+                    pipe.hmget(f"{ROLLUP_KEY_PREFIX}:{sym}:{hour_key}", "qty", "count")
+            buckets = iter(await pipe.execute())
+        except RedisError:
+            return None
+        
+        hourly_volumes: Dict[str, Dict[int, float]] = defaultdict(dict)
+        trade_counts: Dict[str, int] = defaultdict(int)
+        for sym in symbols:
+            for hour_key in hour_keys:
+                volume, count = next(buckets)
+                if count is not None:
+                    hourly_volumes[sym][hour_key] = float(volume)
+                    trade_counts[sym] += int(count)
+        
+        return hourly_volumes, trade_counts
+    
+    def _detect_volume_spikes(
         self,
         symbol: str,
-        trades: List[Trade],
+        hourly_volumes: Dict[int, float],
     ) -> List[AnomalyAlert]:
         """Detect unusual volume spikes"""
         anomalies = []
         
-        if len(trades) < 10:
-            return anomalies
-        
-        # Calculate hourly volumes
-        hourly_volumes: Dict[int, Decimal] = defaultdict(Decimal)
-        for trade in trades:
-            hour_key = int(trade.executed_at.timestamp() // 3600)
-            hourly_volumes[hour_key] += trade.quantity
-        
         if len(hourly_volumes) < 3:
             return anomalies
         
-        volumes = list(hourly_volumes.values())
-        mean_vol = statistics.mean([float(v) for v in volumes])
-        std_vol = statistics.stdev([float(v) for v in volumes]) if len(volumes) > 1 else 0
+        mean_vol, std_vol = kernels.mean_std(hourly_volumes.values())
         
-        threshold = mean_vol + (self.RISK_THRESHOLDS["volume_spike_multiplier"] * std_vol)
+        threshold = mean_vol + VOLUME_SPIKE_MULTIPLIER * std_vol
         
         for hour_key, volume in hourly_volumes.items():
-            if float(volume) > threshold:
-                spike_ratio = float(volume) / mean_vol if mean_vol > 0 else 0
-                anomalies.append(AnomalyAlert(
-                    id=f"vol_{symbol}_{hour_key}",
-                    type=AnomalyType.VOLUME_SPIKE,
-                    symbol=symbol,
-                    severity=min(10, int(spike_ratio * 2)),
-                    description=f"Volume spike detected: {spike_ratio:.1f}x average volume",
-                    detected_at=datetime.fromtimestamp(hour_key * 3600),
-                    metrics={
-                        "volume": float(volume),
-                        "average_volume": mean_vol,
-                        "spike_ratio": spike_ratio,
-                    },
-                    recommendation="Monitor for potential market manipulation or significant news event",
-                ))
+            if volume <= threshold:
+                continue
+            spike_ratio = volume / mean_vol if mean_vol > 0 else 0
+            anomalies.append(AnomalyAlert(
+                id=f"vol_{symbol}_{hour_key}",
+                type=AnomalyType.VOLUME_SPIKE,
+                symbol=symbol,
+                severity=min(10, int(spike_ratio * 2)),
+                description=f"Volume spike detected: {spike_ratio:.1f}x average volume",
+                detected_at=datetime.utcfromtimestamp(hour_key * 3600),
+                metrics={
+                    "volume": volume,
+                    "average_volume": mean_vol,
+                    "spike_ratio": spike_ratio,
+                },
+                recommendation="Monitor for potential market manipulation or significant news event",
+            ))
         
         return anomalies
     
-    async def _detect_large_trades(
+    def _detect_large_trades(
         self,
-        symbol: str,
-        trades: List[Trade],
+        trades: TradeColumns,
     ) -> List[AnomalyAlert]:
-        """Detect unusually large trades (whale activity)"""
+        """
+        Detect unusually large trades (whale activity)
+        Takes trades of symbols with at least 10 trades each
+        """
         anomalies = []
         
-        if len(trades) < 10:
-            return anomalies
-        
-        quantities = [float(t.quantity) for t in trades]
-        threshold_percentile = self.RISK_THRESHOLDS["large_trade_percentile"]
-        threshold = sorted(quantities)[int(len(quantities) * threshold_percentile / 100)]
+        quantities = trades.quantities
+        flagged, average_sizes = kernels.large_trades(
+            trades.symbol_ids, quantities, LARGE_TRADE_PERCENTILE
+        )
         
-        for trade in trades:
-            if float(trade.quantity) > threshold:
-                size_ratio = float(trade.quantity) / statistics.mean(quantities)
-                anomalies.append(AnomalyAlert(
-                    id=f"whale_{trade.trade_id}",
-                    type=AnomalyType.LARGE_TRADE,
-                    symbol=symbol,
-                    user_id=trade.user_id,
-                    severity=min(10, int(size_ratio)),
-                    description=f"Large trade detected: {size_ratio:.1f}x average size",
-                    detected_at=trade.executed_at,
-                    metrics={
-                        "trade_size": float(trade.quantity),
-                        "average_size": statistics.mean(quantities),
-                        "trade_value": float(trade.quote_quantity),
-                    },
-                    recommendation="Review for market impact and potential whale activity",
-                ))
+        for i in flagged:
+            code = trades.symbol_ids[i]
+            average_size = float(average_sizes[code])
+            size_ratio = float(quantities[i]) / average_size
+            anomalies.append(AnomalyAlert(
+                id=f"whale_{trades.trade_ids[i]}",
+                type=AnomalyType.LARGE_TRADE,
+                symbol=str(trades.symbols[code]),
+                user_id=trades.user_ids[i],
+                severity=min(10, int(size_ratio)),
+                description=f"Large trade detected: {size_ratio:.1f}x average size",
+                detected_at=trades.executed_at[i],
+                metrics={
+                    "trade_size": float(quantities[i]),
+                    "average_size": average_size,
+                    "trade_value": float(trades.quote_quantities[i]),
+                },
+                recommendation="Review for market impact and potential whale activity",
+            ))
         
         return anomalies
     
-    async def _detect_rapid_trading(
+    def _detect_rapid_trading(
         self,
         symbol: str,
-        trades: List[Trade],
+        minute_counts: List[Tuple[UUID, int, int]],
     ) -> List[AnomalyAlert]:
-        """Detect rapid trading patterns (potential bot activity)"""
+        """
+        Detect rapid trading patterns (potential bot activity)
+        Takes (user_id, minute, trade count) rows already over the threshold
+        """
         anomalies = []
         
-        # Group trades by user and minute
-        user_minute_trades: Dict[Tuple[UUID, int], int] = defaultdict(int)
-        user_trades: Dict[UUID, List[Trade]] = defaultdict(list)
-        
-        for trade in trades:
-            minute_key = int(trade.executed_at.timestamp() // 60)
-            user_minute_trades[(trade.user_id, minute_key)] += 1
-            user_trades[trade.user_id].append(trade)
-        
-        threshold = self.RISK_THRESHOLDS["rapid_trade_threshold"]
-        
-        for (user_id, minute_key), count in user_minute_trades.items():
-            if count > threshold:
-                anomalies.append(AnomalyAlert(
-                    id=f"rapid_{user_id}_{minute_key}",
-                    type=AnomalyType.RAPID_TRADING,
-                    symbol=symbol,
-                    user_id=user_id,
-                    severity=min(10, count // threshold),
-                    description=f"Rapid trading: {count} trades in 1 minute",
-                    detected_at=datetime.fromtimestamp(minute_key * 60),
-                    metrics={
-                        "trades_per_minute": count,
-                        "threshold": threshold,
-                    },
-                    recommendation="Review for automated trading or potential market manipulation",
-                ))
+        for user_id, minute_key, count in minute_counts:
+            anomalies.append(AnomalyAlert(
+                id=f"rapid_{user_id}_{minute_key}",
+                type=AnomalyType.RAPID_TRADING,
+                symbol=symbol,
+                user_id=user_id,
+                severity=min(10, count // RAPID_TRADE_THRESHOLD),
+                description=f"Rapid trading: {count} trades in 1 minute",
+                detected_at=datetime.utcfromtimestamp(minute_key * 60),
+                metrics={
+                    "trades_per_minute": count,
+                    "threshold": RAPID_TRADE_THRESHOLD,
+                },
+                recommendation="Review for automated trading or potential market manipulation",
+            ))
         
         return anomalies
     
-    async def _detect_manipulation_patterns(
+    def _detect_manipulation_patterns(
         self,
         symbol: str,
-        trades: List[Trade],
+        user_volumes: List[Tuple[UUID, float, float]],
+        detected_at: datetime,
     ) -> List[AnomalyAlert]:
-        """Detect potential market manipulation patterns"""
+        """
+        Detect potential market manipulation patterns
+        Takes (user_id, buy volume, sell volume) rows for the symbol
+        """
         anomalies = []
         
         # Look for wash trading patterns (self-trading or coordinated trading)
-        user_buy_sell: Dict[UUID, Dict[str, Decimal]] = defaultdict(lambda: {"buy": Decimal(0), "sell": Decimal(0)})
-        
-        for trade in trades:
-            user_buy_sell[trade.user_id][trade.side] += trade.quantity
-        
-        for user_id, volumes in user_buy_sell.items():
-            buy_vol = float(volumes["buy"])
-            sell_vol = float(volumes["sell"])
-            
+        for user_id, buy_vol, sell_vol in user_volumes:
             if buy_vol > 0 and sell_vol > 0:
                 # Check for nearly equal buy/sell volumes (potential wash trading)
                 min_vol = min(buy_vol, sell_vol)
@@ -282,7 +714,7 @@ class AIAnalyticsService:
                         user_id=user_id,
                         severity=8,
                         description=f"Potential wash trading: buy/sell ratio {ratio:.2%}",
-                        detected_at=datetime.utcnow(),
+                        detected_at=detected_at,
                         metrics={
                             "buy_volume": buy_vol,
                             "sell_volume": sell_vol,
@@ -295,6 +727,7 @@ class AIAnalyticsService:
     
     # ==================== RISK SCORING ====================
     
+    @cached_async(key_fn=lambda user_id, **_: user_id)
     async def calculate_user_risk_score(
         self,
         db: AsyncSession,
@@ -312,19 +745,25 @@ class AIAnalyticsService:
         """
         # Get user's recent trades (last 30 days)
         start_time = datetime.utcnow() - timedelta(days=30)
-        result = await db.execute(
-            select(Trade)
-            .where(Trade.user_id == user_id)
-            .where(Trade.executed_at >= start_time)
-            .order_by(Trade.executed_at)
+        result = await db.execute(_RISK_TRADES, {"user_id": user_id, "since": start_time})
+        return self._score_user_risk(user_id, result.all())
+    
+    def _score_user_risk(
+        self,
+        user_id: UUID,
+        trades: Sequence[Row],
+    ) -> RiskScore:
+        """Risk score from the user's last 30 days of trades (symbol and quote quantity)"""
+        symbols = [t.symbol for t in trades]
+        trade_values = np.fromiter(
+            (float(t.quote_quantity) for t in trades), dtype=np.float64, count=len(trades)
         )
-        trades = result.scalars().all()
         
         # Initialize risk factors
         risk_factors: Dict[str, float] = {}
         
         # 1. Trading volume risk (higher volume = higher risk exposure)
-        total_volume = sum(float(t.quote_quantity) for t in trades)
+        total_volume = float(trade_values.sum())
         volume_risk = min(10, total_volume / 100000)  # Scale to 10
         risk_factors["trading_volume"] = volume_risk
         
@@ -338,12 +777,10 @@ class AIAnalyticsService:
         risk_factors["trading_frequency"] = frequency_risk
         
         # 3. Portfolio concentration risk
-        symbol_volumes: Dict[str, float] = defaultdict(float)
-        for trade in trades:
-            symbol_volumes[trade.symbol] += float(trade.quote_quantity)
-        
-        if symbol_volumes:
-            max_concentration = max(symbol_volumes.values()) / total_volume if total_volume > 0 else 0
+        if symbols:
+            _, symbol_index = np.unique(symbols, return_inverse=True)
+            symbol_volumes = np.bincount(symbol_index, weights=trade_values)
+            max_concentration = float(symbol_volumes.max()) / total_volume if total_volume > 0 else 0
             concentration_risk = max_concentration * 10
         else:
             concentration_risk = 0
@@ -351,23 +788,102 @@ class AIAnalyticsService:
         
         # 4. Volatility risk (based on P&L swings)
         if len(trades) >= 10:
-            trade_values = [float(t.quote_quantity) for t in trades]
-            volatility = statistics.stdev(trade_values) / statistics.mean(trade_values) if statistics.mean(trade_values) > 0 else 0
+            mean_value = float(trade_values.mean())
+            volatility = float(trade_values.std(ddof=1)) / mean_value if mean_value > 0 else 0
             volatility_risk = min(10, volatility * 10)
         else:
             volatility_risk = 5  # Default medium risk for new users
         risk_factors["volatility"] = volatility_risk
         
         # Calculate overall risk score (weighted average)
-        weights = {
-            "trading_volume": 0.25,
-            "trading_frequency": 0.20,
-            "concentration": 0.30,
-            "volatility": 0.25,
-        }
+        overall_score = sum(risk_factors[k] * w for k, w in zip(RISK_FACTORS, RISK_WEIGHTS))
+        
+        return self._build_risk_score(user_id, risk_factors, overall_score, {
+            "total_trades": trade_count,
+            "total_volume": total_volume,
+            "unique_symbols": len(set(symbols)),
+        })
+    
+    async def calculate_user_risk_scores(
+        self,
+        db: AsyncSession,
+        user_ids: List[UUID],
+    ) -> Dict[UUID, RiskScore]:
+        """
+        Risk scores for many users from one grouped query
         
-        overall_score = sum(risk_factors[k] * weights[k] for k in weights)
+        Same factors as calculate_user_risk_score, computed for all users at
+        once from per-(user, symbol) sums. Volatility uses the sum of squares,
+        so no individual trades are loaded.
+        """
+        index = {user_id: i for i, user_id in enumerate(dict.fromkeys(user_ids))}
+        if not index:
+            return {}
         
+        start_time = datetime.utcnow() - timedelta(days=30)
+        value = cast(Trade.quote_quantity, Float)
+        result = await db.execute(
+            select(Trade.user_id, func.sum(value), func.sum(value * value), func.count())
+            .where(Trade.user_id.in_(list(index)))
+            .where(Trade.executed_at >= start_time)
+            .group_by(Trade.user_id, Trade.symbol)
+        )
+        rows = result.all()
+        
+        # Fold the (user, symbol) groups into per-user columns
+        n = len(index)
+        totals = np.zeros(n)
+        squares = np.zeros(n)
+        counts = np.zeros(n)
+        largest = np.zeros(n)
+        symbol_counts = np.zeros(n, dtype=np.int64)
+        if rows:
+            user_ids_col, volumes, volume_squares, trade_counts = zip(*rows)
+            users = np.fromiter((index[u] for u in user_ids_col), dtype=np.intp, count=len(rows))
+            volumes = np.array(volumes, dtype=np.float64)
+            np.add.at(totals, users, volumes)
+            np.add.at(squares, users, np.array(volume_squares, dtype=np.float64))
+            np.add.at(counts, users, np.array(trade_counts, dtype=np.float64))
+            np.maximum.at(largest, users, volumes)
+            np.add.at(symbol_counts, users, 1)
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # 1-3. Volume, frequency and concentration
+            volume_risk = np.minimum(10, totals / 100000)
+            frequency_risk = np.minimum(10, counts / 30 / 10)
+            concentration_risk = np.where(totals > 0, largest / totals, 0) * 10
+            
+            # 4. Volatility - sample std from the sums, 5 (medium) below 10 trades
+            means = totals / counts
+            variances = np.maximum(squares - counts * means * means, 0) / (counts - 1)
+            volatility = np.where(means > 0, np.sqrt(variances) / means, 0)
+            volatility_risk = np.where(counts >= 10, np.minimum(10, volatility * 10), 5)
+        
+        factors = np.column_stack((volume_risk, frequency_risk, concentration_risk, volatility_risk))
+        overall_scores = factors @ np.array(RISK_WEIGHTS)
+        
+        return {
+            user_id: self._build_risk_score(
+                user_id,
+                dict(zip(RISK_FACTORS, factors[i].tolist())),
+                float(overall_scores[i]),
+                {
+                    "total_trades": int(counts[i]),
+                    "total_volume": float(totals[i]),
+                    "unique_symbols": int(symbol_counts[i]),
+                },
+            )
+            for user_id, i in index.items()
+        }
+    
+    def _build_risk_score(
+        self,
+        user_id: UUID,
+        risk_factors: Dict[str, float],
+        overall_score: float,
+        metrics: Dict[str, Any],
+    ) -> RiskScore:
+        """Risk level and recommendations for a user's weighted factor scores"""
         # Determine risk level
         if overall_score < 3:
             level = RiskLevel.LOW
@@ -394,11 +910,7 @@ class AIAnalyticsService:
             factors=risk_factors,
             recommendations=recommendations,
             calculated_at=datetime.utcnow(),
-            metrics={
-                "total_trades": trade_count,
-                "total_volume": total_volume,
-                "unique_symbols": len(symbol_volumes),
-            },
+            metrics=metrics,
         )
     
     async def calculate_portfolio_risk(
@@ -421,25 +933,33 @@ class AIAnalyticsService:
         
         risk_factors: Dict[str, float] = {}
         
+        # Position values and unrealized P&L as arrays, read in one pass
+        values = np.empty(len(positions), dtype=np.float64)
+        pnls = np.empty(len(positions), dtype=np.float64)
+        asset_types = set()
+        for i, p in enumerate(positions):
+            values[i] = p.value_usd
+            pnls[i] = p.unrealized_pnl or 0
+            if p.asset_type:
+                asset_types.add(p.asset_type)
+        
         # Calculate total portfolio value
-        total_value = sum(float(p.value_usd) for p in positions)
+        total_value = float(values.sum())
         
         # 1. Concentration risk (HHI - Herfindahl-Hirschman Index)
         if total_value > 0:
-            market_shares = [(float(p.value_usd) / total_value) ** 2 for p in positions]
-            hhi = sum(market_shares)
+            hhi = float(np.dot(values, values)) / (total_value * total_value)
             concentration_risk = hhi * 10  # Scale to 10
         else:
             concentration_risk = 0
         risk_factors["concentration"] = concentration_risk
         
         # 2. Asset type diversification
-        asset_types = set(p.asset_type for p in positions if p.asset_type)
         diversification_risk = max(0, 10 - len(asset_types) * 2)
         risk_factors["diversification"] = diversification_risk
         
         # 3. Unrealized P&L risk
-        total_unrealized_pnl = sum(float(p.unrealized_pnl or 0) for p in positions)
+        total_unrealized_pnl = float(pnls.sum())
         pnl_risk = abs(total_unrealized_pnl / total_value * 10) if total_value > 0 else 0
         risk_factors["unrealized_pnl"] = min(10, pnl_risk)
         
@@ -478,6 +998,7 @@ class AIAnalyticsService:
     
     # ==================== PRICE PREDICTIONS ====================
     
+    @cached_async(key_fn=lambda symbol, horizon_minutes, **_: (symbol, horizon_minutes))
     async def predict_price(
         self,
         db: AsyncSession,
@@ -493,18 +1014,53 @@ class AIAnalyticsService:
         - Relative strength index (RSI)
         - Bollinger Bands
         - Volume-weighted price trends
+        
+        Predictions are cached per symbol, horizon and minute. Concurrent misses
+        are coalesced: one caller computes while the others briefly wait for it.
+        Redis errors fall through to computing directly.
         """
+        cache_key = f"{PREDICTION_KEY_PREFIX}:{symbol}:{horizon_minutes}:{int(time.time()) // 60}"
+        
+        try:
+            cached = await redis_client.get(cache_key)
+            if cached is None and not await redis_client.set(
+                f"{cache_key}:lock", 1, nx=True, px=PREDICTION_LOCK_TTL_MS
+            ):
+                # Another request is computing it - wait for its result
+                for _ in range(PREDICTION_LOCK_WAIT_STEPS):
+                    await asyncio.sleep(PREDICTION_LOCK_WAIT_STEP)
+                    cached = await redis_client.get(cache_key)
+                    if cached is not None:
+                        break
+        except RedisError:
+            return await self._predict_price(db, symbol, horizon_minutes)
+        
+        if cached is not None:
+            return PricePrediction.model_validate_json(cached)
+        
+        prediction = await self._predict_price(db, symbol, horizon_minutes)
+        
+        try:
+            await redis_client.set(cache_key, prediction.model_dump_json(), ex=PREDICTION_CACHE_TTL)
+            await redis_client.delete(f"{cache_key}:lock")
+        except RedisError:
+            pass
+        
+        return prediction
+    
+    async def _predict_price(
+        self,
+        db: AsyncSession,
+        symbol: str,
+        horizon_minutes: int,
+    ) -> PricePrediction:
+        """Compute a price prediction from the last 24 hours of trades"""
         # Get recent trades for analysis
         lookback = timedelta(hours=24)
         start_time = datetime.utcnow() - lookback
         
-        result = await db.execute(
-            select(Trade)
-            .where(Trade.symbol == symbol)
-            .where(Trade.executed_at >= start_time)
-            .order_by(Trade.executed_at)
-        )
-        trades = result.scalars().all()
+        result = await db.execute(_PREDICTION_TRADES, {"symbol": symbol, "since": start_time})
+        trades = result.all()
         
         if len(trades) < 50:
             # Not enough data for prediction
@@ -520,72 +1076,51 @@ class AIAnalyticsService:
             )
         
         # Extract price series
-        prices = [float(t.price) for t in trades]
-        volumes = [float(t.quantity) for t in trades]
-        current_price = prices[-1]
+        prices, volumes = np.array(trades, dtype=np.float64).T
+        current_price = float(prices[-1])
         
         # Calculate technical indicators
         factors: Dict[str, Any] = {}
         
-        # 1. Simple Moving Averages
-        sma_20 = statistics.mean(prices[-20:]) if len(prices) >= 20 else current_price
-        sma_50 = statistics.mean(prices[-50:]) if len(prices) >= 50 else current_price
+        # 1. Simple Moving Averages - the 20-trade mean and spread also feed the bands
+        if len(prices) >= 20:
+            sma_20, std_20 = kernels.window_stats(prices, 20)
+        else:
+            sma_20, std_20 = current_price, 0.0
+        sma_50 = kernels.sma(prices, 50) if len(prices) >= 50 else current_price
         factors["sma_20"] = sma_20
         factors["sma_50"] = sma_50
         factors["sma_signal"] = "bullish" if sma_20 > sma_50 else "bearish"
         
         # 2. RSI (Relative Strength Index)
-        rsi = self._calculate_rsi(prices, period=14)
+        rsi = kernels.rsi(prices, period=14)
         factors["rsi"] = rsi
         factors["rsi_signal"] = "oversold" if rsi < 30 else "overbought" if rsi > 70 else "neutral"
         
         # 3. Price momentum
         if len(prices) >= 10:
-            momentum = (prices[-1] - prices[-10]) / prices[-10] * 100
+            momentum = float((prices[-1] - prices[-10]) / prices[-10] * 100)
         else:
             momentum = 0
         factors["momentum"] = momentum
         
         # 4. Volume trend
-        recent_vol = statistics.mean(volumes[-10:]) if len(volumes) >= 10 else 0
-        older_vol = statistics.mean(volumes[-50:-10]) if len(volumes) >= 50 else recent_vol
+        recent_vol = kernels.sma(volumes, 10) if len(volumes) >= 10 else 0
+        older_vol = float(volumes[-50:-10].mean()) if len(volumes) >= 50 else recent_vol
         volume_trend = recent_vol / older_vol if older_vol > 0 else 1
         factors["volume_trend"] = volume_trend
         
         # 5. Volatility (Bollinger Band width)
         if len(prices) >= 20:
-            std_dev = statistics.stdev(prices[-20:])
-            bb_width = (std_dev * 2) / sma_20 * 100
+            bb_width = kernels.bollinger_width(std_20, sma_20)
         else:
             bb_width = 5
         factors["bollinger_width"] = bb_width
         
         # Generate prediction based on indicators
-        signals = []
-        
-        # SMA crossover signal
-        if sma_20 > sma_50:
-            signals.append(0.2)  # Bullish
-        else:
-            signals.append(-0.2)  # Bearish
-        
-        # RSI signal
-        if rsi < 30:
-            signals.append(0.3)  # Oversold - likely to rise
-        elif rsi > 70:
-            signals.append(-0.3)  # Overbought - likely to fall
-        else:
-            signals.append(0)
-        
-        # Momentum signal
-        signals.append(min(0.3, max(-0.3, momentum / 10)))
-        
-        # Volume signal
-        if volume_trend > 1.5:
-            signals.append(0.1 if momentum > 0 else -0.1)  # Volume confirms trend
+        combined_signal = kernels.combined_signal(sma_20, sma_50, rsi, momentum, volume_trend)
         
         # Calculate predicted price change
-        combined_signal = sum(signals)
         predicted_change_pct = combined_signal * (horizon_minutes / 60) * 0.5  # Scale by time
         predicted_price = current_price * (1 + predicted_change_pct / 100)
         
@@ -611,30 +1146,9 @@ class AIAnalyticsService:
             generated_at=datetime.utcnow(),
         )
     
-    def _calculate_rsi(self, prices: List[float], period: int = 14) -> float:
-        """Calculate Relative Strength Index"""
-        if len(prices) < period + 1:
-            return 50.0  # Neutral
-        
-        deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-        recent_deltas = deltas[-period:]
-        
-        gains = [d for d in recent_deltas if d > 0]
-        losses = [-d for d in recent_deltas if d < 0]
-        
-        avg_gain = statistics.mean(gains) if gains else 0
-        avg_loss = statistics.mean(losses) if losses else 0
-        
-        if avg_loss == 0:
-            return 100.0
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return round(rsi, 2)
-    
     # ==================== PORTFOLIO ANALYSIS ====================
     
+    @cached_async(key_fn=lambda user_id, **_: user_id)
     async def analyze_portfolio(
         self,
         db: AsyncSession,
@@ -643,15 +1157,52 @@ class AIAnalyticsService:
         """
         Comprehensive portfolio analysis with AI insights
         """
-        # Get all user trades
-        result = await db.execute(
-            select(Trade)
-            .where(Trade.user_id == user_id)
-            .order_by(Trade.executed_at)
+        # Net position and cost basis per symbol, with the latest traded price
+        result = await db.execute(_PORTFOLIO_POSITIONS, {"user_id": user_id})
+        positions = result.all()
+        
+        # The trading metrics pair consecutive trades, so they still need the
+        # sequence - streamed in batches and kept as compact columns, not rows
+        result = await db.stream(
+            _PORTFOLIO_TRADES.execution_options(yield_per=TRADE_STREAM_BATCH_SIZE),
+            {"user_id": user_id},
         )
-        trades = result.scalars().all()
+        batches = [_trade_sequence(rows) async for rows in result.partitions()]
+        if len(batches) == 1:
+            trades = batches[0]
+        elif batches:
+            trades = TradeSequence(*(np.concatenate(column) for column in zip(*batches)))
+        else:
+            trades = _trade_sequence([])
         
-        if not trades:
+        return self._analyze_trades(user_id, positions, trades)
+    
+    def _fold_positions(self, trades: Sequence[Row]) -> List[Tuple[str, Decimal, Decimal, Decimal]]:
+        """(symbol, quantity, cost basis, latest price) per symbol from trades in execution order"""
+        positions: Dict[str, List[Decimal]] = {}
+        for trade in trades:
+            position = positions.setdefault(trade.symbol, [Decimal("0"), Decimal("0"), Decimal("0")])
+            if trade.side == "buy":
+                position[0] += trade.quantity
+                position[1] += trade.quote_quantity
+            else:
+                position[0] -= trade.quantity
+                position[1] -= trade.quote_quantity
+            position[2] = trade.price
+        
+        return [(symbol, *position) for symbol, position in sorted(positions.items())]
+    
+    def _analyze_trades(
+        self,
+        user_id: UUID,
+        positions_data: Sequence[Tuple[str, Decimal, Decimal, Decimal]],
+        trades: TradeSequence,
+    ) -> PortfolioAnalysis:
+        """
+        Portfolio analysis from (symbol, quantity, cost basis, latest price)
+        positions and all of the user's trades, in execution order
+        """
+        if not len(trades.prices):
             return PortfolioAnalysis(
                 user_id=user_id,
                 total_value=Decimal("0"),
@@ -674,42 +1225,21 @@ class AIAnalyticsService:
                 analyzed_at=datetime.utcnow(),
             )
         
-        # Calculate positions from trades
-        positions_data: Dict[str, Dict] = defaultdict(lambda: {
-            "quantity": Decimal("0"),
-            "cost_basis": Decimal("0"),
-            "trades": [],
-        })
-        
-        for trade in trades:
-            symbol = trade.symbol
-            if trade.side == "buy":
-                positions_data[symbol]["quantity"] += trade.quantity
-                positions_data[symbol]["cost_basis"] += trade.quote_quantity
-            else:
-                positions_data[symbol]["quantity"] -= trade.quantity
-                positions_data[symbol]["cost_basis"] -= trade.quote_quantity
-            positions_data[symbol]["trades"].append(trade)
-        
         # Build position list
         positions: List[PortfolioPosition] = []
         total_value = Decimal("0")
         total_cost = Decimal("0")
         
-        for symbol, data in positions_data.items():
-            if data["quantity"] > 0:
-                # Get latest price (from most recent trade)
-                latest_trade = data["trades"][-1]
-                current_price = latest_trade.price
-                value = data["quantity"] * current_price
-                cost = data["cost_basis"]
+        for symbol, quantity, cost, current_price in positions_data:
+            if quantity > 0:
+                value = quantity * current_price
                 unrealized_pnl = value - cost
                 pnl_percent = (unrealized_pnl / cost * 100) if cost > 0 else Decimal("0")
                 
                 positions.append(PortfolioPosition(
                     symbol=symbol,
-                    quantity=data["quantity"],
-                    avg_price=cost / data["quantity"] if data["quantity"] > 0 else Decimal("0"),
+                    quantity=quantity,
+                    avg_price=cost / quantity,
                     current_price=current_price,
                     value_usd=value,
                     unrealized_pnl=unrealized_pnl,
@@ -721,10 +1251,10 @@ class AIAnalyticsService:
                 total_cost += cost
         
         # Calculate trading metrics
-        metrics = await self._calculate_trading_metrics(trades)
+        metrics = self._calculate_trading_metrics(trades)
         
         # Generate AI insights
-        insights = await self._generate_insights(positions, metrics)
+        insights = self._generate_insights(positions, metrics)
         
         # Calculate total P&L
         total_pnl = total_value - total_cost
@@ -741,12 +1271,12 @@ class AIAnalyticsService:
             analyzed_at=datetime.utcnow(),
         )
     
-    async def _calculate_trading_metrics(
+    def _calculate_trading_metrics(
         self,
-        trades: List[Trade],
+        trades: TradeSequence,
     ) -> TradingMetrics:
         """Calculate comprehensive trading metrics"""
-        if not trades:
+        if not len(trades.prices):
             return TradingMetrics(
                 total_trades=0,
                 winning_trades=0,
@@ -760,32 +1290,20 @@ class AIAnalyticsService:
                 avg_hold_time_hours=Decimal("0"),
             )
         
-        # Group trades into round trips (buy then sell)
-        profits: List[float] = []
-        losses: List[float] = []
+        # Simplified P&L over consecutive same-symbol trades that reverse side:
+        # buy then sell gains on a price rise, sell then buy on a fall
+        symbols, is_buy, prices, quantities = trades
         
-        # Simplified P&L calculation based on consecutive trades
-        for i in range(1, len(trades)):
-            prev_trade = trades[i-1]
-            curr_trade = trades[i]
-            
-            if prev_trade.symbol == curr_trade.symbol:
-                if prev_trade.side == "buy" and curr_trade.side == "sell":
-                    pnl = float(curr_trade.price - prev_trade.price) * float(min(prev_trade.quantity, curr_trade.quantity))
-                    if pnl > 0:
-                        profits.append(pnl)
-                    else:
-                        losses.append(abs(pnl))
-                elif prev_trade.side == "sell" and curr_trade.side == "buy":
-                    pnl = float(prev_trade.price - curr_trade.price) * float(min(prev_trade.quantity, curr_trade.quantity))
-                    if pnl > 0:
-                        profits.append(pnl)
-                    else:
-                        losses.append(abs(pnl))
+        round_trips = (symbols[1:] == symbols[:-1]) & (is_buy[1:] != is_buy[:-1])
+        direction = np.where(is_buy[:-1], 1.0, -1.0)
+        pnl = ((prices[1:] - prices[:-1]) * direction * np.minimum(quantities[1:], quantities[:-1]))[round_trips]
+        
+        profits: List[float] = pnl[pnl > 0].tolist()
+        losses: List[float] = np.abs(pnl[pnl <= 0]).tolist()
         
         winning_trades = len(profits)
         losing_trades = len(losses)
-        total_trades = len(trades)
+        total_trades = len(prices)
         
         win_rate = Decimal(str(winning_trades / max(1, winning_trades + losing_trades) * 100))
         avg_profit = Decimal(str(statistics.mean(profits))) if profits else Decimal("0")
@@ -796,26 +1314,19 @@ class AIAnalyticsService:
         profit_factor = Decimal(str(total_profit / total_loss if total_loss > 0 else 0))
         
         # Calculate Sharpe ratio (simplified)
-        all_returns = profits + [-l for l in losses]
+        all_returns = np.concatenate((pnl[pnl > 0], pnl[pnl <= 0]))
         if len(all_returns) > 1:
-            avg_return = statistics.mean(all_returns)
-            std_return = statistics.stdev(all_returns)
+            avg_return = float(np.mean(all_returns))
+            std_return = float(np.std(all_returns, ddof=1))
             sharpe = avg_return / std_return if std_return > 0 else 0
         else:
             sharpe = 0
         
-        # Calculate max drawdown
-        equity_curve = [0.0]
-        for r in profits + [-l for l in losses]:
-            equity_curve.append(equity_curve[-1] + r)
-        
-        peak = equity_curve[0]
-        max_dd = 0.0
-        for value in equity_curve:
-            if value > peak:
-                peak = value
-            dd = (peak - value) / peak if peak > 0 else 0
-            max_dd = max(max_dd, dd)
+        # Calculate max drawdown against the running peak of the equity curve
+        equity_curve = np.concatenate(([0.0], np.cumsum(all_returns)))
+        peaks = np.maximum.accumulate(equity_curve)
+        drawdowns = np.divide(peaks - equity_curve, peaks, out=np.zeros_like(peaks), where=peaks > 0)
+        max_dd = float(drawdowns.max())
         
         return TradingMetrics(
             total_trades=total_trades,
@@ -830,7 +1341,7 @@ class AIAnalyticsService:
             avg_hold_time_hours=Decimal("0"),  # Would need order matching for accurate calculation
         )
     
-    async def _generate_insights(
+    def _generate_insights(
         self,
         positions: List[PortfolioPosition],
         metrics: TradingMetrics,
@@ -914,6 +1425,42 @@ class AIAnalyticsService:
         
         return insights
     
+    # ==================== USER DASHBOARD ====================
+    
+    async def analyze_user_bundle(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+    ) -> Tuple[RiskScore, List[AnomalyAlert], PortfolioAnalysis]:
+        """
+        Risk score, last-24h anomalies and portfolio analysis for one user
+        
+        Fetches the user's trades once and slices the 30-day and 24-hour windows
+        by execution time, instead of each analysis querying its own window.
+        The three analyses then run concurrently in worker threads.
+        
+        The fetch is not bounded to 30 days: net positions and cost basis are
+        cumulative over the user's whole history, as are the portfolio's trading
+        metrics. Price predictions are market-wide rather than per user, so they
+        can't be derived from these rows and keep their own (cached) query.
+        """
+        result = await db.execute(_USER_TRADES, {"user_id": user_id})
+        trades = result.all()
+        
+        # executed_at is timezone-aware from the database - window on epoch ns
+        now = datetime.now(timezone.utc)
+        executed_ns = [to_ns(t.executed_at) for t in trades]
+        trades_30d = trades[bisect_left(executed_ns, to_ns(now - timedelta(days=30))):]
+        trades_24h = trades[bisect_left(executed_ns, to_ns(now - timedelta(hours=24))):]
+        
+        return await asyncio.gather(
+            asyncio.to_thread(self._score_user_risk, user_id, trades_30d),
+            asyncio.to_thread(self._scan_user_trades, user_id, trades_24h, now),
+            asyncio.to_thread(
+                self._analyze_trades, user_id, self._fold_positions(trades), _trade_sequence(trades)
+            ),
+        )
+    
     # ==================== MARKET SENTIMENT ====================
     
     async def analyze_market_sentiment(
@@ -927,15 +1474,11 @@ class AIAnalyticsService:
         lookback = timedelta(hours=24)
         start_time = datetime.utcnow() - lookback
         
-        result = await db.execute(
-            select(Trade)
-            .where(Trade.symbol == symbol)
-            .where(Trade.executed_at >= start_time)
-            .order_by(Trade.executed_at)
-        )
-        trades = result.scalars().all()
+        result = await db.execute(_SENTIMENT_TOTALS, {"symbol": symbol, "since": start_time})
+        totals = result.one()
+        count = totals.trade_count
         
-        if not trades:
+        if not count:
             return MarketSentiment(
                 symbol=symbol,
                 sentiment="neutral",
@@ -948,8 +1491,8 @@ class AIAnalyticsService:
             )
         
         # Calculate buy/sell pressure
-        buy_volume = sum(float(t.quantity) for t in trades if t.side == "buy")
-        sell_volume = sum(float(t.quantity) for t in trades if t.side == "sell")
+        buy_volume = totals.buy_volume
+        sell_volume = totals.sell_volume
         total_volume = buy_volume + sell_volume
         
         buy_pressure = (buy_volume / total_volume * 100) if total_volume > 0 else 50
@@ -971,10 +1514,9 @@ class AIAnalyticsService:
             sentiment = "neutral"
         
         # Price trend
-        prices = [float(t.price) for t in trades]
-        if len(prices) >= 10:
-            early_avg = statistics.mean(prices[:len(prices)//2])
-            late_avg = statistics.mean(prices[len(prices)//2:])
+        if count >= 10:
+            early_avg = totals.early_avg
+            late_avg = totals.late_avg
             price_change = (late_avg - early_avg) / early_avg * 100
             
             if price_change > 2:
@@ -987,9 +1529,9 @@ class AIAnalyticsService:
             price_trend = "sideways"
         
         # Volume trend
-        if len(trades) >= 20:
-            early_count = len([t for t in trades[:len(trades)//2]])
-            late_count = len([t for t in trades[len(trades)//2:]])
+        if count >= 20:
+            early_count = count // 2
+            late_count = count - early_count
             
             if late_count > early_count * 1.5:
                 volume_trend = "increasing"
@@ -0,0 +1,112 @@
+"""
+AI Analytics Kernels
+Numeric indicator kernels over float64 price and volume arrays
+"""
+import math
+from typing import Iterable, Tuple
+
+import numpy as np
+
+
+def mean_std(values: Iterable[float]) -> Tuple[float, float]:
+    """
+    Mean and sample standard deviation in one pass (Welford's algorithm)
+    Numerically stable and needs no intermediate list
+    """
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    for x in values:
+        count += 1
+        delta = x - mean
+        mean += delta / count
+        m2 += delta * (x - mean)
+    
+    return mean, math.sqrt(m2 / (count - 1)) if count > 1 else 0.0
+
+
+def sma(values: np.ndarray, window: int) -> float:
+    """Simple moving average of the last `window` values"""
+    return float(values[-window:].mean())
+
+
+def window_stats(values: np.ndarray, window: int) -> Tuple[float, float]:
+    """Mean and sample standard deviation of the last `window` values"""
+    tail = values[-window:]
+    return float(tail.mean()), float(tail.std(ddof=1))
+
+
+def bollinger_width(std: float, mean: float) -> float:
+    """Bollinger band width (two sample std devs) as a percent of the window mean"""
+    return std * 2 / mean * 100
+
+
+def rsi(prices: np.ndarray, period: int = 14) -> float:
+    """Relative Strength Index over the last `period` price changes"""
+    if len(prices) < period + 1:
+        return 50.0  # Neutral
+    
+    deltas = np.diff(prices[-(period + 1):])
+    gains = deltas[deltas > 0]
+    losses = -deltas[deltas < 0]
+    
+    avg_gain = float(gains.mean()) if gains.size else 0.0
+    avg_loss = float(losses.mean()) if losses.size else 0.0
+    
+    if avg_loss == 0:
+        return 100.0
+    
+    return round(100 - (100 / (1 + avg_gain / avg_loss)), 2)
+
+
+def large_trades(
+    symbol_ids: np.ndarray,
+    quantities: np.ndarray,
+    percentile: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Trades above their own symbol's percentile size, for all symbols at once
+    
+    `symbol_ids` are dense codes 0..n-1 (e.g. from np.unique return_inverse).
+    Returns the flagged trade indices, in input order, and each symbol's mean size.
+    """
+    counts = np.bincount(symbol_ids)
+    means = np.bincount(symbol_ids, weights=quantities) / counts
+    
+    # Group sizes by symbol (stable integer sort), then select each symbol's
+    # order statistic from its contiguous run
+    grouped = quantities[np.argsort(symbol_ids, kind="stable")]
+    ends = np.cumsum(counts)
+    thresholds = np.empty(len(counts))
+    for code, (start, end) in enumerate(zip(ends - counts, ends)):
+        k = int((end - start) * percentile / 100)
+        thresholds[code] = np.partition(grouped[start:end], k)[k]
+    
+    return np.flatnonzero(quantities > thresholds[symbol_ids]), means
+
+
+def combined_signal(
+    sma_fast: float,
+    sma_slow: float,
+    rsi_value: float,
+    momentum: float,
+    volume_trend: float,
+) -> float:
+    """Sum of the SMA crossover, RSI, momentum and volume signals, roughly -0.9..0.9"""
+    # SMA crossover
+    signal = 0.2 if sma_fast > sma_slow else -0.2
+    
+    # RSI: oversold likely to rise, overbought likely to fall
+    if rsi_value < 30:
+        signal += 0.3
+    elif rsi_value > 70:
+        signal += -0.3
+    
+    # Momentum, capped
+    signal += min(0.3, max(-0.3, momentum / 10))
+    
+    # Rising volume confirms the trend
+    if volume_trend > 1.5:
+        signal += 0.1 if momentum > 0 else -0.1
+    
+    return signal
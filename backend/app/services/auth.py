@@ -2,13 +2,17 @@
 Authentication Service
 Secure JWT-based authentication with Web3 wallet binding
 """
+import hashlib
+import os
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from uuid import UUID
-from jose import jwt, JWTError
+from jose import jwk, jwt, JWTError
 from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from eth_account.messages import encode_defunct
 from web3 import Web3
 
@@ -19,6 +23,15 @@ from app.schemas.user import UserCreate, Token
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Recently verified (password, hash) pairs, so repeat logins skip bcrypt.
+# Keyed by a keyed digest of the password - the plaintext is never stored,
+# and the per-process key keeps the digests useless outside this process.
+# Only successful checks are cached; wrong passwords always pay full bcrypt cost.
+VERIFY_CACHE_TTL = 60.0
+VERIFY_CACHE_MAX_SIZE = 10_000
+_verify_cache_key = os.urandom(32)
+_verify_cache: Dict[Tuple[bytes, str], float] = {}
+
 
 class AuthService:
     """
@@ -28,18 +41,42 @@ class AuthService:
     - Ethereum wallet signature verification
     """
     
+    def __init__(self):
+        # JWT settings resolved once instead of on every encode/decode.
+        # A constructed key skips jose's per-call key parsing and setup.
+        self._key = jwk.construct(settings.SECRET_KEY, settings.ALGORITHM)
+        self._algorithm = settings.ALGORITHM
+        self._algorithms = [settings.ALGORITHM]
+        self._default_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
-        """Verify password against hash"""
-        return pwd_context.verify(plain_password, hashed_password)
+        """Verify password against hash, reusing a recent successful check"""
+        digest = hashlib.blake2b(plain_password.encode(), key=_verify_cache_key, digest_size=32).digest()
+        key = (digest, hashed_password)
+        now = time.monotonic()
+        
+        expires = _verify_cache.get(key)
+        if expires is not None:
+            if expires > now:
+                return True
+            del _verify_cache[key]
+        
+        if not pwd_context.verify(plain_password, hashed_password):
+            return False
+        
+        if len(_verify_cache) >= VERIFY_CACHE_MAX_SIZE:
+            _verify_cache.pop(next(iter(_verify_cache)))
+        _verify_cache[key] = now + VERIFY_CACHE_TTL
+        return True
     
     @staticmethod
     def hash_password(password: str) -> str:
         """Hash password using bcrypt"""
         return pwd_context.hash(password)
     
-    @staticmethod
     def create_access_token(
+        self,
         user_id: UUID,
         expires_delta: Optional[timedelta] = None
     ) -> Token:
@@ -47,21 +84,22 @@ class AuthService:
         Create JWT access token
         """
         if expires_delta is None:
-            expires_delta = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+            expires_delta = self._default_expires
         
-        expire = datetime.utcnow() + expires_delta
+        # Time claims as epoch seconds from a single clock read
+        now = int(time.time())
         
         to_encode = {
             "sub": str(user_id),
-            "exp": expire,
+            "exp": now + int(expires_delta.total_seconds()),
             "type": "access",
-            "iat": datetime.utcnow()
+            "iat": now
         }
         
         encoded_jwt = jwt.encode(
             to_encode,
-            settings.SECRET_KEY,
-            algorithm=settings.ALGORITHM
+            self._key,
+            algorithm=self._algorithm
         )
         
         return Token(
@@ -70,16 +108,15 @@ class AuthService:
             expires_in=int(expires_delta.total_seconds())
         )
     
-    @staticmethod
-    def decode_token(token: str) -> Optional[dict]:
+    def decode_token(self, token: str) -> Optional[dict]:
         """
         Decode and validate JWT token
         """
         try:
             payload = jwt.decode(
                 token,
-                settings.SECRET_KEY,
-                algorithms=[settings.ALGORITHM]
+                self._key,
+                algorithms=self._algorithms
             )
             return payload
         except JWTError:
@@ -142,24 +179,27 @@ class AuthService:
         self,
         db: AsyncSession,
         user_create: UserCreate
-    ) -> User:
+    ) -> Optional[User]:
         """
         Create new user account
+        Single atomic INSERT - returns None if the email is already registered
         """
         hashed_password = self.hash_password(user_create.password)
         
-        user = User(
-            email=user_create.email,
-            hashed_password=hashed_password,
-            is_active=True,
-            is_verified=False
+        stmt = (
+            insert(User)
+            .values(
+                email=user_create.email,
+                hashed_password=hashed_password,
+                is_active=True,
+                is_verified=False
+            )
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(User)
         )
         
-        db.add(user)
-        await db.flush()
-        await db.refresh(user)
-        
-        return user
+        result = await db.scalars(stmt)
+        return result.one_or_none()
     
     async def bind_wallet(
         self,
@@ -178,10 +218,7 @@ class AuthService:
             return False
         
         # Update user
-        result = await db.execute(
-            select(User).where(User.id == user_id)
-        )
-        user = result.scalar_one_or_none()
+        user = await db.get(User, user_id)
         
         if not user:
             return False
@@ -197,10 +234,7 @@ class AuthService:
         user_id: UUID
     ) -> Optional[User]:
         """Get user by ID"""
-        result = await db.execute(
-            select(User).where(User.id == user_id)
-        )
-        return result.scalar_one_or_none()
+        return await db.get(User, user_id)
     
     async def get_user_by_api_key(
         self,
@@ -213,3 +247,6 @@ class AuthService:
         )
         return result.scalar_one_or_none()
 
+
+# Singleton instance
+auth_service = AuthService()
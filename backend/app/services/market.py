@@ -5,17 +5,44 @@ Real-time market data aggregation and distribution
 import asyncio
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import List, Optional, Dict, Any
-from collections import defaultdict
+from typing import List, Optional, Deque, Dict, Any, Tuple
+from collections import deque
+import hashlib
 import random
+import time
 
+import numpy as np
+import orjson
 import redis.asyncio as redis
 import httpx
 
-from app.schemas.market import MarketData, Ticker, Candle
+from app.schemas.market import PRICE_SCALE, MarketData, Ticker, Candle, from_ns
+from app.schemas.trade import TradeAggregation
 from app.config import settings
 
 
+MINUTE_NS = 60 * 1_000_000_000
+DAY_NS = 1440 * MINUTE_NS
+
+# Simulated prices are plain floats; schema price fields are ints scaled by this
+SCALE = 10 ** PRICE_SCALE
+
+
+def ohlcv(prices: np.ndarray, quantities: np.ndarray) -> Tuple[float, float, float, float, float, float]:
+    """
+    Open, high, low, close, volume and quote volume of a time-ordered trade batch
+    Whole-array reductions instead of a per-trade Python loop
+    """
+    return (
+        float(prices[0]),
+        float(prices.max()),
+        float(prices.min()),
+        float(prices[-1]),
+        float(quantities.sum()),
+        float(prices @ quantities),
+    )
+
+
 class MarketDataService:
     """
     Market data service providing:
@@ -31,10 +58,34 @@ class MarketDataService:
         "MATIC-USDT", "LINK-USDT", "UNI-USDT", "AAVE-USDT"
     ]
     
+    # How often the serialized all-symbol snapshots are rebuilt
+    SNAPSHOT_INTERVAL = 0.5  # seconds
+    
+    # Candle intervals in minutes, and history kept per (symbol, interval)
+    CANDLE_INTERVALS = {"1m": 1, "5m": 5, "15m": 15, "1h": 60, "4h": 240, "1d": 1440}
+    CANDLE_HISTORY = 1000  # largest request limit
+    
     def __init__(self):
-        self._price_cache: Dict[str, MarketData] = {}
-        self._candle_cache: Dict[str, List[Candle]] = defaultdict(list)
+        # Live prices as parallel float arrays indexed by trading pair, so a
+        # tick is a handful of whole-array operations; MarketData is built on read
+        n = len(self.TRADING_PAIRS)
+        self._symbol_index: Dict[str, int] = {}
+        self._last = np.zeros(n)
+        self._bid = np.zeros(n)
+        self._ask = np.zeros(n)
+        self._high_24h = np.zeros(n)
+        self._low_24h = np.zeros(n)
+        self._volume_24h = np.zeros(n)
+        self._open_price = np.ones(n)
+        self._price_time = 0
+        self._rng = np.random.default_rng()
+        # MarketData built for each pair, reused until the next tick moves its prices
+        self._market_data_views: List[Optional[MarketData]] = [None] * n
+        
+        self._candle_cache: Dict[Tuple[str, str], Deque[Candle]] = {}
         self._ticker_cache: Dict[str, Ticker] = {}
+        self._prices_snapshot: Optional[Tuple[bytes, str]] = None
+        self._tickers_snapshot: Optional[Tuple[bytes, str]] = None
         self._running = False
     
     async def start(self, redis_client: redis.Redis) -> None:
@@ -47,6 +98,7 @@ class MarketDataService:
         
         # Start price update loop
         asyncio.create_task(self._price_update_loop())
+        asyncio.create_task(self._snapshot_loop())
     
     async def stop(self) -> None:
         """Stop market data feeds"""
@@ -55,52 +107,51 @@ class MarketDataService:
     async def _initialize_prices(self) -> None:
         """Initialize with base prices"""
         base_prices = {
-            "BTC-USDT": Decimal("42500.00"),
-            "ETH-USDT": Decimal("2250.00"),
-            "SOL-USDT": Decimal("98.50"),
-            "AVAX-USDT": Decimal("35.20"),
-            "MATIC-USDT": Decimal("0.85"),
-            "LINK-USDT": Decimal("14.30"),
-            "UNI-USDT": Decimal("6.15"),
-            "AAVE-USDT": Decimal("92.40"),
+            "BTC-USDT": 42500.00,
+            "ETH-USDT": 2250.00,
+            "SOL-USDT": 98.50,
+            "AVAX-USDT": 35.20,
+            "MATIC-USDT": 0.85,
+            "LINK-USDT": 14.30,
+            "UNI-USDT": 6.15,
+            "AAVE-USDT": 92.40,
         }
         
-        now = datetime.utcnow()
+        now = time.time_ns()
+        self._price_time = now
         
         for symbol, price in base_prices.items():
-            spread = price * Decimal("0.0005")  # 0.05% spread
+            i = self.TRADING_PAIRS.index(symbol)
+            spread = price * 0.0005  # 0.05% spread
+            volume_24h = random.uniform(1000000, 50000000)
             
-            self._price_cache[symbol] = MarketData(
-                symbol=symbol,
-                bid=price - spread,
-                ask=price + spread,
-                last=price,
-                volume_24h=Decimal(random.uniform(1000000, 50000000)),
-                high_24h=price * Decimal("1.03"),
-                low_24h=price * Decimal("0.97"),
-                change_24h=price * Decimal(str(random.uniform(-0.05, 0.05))),
-                change_percent_24h=Decimal(str(random.uniform(-5, 5))),
-                timestamp=now
-            )
+            self._last[i] = price
+            self._bid[i] = price - spread
+            self._ask[i] = price + spread
+            self._high_24h[i] = price * 1.03
+            self._low_24h[i] = price * 0.97
+            self._volume_24h[i] = volume_24h
+            self._open_price[i] = price * 0.99
+            self._symbol_index[symbol] = i
             
             # Initialize ticker
             self._ticker_cache[symbol] = Ticker(
                 symbol=symbol,
-                price_change=self._price_cache[symbol].change_24h,
-                price_change_percent=self._price_cache[symbol].change_percent_24h,
+                price_change=price * random.uniform(-0.05, 0.05),
+                price_change_percent=random.uniform(-5, 5),
                 weighted_avg_price=price,
                 last_price=price,
-                last_quantity=Decimal(str(random.uniform(0.1, 10))),
+                last_quantity=random.uniform(0.1, 10),
                 bid_price=price - spread,
-                bid_quantity=Decimal(str(random.uniform(10, 100))),
+                bid_quantity=random.uniform(10, 100),
                 ask_price=price + spread,
-                ask_quantity=Decimal(str(random.uniform(10, 100))),
-                open_price=price * Decimal("0.99"),
-                high_price=price * Decimal("1.03"),
-                low_price=price * Decimal("0.97"),
-                volume=self._price_cache[symbol].volume_24h,
-                quote_volume=self._price_cache[symbol].volume_24h * price,
-                open_time=now - timedelta(hours=24),
+                ask_quantity=random.uniform(10, 100),
+                open_price=price * 0.99,
+                high_price=price * 1.03,
+                low_price=price * 0.97,
+                volume=volume_24h,
+                quote_volume=volume_24h * price,
+                open_time=now - DAY_NS,
                 close_time=now,
                 trade_count=random.randint(50000, 500000)
             )
@@ -116,49 +167,102 @@ class MarketDataService:
                 await asyncio.sleep(1)
     
     async def _update_prices(self) -> None:
-        """Simulate price movements"""
-        now = datetime.utcnow()
+        """Simulate price movements for all pairs at once"""
+        if not self._price_time:
+            return
         
-        for symbol in self.TRADING_PAIRS:
-            if symbol not in self._price_cache:
-                continue
-            
-            current = self._price_cache[symbol]
-            
-            # Random walk with mean reversion
-            change_percent = Decimal(str(random.gauss(0, 0.0002)))  # 0.02% std dev
-            new_price = current.last * (1 + change_percent)
-            
-            spread = new_price * Decimal("0.0005")
-            
-            # Update cache
-            self._price_cache[symbol] = MarketData(
-                symbol=symbol,
-                bid=new_price - spread,
-                ask=new_price + spread,
-                last=new_price,
-                volume_24h=current.volume_24h + Decimal(str(random.uniform(100, 1000))),
-                high_24h=max(current.high_24h, new_price),
-                low_24h=min(current.low_24h, new_price),
-                change_24h=new_price - self._ticker_cache[symbol].open_price,
-                change_percent_24h=((new_price / self._ticker_cache[symbol].open_price) - 1) * 100,
-                timestamp=now
-            )
-            
-            # Publish to Redis for WebSocket distribution
-            if self._redis:
-                await self._redis.publish(
-                    f"prices:{symbol}",
-                    f"{new_price}|{new_price - spread}|{new_price + spread}|{now.isoformat()}"
-                )
+        now = time.time_ns()
+        n = len(self._last)
+        
+        # Random walk, 0.02% std dev per tick
+        self._last *= 1 + self._rng.normal(0, 0.0002, n)
+        spread = self._last * 0.0005
+        np.subtract(self._last, spread, out=self._bid)
+        np.add(self._last, spread, out=self._ask)
+        np.maximum(self._high_24h, self._last, out=self._high_24h)
+        np.minimum(self._low_24h, self._last, out=self._low_24h)
+        self._volume_24h += self._rng.uniform(100, 1000, n)
+        self._price_time = now
+        
+        # Publish to Redis for WebSocket distribution - one JSON message per pair,
+        # sent together in a single round trip
+        if self._redis:
+            timestamp = from_ns(now)
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for symbol, last, bid, ask in zip(
+                    self.TRADING_PAIRS, self._last.tolist(), self._bid.tolist(), self._ask.tolist()
+                ):
+                    pipe.publish(
+                        f"prices:{symbol}",
+                        orjson.dumps({"s": symbol, "p": last, "b": bid, "a": ask, "t": timestamp})
+                    )
+                await pipe.execute()
+    
+    def _market_data(self, i: int) -> MarketData:
+        """Market data for the pair at index `i`, built at most once per tick"""
+        view = self._market_data_views[i]
+        if view is not None and view.timestamp == self._price_time:
+            return view
+        
+        # Values are computed here, so skip validation
+        last = float(self._last[i])
+        open_price = float(self._open_price[i])
+        view = self._market_data_views[i] = MarketData.model_construct(
+            symbol=self.TRADING_PAIRS[i],
+            bid=round(float(self._bid[i]) * SCALE),
+            ask=round(float(self._ask[i]) * SCALE),
+            last=round(last * SCALE),
+            volume_24h=round(float(self._volume_24h[i]) * SCALE),
+            high_24h=round(float(self._high_24h[i]) * SCALE),
+            low_24h=round(float(self._low_24h[i]) * SCALE),
+            change_24h=round((last - open_price) * SCALE),
+            change_percent_24h=round((last / open_price - 1) * 100 * SCALE),
+            timestamp=self._price_time
+        )
+        return view
+    
+    async def _snapshot_loop(self) -> None:
+        """Rebuild serialized snapshots - single writer, readers never block"""
+        while self._running:
+            self._refresh_snapshots()
+            await asyncio.sleep(self.SNAPSHOT_INTERVAL)
+    
+    def _refresh_snapshots(self) -> None:
+        """Serialize all-symbol market data and tickers once for every reader"""
+        self._prices_snapshot = self._serialize(self._iter_market_data())
+        self._tickers_snapshot = self._serialize(self._ticker_cache.values())
+    
+    @staticmethod
+    def _serialize(models) -> Tuple[bytes, str]:
+        """JSON body plus its ETag"""
+        body = orjson.dumps([orjson.Fragment(m.__pydantic_serializer__.to_json(m)) for m in models])
+        etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+        return body, f'"{etag}"'
+    
+    def get_prices_snapshot(self) -> Tuple[bytes, str]:
+        """Pre-serialized market data for all symbols, with ETag"""
+        if self._prices_snapshot is None:
+            self._refresh_snapshots()
+        return self._prices_snapshot
+    
+    def get_tickers_snapshot(self) -> Tuple[bytes, str]:
+        """Pre-serialized 24hr tickers for all symbols, with ETag"""
+        if self._tickers_snapshot is None:
+            self._refresh_snapshots()
+        return self._tickers_snapshot
+    
+    def _iter_market_data(self):
+        """Market data for every initialized pair"""
+        return (self._market_data(i) for i in self._symbol_index.values())
     
     async def get_market_data(self, symbol: str) -> Optional[MarketData]:
         """Get current market data for symbol"""
-        return self._price_cache.get(symbol.upper())
+        i = self._symbol_index.get(symbol.upper())
+        return None if i is None else self._market_data(i)
     
     async def get_all_market_data(self) -> List[MarketData]:
         """Get market data for all symbols"""
-        return list(self._price_cache.values())
+        return list(self._iter_market_data())
     
     async def get_ticker(self, symbol: str) -> Optional[Ticker]:
         """Get 24hr ticker for symbol"""
@@ -176,51 +280,97 @@ class MarketDataService:
     ) -> List[Candle]:
         """
         Get OHLCV candlestick data
-        Generates simulated historical data
+        Served from simulated per-interval history that only grows as buckets close
         """
         symbol = symbol.upper()
         
-        if symbol not in self._price_cache:
+        if symbol not in self._symbol_index:
             return []
         
-        current_price = self._price_cache[symbol].last
-        candles = []
+        candles = self._advance_candles(symbol, interval, time.time_ns())
+        return list(candles)[-limit:]
+    
+    def _advance_candles(self, symbol: str, interval: str, now: int) -> Deque[Candle]:
+        """
+        Candle history for a symbol and interval, extended with the buckets
+        that closed since the last call
+        """
+        interval_ns = self.CANDLE_INTERVALS.get(interval, 1) * MINUTE_NS
         
-        # Generate historical candles
-        interval_minutes = {
-            "1m": 1, "5m": 5, "15m": 15, "1h": 60, "4h": 240, "1d": 1440
-        }.get(interval, 1)
+        key = (symbol, interval)
+        candles = self._candle_cache.get(key)
+        if candles is None:
+            candles = self._candle_cache[key] = deque(maxlen=self.CANDLE_HISTORY)
         
-        now = datetime.utcnow()
+        # Newest closed bucket, and the oldest one worth generating
+        last_open = (now // interval_ns - 1) * interval_ns
+        first_open = last_open - (self.CANDLE_HISTORY - 1) * interval_ns
+        if candles:
+            first_open = max(first_open, candles[-1].open_time + interval_ns)
         
-        for i in range(limit, 0, -1):
-            open_time = now - timedelta(minutes=i * interval_minutes)
-            close_time = open_time + timedelta(minutes=interval_minutes)
-            
-            # Generate realistic OHLCV
-            volatility = current_price * Decimal("0.002")
-            open_price = current_price * (1 + Decimal(str(random.gauss(0, 0.001))))
-            high = open_price + volatility * Decimal(str(random.random()))
-            low = open_price - volatility * Decimal(str(random.random()))
-            close = open_price * (1 + Decimal(str(random.gauss(0, 0.001))))
-            volume = Decimal(str(random.uniform(10000, 100000)))
-            
-            candles.append(Candle(
-                symbol=symbol,
-                interval=interval,
-                open_time=open_time,
-                open=open_price,
-                high=max(high, open_price, close),
-                low=min(low, open_price, close),
-                close=close,
-                volume=volume,
-                close_time=close_time,
-                quote_volume=volume * close,
-                trade_count=random.randint(100, 1000)
-            ))
+        if first_open <= last_open:
+            current_price = float(self._last[self._symbol_index[symbol]])
+            for open_time in range(first_open, last_open + 1, interval_ns):
+                candles.append(self._simulate_candle(symbol, interval, open_time, interval_ns, current_price))
         
         return candles
     
+    @staticmethod
+    def _simulate_candle(
+        symbol: str,
+        interval: str,
+        open_time: int,
+        interval_ns: int,
+        current_price: float
+    ) -> Candle:
+        """Generate realistic OHLCV around the current price"""
+        volatility = current_price * 0.002
+        open_price = current_price * (1 + random.gauss(0, 0.001))
+        high = open_price + volatility * random.random()
+        low = open_price - volatility * random.random()
+        close = open_price * (1 + random.gauss(0, 0.001))
+        volume = random.uniform(10000, 100000)
+        
+        return Candle.model_construct(
+            symbol=symbol,
+            interval=interval,
+            open_time=open_time,
+            open=Decimal(repr(open_price)),
+            high=Decimal(repr(max(high, open_price, close))),
+            low=Decimal(repr(min(low, open_price, close))),
+            close=Decimal(repr(close)),
+            volume=Decimal(repr(volume)),
+            close_time=open_time + interval_ns,
+            quote_volume=Decimal(repr(volume * close)),
+            trade_count=random.randint(100, 1000)
+        )
+    
+    def aggregate_trades(
+        self,
+        symbol: str,
+        period: str,
+        prices: np.ndarray,
+        quantities: np.ndarray,
+        timestamp: datetime
+    ) -> Optional[TradeAggregation]:
+        """Build one bar from a batch of trade prices and quantities (float64 arrays)"""
+        if not len(prices):
+            return None
+        
+        open_, high, low, close, volume, quote_volume = ohlcv(prices, quantities)
+        return TradeAggregation(
+            symbol=symbol,
+            period=period,
+            open=Decimal(repr(open_)),
+            high=Decimal(repr(high)),
+            low=Decimal(repr(low)),
+            close=Decimal(repr(close)),
+            volume=Decimal(repr(volume)),
+            quote_volume=Decimal(repr(quote_volume)),
+            trade_count=len(prices),
+            timestamp=timestamp
+        )
+    
     async def get_recent_trades(
         self,
         symbol: str,
@@ -229,19 +379,19 @@ class MarketDataService:
         """Get recent trades for symbol"""
         symbol = symbol.upper()
         
-        if symbol not in self._price_cache:
+        if symbol not in self._symbol_index:
             return []
         
-        current = self._price_cache[symbol]
+        last = float(self._last[self._symbol_index[symbol]])
         trades = []
         now = datetime.utcnow()
         
         for i in range(limit):
-            price = current.last * (1 + Decimal(str(random.gauss(0, 0.0001))))
+            price = last * (1 + random.gauss(0, 0.0001))
             trades.append({
                 "trade_id": 1000000 - i,
-                "price": str(price),
-                "quantity": str(Decimal(str(random.uniform(0.01, 10)))),
+                "price": repr(price),
+                "quantity": repr(random.uniform(0.01, 10)),
                 "time": (now - timedelta(seconds=i * 2)).isoformat(),
                 "is_buyer_maker": random.choice([True, False])
             })
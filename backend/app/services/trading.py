@@ -3,21 +3,26 @@ Trading Engine
 High-performance order matching engine with price-time priority
 """
 import asyncio
-from datetime import datetime
+from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Optional, List, Tuple
+from typing import Dict, Optional, List, Tuple
 from uuid import UUID, uuid4
 from collections import defaultdict
 from dataclasses import dataclass, field
 import heapq
 
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
+from sqlalchemy.sql import Select
 import redis.asyncio as redis
+from redis.exceptions import RedisError
 
-from app.models.order import Order, OrderSide, OrderType, OrderStatus
+from app.models.order import Order, OrderSide, OrderType, OrderStatus, TimeInForce
 from app.models.trade import Trade
-from app.schemas.order import OrderCreate, OrderResponse, OrderBookEntry
+from app.schemas.order import OrderCreate, OrderResponse, OrderBookLevel
+from app.schemas.market import to_scaled
+from app.services.ai_analytics import ai_analytics_service
 from app.config import settings
 
 
@@ -67,6 +72,15 @@ class OrderBook:
                 return True
             return False
     
+    async def cancel_orders(self, order_ids: List[UUID]) -> int:
+        """Cancel a batch of orders under a single lock acquisition"""
+        async with self._lock:
+            cancelled = 0
+            for order_id in order_ids:
+                if self.orders.pop(order_id, None) is not None:
+                    cancelled += 1
+            return cancelled
+    
     async def get_best_bid(self) -> Optional[OrderEntry]:
         """Get best bid (highest buy price)"""
         while self.bids:
@@ -83,33 +97,62 @@ class OrderBook:
             heapq.heappop(self.asks)
         return None
     
-    async def get_depth(self, levels: int = 20) -> Tuple[List[OrderBookEntry], List[OrderBookEntry]]:
+    async def get_depth(self, levels: int = 20) -> Tuple[List[OrderBookLevel], List[OrderBookLevel]]:
         """Get order book depth"""
         async with self._lock:
-            bid_depth = defaultdict(lambda: {"quantity": Decimal(0), "count": 0})
-            ask_depth = defaultdict(lambda: {"quantity": Decimal(0), "count": 0})
-            
-            for entry in self.bids:
-                if entry.order_id in self.orders:
-                    bid_depth[entry.price]["quantity"] += entry.quantity
-                    bid_depth[entry.price]["count"] += 1
-            
-            for entry in self.asks:
-                if entry.order_id in self.orders:
-                    ask_depth[entry.price]["quantity"] += entry.quantity
-                    ask_depth[entry.price]["count"] += 1
-            
-            bids = [
-                OrderBookEntry(price=p, quantity=d["quantity"], order_count=d["count"])
-                for p, d in sorted(bid_depth.items(), reverse=True)[:levels]
-            ]
-            
-            asks = [
-                OrderBookEntry(price=p, quantity=d["quantity"], order_count=d["count"])
-                for p, d in sorted(ask_depth.items())[:levels]
-            ]
-            
-            return bids, asks
+            return (
+                self._aggregate_levels(self.bids, levels, descending=True),
+                self._aggregate_levels(self.asks, levels, descending=False),
+            )
+    
+    def _aggregate_levels(
+        self,
+        heap: List[OrderEntry],
+        levels: int,
+        descending: bool
+    ) -> List[OrderBookLevel]:
+        """Aggregate live entries into price levels"""
+        quantities: Dict[Decimal, Decimal] = {}
+        counts: Dict[Decimal, int] = {}
+        for entry in heap:
+            if entry.order_id in self.orders:
+                price = entry.price
+                quantities[price] = quantities.get(price, 0) + entry.quantity
+                counts[price] = counts.get(price, 0) + 1
+        
+        prices = sorted(quantities, reverse=descending)[:levels]
+        return [OrderBookLevel(price, quantities[price], counts[price]) for price in prices]
+    
+    async def get_depth_columns(self, levels: int = 20) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+        """Get order book depth as parallel int64 columns of scaled prices/quantities"""
+        async with self._lock:
+            return (
+                self._aggregate_columns(self.bids, levels, descending=True),
+                self._aggregate_columns(self.asks, levels, descending=False),
+            )
+    
+    def _aggregate_columns(
+        self,
+        heap: List[OrderEntry],
+        levels: int,
+        descending: bool
+    ) -> Dict[str, np.ndarray]:
+        """Aggregate live entries into price levels with one vectorized pass"""
+        live = [entry for entry in heap if entry.order_id in self.orders]
+        prices = np.fromiter((to_scaled(e.price) for e in live), dtype=np.int64, count=len(live))
+        quantities = np.fromiter((to_scaled(e.quantity) for e in live), dtype=np.int64, count=len(live))
+        
+        level_prices, inverse, counts = np.unique(prices, return_inverse=True, return_counts=True)
+        level_quantities = np.zeros(len(level_prices), dtype=np.int64)
+        np.add.at(level_quantities, inverse, quantities)
+        
+        # Contiguous copies, which orjson serializes natively
+        window = slice(None, -levels - 1, -1) if descending else slice(levels)
+        return {
+            "prices": np.ascontiguousarray(level_prices[window]),
+            "quantities": np.ascontiguousarray(level_quantities[window]),
+            "order_counts": np.ascontiguousarray(counts[window]),
+        }
 
 
 class TradingEngine:
@@ -153,9 +196,9 @@ class TradingEngine:
             user_id=user_id,
             client_order_id=client_order_id,
             symbol=order_create.symbol,
-            side=order_create.side,
-            order_type=order_create.order_type,
-            time_in_force=order_create.time_in_force,
+            side=OrderSide(order_create.side),
+            order_type=OrderType(order_create.order_type),
+            time_in_force=TimeInForce(order_create.time_in_force),
             price=order_create.price,
             stop_price=order_create.stop_price,
             quantity=order_create.quantity,
@@ -169,11 +212,14 @@ class TradingEngine:
         # Process order based on type
         trades = []
         
-        if order_create.order_type == OrderType.MARKET:
+        if order.order_type == OrderType.MARKET:
             trades = await self._execute_market_order(db, redis_client, order)
-        elif order_create.order_type == OrderType.LIMIT:
+        elif order.order_type == OrderType.LIMIT:
             trades = await self._execute_limit_order(db, redis_client, order)
         
+        # One flush for the fills and the order update - trades go out as a
+        # single batched INSERT rather than a round trip per match
+        await db.flush()
         await db.refresh(order)
         return order, trades
     
@@ -327,7 +373,7 @@ class TradingEngine:
         price: Decimal,
         quantity: Decimal
     ) -> Trade:
-        """Create trade record"""
+        """Create trade record - added to the session, flushed with the batch"""
         async with self._lock:
             self._trade_counter += 1
             trade_id = self._trade_counter
@@ -349,7 +395,6 @@ class TradingEngine:
         )
         
         db.add(trade)
-        await db.flush()
         
         return trade
     
@@ -365,6 +410,23 @@ class TradingEngine:
                 f"{trade.trade_id}|{trade.price}|{trade.quantity}|{trade.side}"
             )
     
+    async def record_trades(
+        self,
+        redis_client: redis.Redis,
+        trades: List[Trade]
+    ) -> None:
+        """
+        Fold trades into the analytics rollups - call once their transaction
+        has committed, so rolled-back fills are never counted
+        Rollups are best effort: a Redis failure doesn't fail the order
+        """
+        if not trades:
+            return
+        try:
+            await ai_analytics_service.record_trades(redis_client, trades)
+        except RedisError:
+            pass
+    
     async def cancel_order(
         self,
         db: AsyncSession,
@@ -372,16 +434,13 @@ class TradingEngine:
         user_id: UUID
     ) -> bool:
         """Cancel an open order"""
-        result = await db.execute(
-            select(Order).where(
-                Order.id == order_id,
-                Order.user_id == user_id,
-                Order.status.in_([OrderStatus.OPEN, OrderStatus.PARTIAL, OrderStatus.PENDING])
-            )
-        )
-        order = result.scalar_one_or_none()
+        order = await db.get(Order, order_id)
         
-        if not order:
+        if (
+            not order
+            or order.user_id != user_id
+            or order.status not in (OrderStatus.OPEN, OrderStatus.PARTIAL, OrderStatus.PENDING)
+        ):
             return False
         
         # Remove from order book
@@ -394,25 +453,70 @@ class TradingEngine:
         
         return True
     
+    async def cancel_orders_bulk(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        symbol: Optional[str] = None
+    ) -> List[UUID]:
+        """
+        Cancel all open orders for a user with a single UPDATE
+        Returns the IDs of cancelled orders
+        """
+        query = (
+            update(Order)
+            .where(
+                Order.user_id == user_id,
+                Order.status.in_([OrderStatus.OPEN, OrderStatus.PARTIAL])
+            )
+            .values(status=OrderStatus.CANCELLED, updated_at=datetime.now(timezone.utc))
+            .returning(Order.id, Order.symbol)
+        )
+        
+        if symbol:
+            query = query.where(Order.symbol == symbol.upper())
+        
+        result = await db.execute(query)
+        rows = result.all()
+        
+        # Remove from order books, one batch per symbol
+        by_symbol: dict[str, List[UUID]] = defaultdict(list)
+        for order_id, order_symbol in rows:
+            by_symbol[order_symbol].append(order_id)
+        
+        for order_symbol, order_ids in by_symbol.items():
+            await self._get_order_book(order_symbol).cancel_orders(order_ids)
+        
+        return [order_id for order_id, _ in rows]
+    
     async def get_order_book(
         self,
         symbol: str,
         levels: int = 20
-    ) -> Tuple[List[OrderBookEntry], List[OrderBookEntry], int]:
+    ) -> Tuple[List[OrderBookLevel], List[OrderBookLevel], int]:
         """Get order book depth for symbol"""
         book = self._get_order_book(symbol)
         bids, asks = await book.get_depth(levels)
         return bids, asks, book.sequence
     
-    async def get_user_orders(
+    async def get_order_book_columns(
+        self,
+        symbol: str,
+        levels: int = 20
+    ) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray], int]:
+        """Get columnar order book depth for symbol"""
+        book = self._get_order_book(symbol)
+        bids, asks = await book.get_depth_columns(levels)
+        return bids, asks, book.sequence
+    
+    def user_orders_query(
         self,
-        db: AsyncSession,
         user_id: UUID,
         symbol: Optional[str] = None,
         status: Optional[OrderStatus] = None,
         limit: int = 100
-    ) -> List[Order]:
-        """Get user's orders"""
+    ) -> Select:
+        """Build the query for a user's most recent orders"""
         query = select(Order).where(Order.user_id == user_id)
         
         if symbol:
@@ -420,8 +524,18 @@ class TradingEngine:
         if status:
             query = query.where(Order.status == status)
         
-        query = query.order_by(Order.created_at.desc()).limit(limit)
+        return query.order_by(Order.created_at.desc()).limit(limit)
+    
+    async def get_user_orders(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        symbol: Optional[str] = None,
+        status: Optional[OrderStatus] = None,
+        limit: int = 100
+    ) -> List[Order]:
+        """Get user's orders"""
+        query = self.user_orders_query(user_id, symbol, status, limit)
         
         result = await db.execute(query)
         return result.scalars().all()
-
@@ -9,7 +9,7 @@ from uuid import UUID, uuid4
 import secrets
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 from web3 import Web3
 from eth_account import Account
 from eth_account.messages import encode_defunct
@@ -175,17 +175,25 @@ class WalletService:
         db: AsyncSession,
         user_id: UUID
     ) -> List[WalletBalance]:
-        """Get aggregated balances for user"""
-        wallets = await self.get_user_wallets(db, user_id)
+        """Get aggregated balances for user - one GROUP BY rollup per currency"""
+        total = func.sum(Wallet.balance)
+        locked = func.sum(Wallet.locked_balance)
+        
+        result = await db.execute(
+            select(Wallet.currency, total - locked, locked, total)
+            .where(Wallet.user_id == user_id)
+            .group_by(Wallet.currency)
+            .order_by(Wallet.currency)
+        )
         
         return [
             WalletBalance(
-                currency=w.currency,
-                available=w.balance - w.locked_balance,
-                locked=w.locked_balance,
-                total=w.balance
+                currency=currency,
+                available=available,
+                locked=locked_balance,
+                total=total_balance
             )
-            for w in wallets
+            for currency, available, locked_balance, total_balance in result
         ]
     
     async def estimate_gas(
@@ -237,15 +245,9 @@ class WalletService:
         Create withdrawal transaction
         """
         # Get wallet
-        result = await db.execute(
-            select(Wallet).where(
-                Wallet.id == wallet_id,
-                Wallet.user_id == user_id
-            )
-        )
-        wallet = result.scalar_one_or_none()
+        wallet = await db.get(Wallet, wallet_id)
         
-        if not wallet:
+        if not wallet or wallet.user_id != user_id:
             return None
         
         # Check balance
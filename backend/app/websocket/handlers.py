@@ -8,10 +8,7 @@ from typing import Optional
 from fastapi import WebSocket, WebSocketDisconnect, Query
 
 from app.websocket.manager import ws_manager
-from app.services.auth import AuthService
-
-
-auth_service = AuthService()
+from app.services.auth import auth_service
 
 
 async def websocket_endpoint(
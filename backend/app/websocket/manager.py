@@ -5,12 +5,13 @@ High-performance real-time data distribution
 import asyncio
 from typing import Dict, Set, Optional
 from datetime import datetime
-import json
 
+import orjson
 from fastapi import WebSocket
 import redis.asyncio as redis
 
 from app.config import settings
+from app.schemas.market import ChannelMessage
 
 
 class WebSocketManager:
@@ -132,12 +133,14 @@ class WebSocketManager:
         if channel not in self.subscriptions:
             return
         
+        # Serialize once for every subscriber rather than per connection
+        payload = orjson.dumps(message).decode()
         disconnected = []
         
         for connection_id in self.subscriptions[channel]:
             if connection_id in self.active_connections:
                 try:
-                    await self.active_connections[connection_id].send_json(message)
+                    await self.active_connections[connection_id].send_text(payload)
                 except Exception:
                     disconnected.append(connection_id)
         
@@ -149,16 +152,16 @@ class WebSocketManager:
         """Send periodic heartbeats to keep connections alive"""
         while self._running:
             try:
-                message = {
+                payload = orjson.dumps({
                     "type": "heartbeat",
                     "timestamp": datetime.utcnow().isoformat()
-                }
+                }).decode()
                 
                 disconnected = []
                 
                 for conn_id, ws in list(self.active_connections.items()):
                     try:
-                        await ws.send_json(message)
+                        await ws.send_text(payload)
                     except Exception:
                         disconnected.append(conn_id)
                 
@@ -189,13 +192,14 @@ class WebSocketManager:
                         if isinstance(data, bytes):
                             data = data.decode()
                         
-                        # Parse and broadcast
-                        await self.broadcast_to_channel(channel, {
+                        # Plain dict envelope, no model construction on the fan-out path
+                        envelope: ChannelMessage = {
                             "type": "data",
                             "channel": channel,
                             "data": data,
                             "timestamp": datetime.utcnow().isoformat()
-                        })
+                        }
+                        await self.broadcast_to_channel(channel, envelope)
                 else:
                     await asyncio.sleep(1)
             except Exception as e:
@@ -0,0 +1,10 @@
+-- FastTrading Database Migration 002
+-- Covering index for per-user trade statistics
+
+-- Lets /trades/stats aggregate with an index-only scan.
+-- Hypertables do not support CONCURRENTLY, so the index is built per chunk
+-- without locking writes for the whole table.
+CREATE INDEX IF NOT EXISTS ix_trades_user_symbol_time
+    ON trades (user_id, symbol, executed_at DESC)
+    INCLUDE (quantity, quote_quantity, commission)
+    WITH (timescaledb.transaction_per_chunk);
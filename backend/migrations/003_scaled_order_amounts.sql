@@ -0,0 +1,22 @@
+-- FastTrading Database Migration 003
+-- Integer-scaled order amounts for the matching engine
+
+-- Prices and quantities on orders become BIGINT holding value * 10^8.
+-- Fixed-width keys shrink ix_orders_matching and ix_orders_symbol_side_price
+-- and turn comparisons into integer ops. Commission stays NUMERIC.
+-- trades is left on NUMERIC: it is a compressed hypertable and candles_1m
+-- depends on trades.price.
+ALTER TABLE orders
+    ALTER COLUMN price TYPE BIGINT USING round(price * 100000000)::BIGINT,
+    ALTER COLUMN stop_price TYPE BIGINT USING round(stop_price * 100000000)::BIGINT,
+    ALTER COLUMN quantity TYPE BIGINT USING round(quantity * 100000000)::BIGINT,
+    ALTER COLUMN filled_quantity DROP DEFAULT,
+    ALTER COLUMN filled_quantity TYPE BIGINT USING round(filled_quantity * 100000000)::BIGINT,
+    ALTER COLUMN filled_quantity SET DEFAULT 0,
+    ALTER COLUMN remaining_quantity TYPE BIGINT USING round(remaining_quantity * 100000000)::BIGINT,
+    ALTER COLUMN average_fill_price TYPE BIGINT USING round(average_fill_price * 100000000)::BIGINT,
+    ADD CONSTRAINT ck_orders_price_positive CHECK (price IS NULL OR price > 0),
+    ADD CONSTRAINT ck_orders_stop_price_positive CHECK (stop_price IS NULL OR stop_price > 0),
+    ADD CONSTRAINT ck_orders_quantity_positive CHECK (quantity > 0),
+    ADD CONSTRAINT ck_orders_fill_non_negative CHECK (filled_quantity >= 0 AND remaining_quantity >= 0);
+
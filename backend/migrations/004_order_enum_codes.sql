@@ -0,0 +1,49 @@
+-- FastTrading Database Migration 004
+-- SMALLINT codes for order enums
+
+-- side/order_type/status/time_in_force become 2-byte codes, which narrows
+-- ix_orders_matching and ix_orders_user_status.
+-- Codes match app.models.order and must never be renumbered.
+-- lower() accepts both enum names and values as previously stored.
+ALTER TABLE orders
+    ALTER COLUMN status DROP DEFAULT,
+    ALTER COLUMN time_in_force DROP DEFAULT;
+
+ALTER TABLE orders
+    ALTER COLUMN side TYPE SMALLINT USING (
+        CASE lower(side)
+            WHEN 'buy' THEN 1
+            WHEN 'sell' THEN 2
+        END
+    ),
+    ALTER COLUMN order_type TYPE SMALLINT USING (
+        CASE lower(order_type)
+            WHEN 'market' THEN 1
+            WHEN 'limit' THEN 2
+            WHEN 'stop_limit' THEN 3
+            WHEN 'stop_market' THEN 4
+        END
+    ),
+    ALTER COLUMN status TYPE SMALLINT USING (
+        CASE lower(status)
+            WHEN 'pending' THEN 1
+            WHEN 'open' THEN 2
+            WHEN 'partial' THEN 3
+            WHEN 'filled' THEN 4
+            WHEN 'cancelled' THEN 5
+            WHEN 'rejected' THEN 6
+            WHEN 'expired' THEN 7
+        END
+    ),
+    ALTER COLUMN time_in_force TYPE SMALLINT USING (
+        CASE lower(time_in_force)
+            WHEN 'gtc' THEN 1
+            WHEN 'ioc' THEN 2
+            WHEN 'fok' THEN 3
+            WHEN 'gtd' THEN 4
+        END
+    );
+
+ALTER TABLE orders
+    ALTER COLUMN status SET DEFAULT 1,
+    ALTER COLUMN time_in_force SET DEFAULT 1;
@@ -0,0 +1,13 @@
+-- FastTrading Database Migration 005
+-- Drop indexes already covered by composite indexes
+
+-- Every extra index is another write per INSERT/UPDATE on the hottest tables.
+-- (symbol) and (symbol, status) on orders are prefixes of ix_orders_matching;
+-- sequence_number is only used as its trailing sort key.
+-- trades(symbol) is a prefix of ix_trades_symbol_time.
+-- Single-column indexes may exist when tables were created from the models.
+DROP INDEX IF EXISTS ix_orders_symbol_status;
+DROP INDEX IF EXISTS ix_orders_symbol;
+DROP INDEX IF EXISTS ix_orders_status;
+DROP INDEX IF EXISTS ix_orders_sequence_number;
+DROP INDEX IF EXISTS ix_trades_symbol;
@@ -0,0 +1,10 @@
+-- FastTrading Database Migration 006
+-- Partial index over the live order book
+
+-- Matching and book rebuilds only touch OPEN (2) and PARTIAL (3) orders.
+-- Indexing just those rows keeps the hot index small enough to stay in
+-- shared_buffers however much filled/cancelled history accumulates.
+-- trades is already range-partitioned by executed_at as a daily hypertable.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_orders_active_book
+    ON orders (symbol, side, price, sequence_number)
+    WHERE status IN (2, 3);
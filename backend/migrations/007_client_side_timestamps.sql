@@ -0,0 +1,14 @@
+-- FastTrading Database Migration 007
+-- Timestamps are stamped by the application
+
+-- For ORM writes, created_at/updated_at are now set once per flush from a
+-- single application clock read (new rows get the same value in both).
+-- The BEFORE UPDATE triggers would overwrite that value with a second clock
+-- read and run a plpgsql call per row, so they are removed.
+-- Column DEFAULT NOW() remains as the fallback for inserts that bypass the
+-- ORM flush; bulk UPDATEs that bypass it set updated_at themselves.
+DROP TRIGGER IF EXISTS update_users_updated_at ON users;
+DROP TRIGGER IF EXISTS update_orders_updated_at ON orders;
+DROP TRIGGER IF EXISTS update_wallets_updated_at ON wallets;
+DROP TRIGGER IF EXISTS update_transactions_updated_at ON transactions;
+DROP FUNCTION IF EXISTS update_updated_at();
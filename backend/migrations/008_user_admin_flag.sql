@@ -0,0 +1,8 @@
+-- FastTrading Database Migration 008
+-- Admin flag for operator-only endpoints
+
+-- Cross-user analytics (risk scoring other accounts) require is_admin.
+-- Read from the user row rather than the token, so revoking does not wait
+-- for tokens to expire; the per-process user cache (USER_CACHE_TTL, 5 s)
+-- can still serve the old value for up to that long.
+ALTER TABLE users ADD COLUMN IF NOT EXISTS is_admin BOOLEAN DEFAULT false NOT NULL;
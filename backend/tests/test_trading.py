@@ -111,6 +111,54 @@ class TestOrderBook:
         bids, _ = await order_book.get_depth(10)
         assert len(bids) == 0
 
+    @pytest.mark.asyncio
+    async def test_cancel_orders_batch(self, order_book):
+        """Test cancelling several orders at once"""
+        from app.services.trading import OrderEntry
+        from datetime import datetime
+
+        order_ids = [uuid4() for _ in range(3)]
+        for i, order_id in enumerate(order_ids):
+            entry = OrderEntry(
+                priority=-(2000.0 + i),
+                timestamp=datetime.utcnow().timestamp(),
+                order_id=order_id,
+                price=Decimal(2000 + i),
+                quantity=Decimal("1"),
+                user_id=uuid4()
+            )
+            await order_book.add_order(entry, OrderSide.BUY)
+
+        cancelled = await order_book.cancel_orders(order_ids[:2] + [uuid4()])
+        assert cancelled == 2
+
+        bids, _ = await order_book.get_depth(10)
+        assert len(bids) == 1
+        assert bids[0].price == Decimal("2002")
+
+    @pytest.mark.asyncio
+    async def test_depth_columns(self, order_book):
+        """Test columnar depth aggregates levels as scaled ints"""
+        from app.services.trading import OrderEntry
+        from datetime import datetime
+
+        for price in ("2000", "2001", "2000"):
+            entry = OrderEntry(
+                priority=-float(price),
+                timestamp=datetime.utcnow().timestamp(),
+                order_id=uuid4(),
+                price=Decimal(price),
+                quantity=Decimal("1.5"),
+                user_id=uuid4()
+            )
+            await order_book.add_order(entry, OrderSide.BUY)
+
+        bids, asks = await order_book.get_depth_columns(10)
+        assert bids["prices"].tolist() == [200100000000, 200000000000]
+        assert bids["quantities"].tolist() == [150000000, 300000000]
+        assert bids["order_counts"].tolist() == [1, 2]
+        assert len(asks["prices"]) == 0
+
 
 class TestTradingEngine:
     """Test trading engine operations"""
@@ -207,4 +255,122 @@ class TestOrderValidation:
         )
         
         assert order.price is None
+    
+    def test_generated_json_validator(self):
+        """Test the generated OrderCreate validator matches pydantic or defers to it"""
+        from app.schemas.order import OrderCreate, validate_order_create_json
+        
+        body = b'{"symbol":"eth-usdt","side":"sell","order_type":"limit","quantity":"2","price":"2500.5"}'
+        assert validate_order_create_json(body) == OrderCreate.model_validate_json(body)
+        
+        assert validate_order_create_json(b'{"symbol":"ETH-USDT","side":"buy","order_type":"market","quantity":"0"}') is None
+        assert validate_order_create_json(b'{"symbol":"ETH-USDT","side":"buy","order_type":"market","quantity":1,"extra":1}') is None
+
+    def test_cancel_request_without_kind(self):
+        """Test cancel bodies from before the kind tag still validate"""
+        from pydantic import TypeAdapter, ValidationError
+        from app.schemas.order import CancelByClientOrderId, CancelByOrderId, CancelOrderRequest
+        
+        adapter = TypeAdapter(CancelOrderRequest)
+        order_id = str(uuid4())
+        
+        assert isinstance(adapter.validate_json(f'{{"order_id":"{order_id}"}}'), CancelByOrderId)
+        assert isinstance(adapter.validate_json('{"client_order_id":"abc"}'), CancelByClientOrderId)
+        assert adapter.validate_python({"order_id": order_id, "client_order_id": "abc"}).order_id == order_id
+        assert isinstance(adapter.validate_python({"kind": "client_order_id", "client_order_id": "abc"}), CancelByClientOrderId)
+        
+        with pytest.raises(ValidationError):
+            adapter.validate_python({})
+
+
+class TestMarketData:
+    """Test market data aggregation"""
+    
+    def test_aggregate_trades(self):
+        """Test a trade batch aggregates into one OHLCV bar"""
+        import numpy as np
+        from datetime import datetime
+        from app.services.market import MarketDataService
+        
+        bar = MarketDataService().aggregate_trades(
+            "ETH-USDT",
+            "1m",
+            np.array([2000.0, 2010.0, 1990.0, 2005.0]),
+            np.array([1.0, 0.5, 2.0, 1.5]),
+            datetime.utcnow()
+        )
+        
+        assert bar.open == Decimal("2000.0")
+        assert bar.high == Decimal("2010.0")
+        assert bar.low == Decimal("1990.0")
+        assert bar.close == Decimal("2005.0")
+        assert bar.volume == Decimal("5.0")
+        assert bar.trade_count == 4
+    
+    @pytest.mark.asyncio
+    async def test_candles_served_from_history(self):
+        """Test candles are bucket-aligned and reused between calls"""
+        from unittest.mock import patch
+        from app.services.market import MarketDataService, MINUTE_NS
+        
+        service = MarketDataService()
+        await service._initialize_prices()
+        
+        # Pin the clock mid-bucket so both calls see the same closed buckets
+        interval_ns = 5 * MINUTE_NS
+        now = 1_700_000_000 * 10**9 // interval_ns * interval_ns + interval_ns // 2
+        
+        with patch("app.services.market.time.time_ns", return_value=now):
+            first = await service.get_candles("eth-usdt", "5m", 10)
+            with patch.object(MarketDataService, "_simulate_candle") as simulate:
+                again = await service.get_candles("ETH-USDT", "5m", 3)
+            simulate.assert_not_called()
+        
+        assert len(first) == 10
+        assert all(c.open_time % interval_ns == 0 for c in first)
+        assert first[-1].open_time == now // interval_ns * interval_ns - interval_ns
+        assert again == first[-3:]
+        assert all(again[i] is first[-3 + i] for i in range(3))
+        
+        # One more closed bucket generates exactly one new candle
+        later = list(service._advance_candles("ETH-USDT", "5m", now + interval_ns))
+        assert later[-2] is first[-1]
+        assert later[-1].open_time == first[-1].open_time + interval_ns
 
+
+class TestAIAnalytics:
+    """Test AI analytics computations"""
+    
+    @pytest.mark.asyncio
+    async def test_user_bundle_with_aware_timestamps(self):
+        """Test the user bundle windows trades read as timezone-aware datetimes"""
+        from collections import namedtuple
+        from datetime import datetime, timedelta, timezone
+        from app.services.ai_analytics import AIAnalyticsService
+        
+        Row = namedtuple("Row", "symbol trade_id user_id executed_at quantity quote_quantity side price")
+        user_id = uuid4()
+        now = datetime.now(timezone.utc)
+        
+        # One trade outside the 30-day window, then a recent run with one whale
+        rows = [Row("ETH-USDT", 0, user_id, now - timedelta(days=40), Decimal("1"), Decimal("2000"), "buy", Decimal("2000"))]
+        for i in range(1, 41):
+            quantity = Decimal("50") if i == 40 else Decimal("1")
+            rows.append(Row(
+                "ETH-USDT", i, user_id, now - timedelta(minutes=60 - i),
+                quantity, quantity * 2000, "buy" if i % 2 else "sell", Decimal("2000")
+            ))
+        
+        class Result:
+            def all(self):
+                return rows
+        
+        class Session:
+            async def execute(self, statement, params=None):
+                return Result()
+        
+        risk, anomalies, portfolio = await AIAnalyticsService().analyze_user_bundle(Session(), user_id)
+        
+        assert risk.metrics["total_trades"] == 40
+        assert "whale_40" in [a.id for a in anomalies]
+        assert portfolio.metrics.total_trades == 41
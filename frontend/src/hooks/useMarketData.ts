@@ -50,13 +50,13 @@ export function useMarketPrice(symbol: string) {
     const channel = `prices:${symbol}`;
     
     const handleUpdate = (data: string) => {
-      const [last, bid, ask, timestamp] = data.split("|");
+      const { p: last, b: bid, a: ask, t: timestamp } = JSON.parse(data);
       setPrice((prev) => ({
         ...(prev || {}),
         symbol,
-        last: parseFloat(last),
-        bid: parseFloat(bid),
-        ask: parseFloat(ask),
+        last,
+        bid,
+        ask,
         timestamp,
       } as MarketData));
     };